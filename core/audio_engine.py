@@ -1,9 +1,11 @@
 """
 Audio engine — multi-format loading, export.
 MP3 export: lameenc (pure Python, no ffmpeg) > ffmpeg > pydub.
+Exports stream the buffer block by block (constant memory).
 Other formats: soundfile > ffmpeg > pydub > librosa.
 """
 from utils.logger import get_logger
+from utils import profiler
 _log = get_logger("audio_engine")
 
 import os
@@ -13,7 +15,6 @@ import tempfile
 import shutil
 import glob
 import numpy as np
-import soundfile as sf
 
 
 # ═══════════════════════════════════════
@@ -22,11 +23,18 @@ import soundfile as sf
 
 _ffmpeg_cache = None
 _ffmpeg_searched = False
+_ffmpeg_caps = None     # {"path", "sig", "version", "encoders"} once probed
 
 # Directory where we store our own ffmpeg copy
 from utils.config import get_data_dir as _get_data_dir
 _FFMPEG_DIR = os.path.join(_get_data_dir(), "ffmpeg")
 
+# Resolved path + capabilities, shared by every process on the machine;
+# valid while the binary keeps the same mtime and size
+_FFMPEG_CAPS_FILE = os.path.join(_get_data_dir(), "ffmpeg_caps.json")
+# Child processes (stem export workers) inherit the resolved path
+_FFMPEG_ENV = "GLITCH_FFMPEG"
+
 # Static build download URLs (well-known, stable sources)
 _FFMPEG_URLS = {
     "win64": "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip",
@@ -41,9 +49,8 @@ def _our_ffmpeg_path() -> str:
     return os.path.join(_FFMPEG_DIR, name)
 
 
-def _load_ffmpeg_from_settings():
-    """Try loading ffmpeg path from saved settings."""
-    global _ffmpeg_cache, _ffmpeg_searched
+def _load_ffmpeg_from_settings() -> str | None:
+    """Custom ffmpeg path from saved settings, if it exists."""
     try:
         settings_path = os.path.join(_get_data_dir(), "settings.json")
         if os.path.isfile(settings_path):
@@ -52,35 +59,95 @@ def _load_ffmpeg_from_settings():
                 s = _json.load(f)
             custom = s.get("ffmpeg_path", "")
             if custom and os.path.isfile(custom):
-                _ffmpeg_cache = custom
-                _ffmpeg_searched = True
-                return True
+                return custom
+    except Exception as _ex:
+        _log.debug("Non-critical: %s", _ex)
+    return None
+
+
+def _file_sig(path: str) -> list:
+    """[mtime, size] of *path*, to detect a replaced binary."""
+    st = os.stat(path)
+    return [st.st_mtime, st.st_size]
+
+
+def _read_ffmpeg_caps() -> dict | None:
+    """Cached ffmpeg entry from the data dir, if the binary is unchanged."""
+    import json as _json
+    try:
+        with open(_FFMPEG_CAPS_FILE, "r", encoding="utf-8") as f:
+            caps = _json.load(f)
+        if os.path.isfile(caps["path"]) and _file_sig(caps["path"]) == caps["sig"]:
+            return caps
     except Exception as _ex:
         _log.debug("Non-critical: %s", _ex)
-    return False
+    return None
+
 
+def _write_ffmpeg_caps(caps: dict):
+    """Persist the ffmpeg entry for the next processes."""
+    import json as _json
+    try:
+        with open(_FFMPEG_CAPS_FILE, "w", encoding="utf-8") as f:
+            _json.dump(caps, f, indent=2)
+    except Exception as _ex:
+        _log.debug("Non-critical: %s", _ex)
 
-# Try settings first at import time
-_load_ffmpeg_from_settings()
+
+def _set_ffmpeg(path: str, persist: bool = True) -> str:
+    """Adopt *path* for this process and its children (and the disk cache)."""
+    global _ffmpeg_cache, _ffmpeg_searched, _ffmpeg_caps
+    _ffmpeg_cache = path
+    _ffmpeg_searched = True
+    os.environ[_FFMPEG_ENV] = path
+    if _ffmpeg_caps is not None and _ffmpeg_caps.get("path") != path:
+        _ffmpeg_caps = None
+    cached = _read_ffmpeg_caps() if persist else None
+    if persist and (cached is None or cached["path"] != path):
+        try:
+            _write_ffmpeg_caps({"path": path, "sig": _file_sig(path)})
+        except OSError as _ex:
+            _log.debug("Non-critical: %s", _ex)
+    return path
 
 
 def _find_ffmpeg() -> str | None:
-    """Cherche FFmpeg dans le PATH et les emplacements courants."""
-    global _ffmpeg_cache, _ffmpeg_searched
+    """Cherche FFmpeg, au premier besoin seulement.
+
+    Ordre : chemin herite du processus parent, chemin des settings, cache
+    du data dir (si le binaire n'a pas change), puis recherche complete
+    dans le PATH et les emplacements courants (resultat mis en cache).
+    """
+    global _ffmpeg_searched
     if _ffmpeg_searched:
         return _ffmpeg_cache
     _ffmpeg_searched = True
 
+    inherited = os.environ.get(_FFMPEG_ENV, "")
+    if inherited and os.path.isfile(inherited):
+        return _set_ffmpeg(inherited, persist=False)
+    custom = _load_ffmpeg_from_settings()
+    if custom:
+        return _set_ffmpeg(custom, persist=False)
+    caps = _read_ffmpeg_caps()
+    if caps:
+        return _set_ffmpeg(caps["path"], persist=False)
+    path = _search_ffmpeg()
+    if path:
+        _set_ffmpeg(path)
+    return path
+
+
+def _search_ffmpeg() -> str | None:
+    """Full search (slow on Windows: WinGet, Downloads, Desktop trees)."""
     # 0. Our own downloaded copy
     our = _our_ffmpeg_path()
     if os.path.isfile(our):
-        _ffmpeg_cache = our
         return our
 
     # 1. PATH
     path = shutil.which("ffmpeg")
     if path:
-        _ffmpeg_cache = path
         return path
 
     # 2. Next to the app exe (PyInstaller or dev)
@@ -95,14 +162,12 @@ def _find_ffmpeg() -> str | None:
             for sub in ["", os.path.join("ffmpeg", "bin")]:
                 p = os.path.join(d, sub, name) if sub else os.path.join(d, name)
                 if os.path.isfile(p):
-                    _ffmpeg_cache = p
                     return p
 
     if os.name != 'nt':
         for p in ["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg",
                   os.path.expanduser("~/.local/bin/ffmpeg")]:
             if os.path.isfile(p):
-                _ffmpeg_cache = p
                 return p
         return None
 
@@ -114,7 +179,6 @@ def _find_ffmpeg() -> str | None:
             for line in r.stdout.strip().splitlines():
                 line = line.strip()
                 if line and os.path.isfile(line):
-                    _ffmpeg_cache = line
                     return line
     except Exception as _ex:
         _log.debug("Non-critical: %s", _ex)
@@ -153,7 +217,6 @@ def _find_ffmpeg() -> str | None:
         seen.add(p)
         try:
             if os.path.isfile(p):
-                _ffmpeg_cache = p
                 return p
         except Exception as _ex:
             _log.debug("Non-critical: %s", _ex)
@@ -180,6 +243,55 @@ def ffmpeg_available() -> bool:
     return _find_ffmpeg() is not None
 
 
+def _probe_ffmpeg(path: str) -> dict:
+    """Run ffmpeg once for its version and encoder list."""
+    kw = dict(capture_output=True, text=True, timeout=10,
+              creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    version = ""
+    r = subprocess.run([path, "-hide_banner", "-version"], **kw)
+    first = r.stdout.splitlines()[0].split() if r.stdout else []
+    if len(first) > 2 and first[:2] == ["ffmpeg", "version"]:
+        version = first[2]
+    encoders = []
+    r = subprocess.run([path, "-hide_banner", "-encoders"], **kw)
+    listing = False
+    for line in r.stdout.splitlines():
+        if line.strip().startswith("------"):
+            listing = True
+        elif listing and len(line.split()) > 1:
+            encoders.append(line.split()[1])
+    return {"version": version, "encoders": encoders}
+
+
+def ffmpeg_info() -> dict | None:
+    """FFmpeg path, version and encoders — probed on first need, then
+    cached in the data dir until the binary changes.  None without ffmpeg."""
+    global _ffmpeg_caps
+    path = _find_ffmpeg()
+    if not path:
+        return None
+    if _ffmpeg_caps is not None and _ffmpeg_caps.get("path") == path:
+        return _ffmpeg_caps
+    caps = _read_ffmpeg_caps()
+    if not caps or caps["path"] != path or "encoders" not in caps:
+        try:
+            caps = {"path": path, "sig": _file_sig(path), **_probe_ffmpeg(path)}
+        except (OSError, subprocess.SubprocessError) as _ex:
+            _log.debug("Non-critical: %s", _ex)
+            return {"path": path, "version": "", "encoders": []}
+        _write_ffmpeg_caps(caps)
+    _ffmpeg_caps = caps
+    return caps
+
+
+def ffmpeg_has_encoder(name: str) -> bool:
+    """True if ffmpeg lists encoder *name* (or could not be probed)."""
+    info = ffmpeg_info()
+    if info is None:
+        return False
+    return not info["encoders"] or name in info["encoders"]
+
+
 def download_ffmpeg(progress_cb=None) -> str:
     """
     Download a static FFmpeg build to data/ffmpeg/.
@@ -192,13 +304,9 @@ def download_ffmpeg(progress_cb=None) -> str:
     import tarfile
     import platform
 
-    global _ffmpeg_cache, _ffmpeg_searched
-
     dst = _our_ffmpeg_path()
     if os.path.isfile(dst):
-        _ffmpeg_cache = dst
-        _ffmpeg_searched = True
-        return dst
+        return _set_ffmpeg(dst)
 
     os.makedirs(_FFMPEG_DIR, exist_ok=True)
 
@@ -263,8 +371,7 @@ def download_ffmpeg(progress_cb=None) -> str:
         _cleanup(dst)
         raise RuntimeError("Extracted binary cannot run")
 
-    _ffmpeg_cache = dst
-    _ffmpeg_searched = True
+    _set_ffmpeg(dst)
     _sync_pydub_ffmpeg()
 
     if progress_cb:
@@ -330,6 +437,7 @@ def _cleanup(path):
 # Loading
 # ═══════════════════════════════════════
 
+@profiler.profiled("load_audio", "io")
 def load_audio(filepath: str) -> tuple[np.ndarray, int]:
     """Charge un fichier audio et retourne (numpy_array, sample_rate)."""
     _log.info("load_audio called for: %s", filepath)
@@ -337,12 +445,14 @@ def load_audio(filepath: str) -> tuple[np.ndarray, int]:
         raise FileNotFoundError(f"File not found: {filepath}")
     ext = os.path.splitext(filepath)[1].lower()
     errors = []
+    import soundfile as sf
 
     # 1. soundfile (WAV, FLAC, OGG, AIFF)
     if ext in (".wav", ".flac", ".ogg", ".aiff"):
         try:
             _log.info("Attempting soundfile load...")
-            data, sr = sf.read(filepath, dtype="float32", always_2d=True)
+            with profiler.span("decode.soundfile", "io"):
+                data, sr = sf.read(filepath, dtype="float32", always_2d=True)
             _log.info("Audio loaded (soundfile): %d samples @ %d Hz", len(data), sr)
             return _ensure_stereo(data), sr
         except Exception as e:
@@ -358,9 +468,10 @@ def load_audio(filepath: str) -> tuple[np.ndarray, int]:
             tmp.close()
             cmd = [ffmpeg, "-y", "-i", filepath, "-acodec", "pcm_s16le",
                    "-ar", "44100", "-ac", "2", tmp.name]
-            subprocess.run(cmd, capture_output=True, check=True, timeout=30,
-                           creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
-            data, sr = sf.read(tmp.name, dtype="float32", always_2d=True)
+            with profiler.span("decode.ffmpeg", "io"):
+                subprocess.run(cmd, capture_output=True, check=True, timeout=30,
+                               creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+                data, sr = sf.read(tmp.name, dtype="float32", always_2d=True)
             os.unlink(tmp.name)
             _log.info("Audio loaded (ffmpeg): %d samples", len(data))
             return _ensure_stereo(data), sr
@@ -375,7 +486,8 @@ def load_audio(filepath: str) -> tuple[np.ndarray, int]:
         _log.info("Attempting pydub load...")
         _sync_pydub_ffmpeg()
         from pydub import AudioSegment
-        seg = AudioSegment.from_file(filepath)
+        with profiler.span("decode.pydub", "io"):
+            seg = AudioSegment.from_file(filepath)
         sr = seg.frame_rate
         samples = np.array(seg.get_array_of_samples(), dtype=np.float32)
         samples /= float(2 ** (seg.sample_width * 8 - 1))
@@ -389,7 +501,8 @@ def load_audio(filepath: str) -> tuple[np.ndarray, int]:
     try:
         _log.info("Attempting librosa load...")
         import librosa
-        y, sr = librosa.load(filepath, sr=None, mono=False)
+        with profiler.span("decode.librosa", "io"):
+            y, sr = librosa.load(filepath, sr=None, mono=False)
         if y.ndim == 1:
             data = np.column_stack([y, y])
         else:
@@ -426,47 +539,185 @@ def load_audio(filepath: str) -> tuple[np.ndarray, int]:
 # Export
 # ═══════════════════════════════════════
 
-def export_wav(data: np.ndarray, sr: int, filepath: str):
-    """Exporte un tableau numpy en fichier WAV."""
-    sf.write(filepath, data, sr, subtype="PCM_16")
+# Frames per block for streaming export: encoders get the rendered buffer
+# block by block, so memory stays constant whatever the project length
+_EXPORT_BLOCK = 1 << 16
 
 
-def _export_mp3_lameenc(data: np.ndarray, sr: int, filepath: str):
-    """Pure Python MP3 export using lameenc — no ffmpeg needed."""
-    import lameenc
+def _report(progress, done: int, total: int):
+    """Call progress(fraction) if given."""
+    if progress is not None:
+        progress(done / total if total else 1.0)
+
+
+# ── Export profiles ──
+# Plain dicts (stored as settings["export_profile"]); missing keys take the
+# defaults below: 16-bit dithered WAV/FLAC, 192 kbps CBR MP3 at quality 2.
 
-    # Convert float32 stereo to interleaved int16
-    clipped = np.clip(data, -1.0, 1.0)
-    pcm_int16 = (clipped * 32767).astype(np.int16)
-    pcm_bytes = pcm_int16.tobytes()
+WAV_SUBTYPES = ("PCM_16", "PCM_24", "FLOAT")
+MP3_BITRATES = (128, 160, 192, 256, 320)
 
+DEFAULT_EXPORT_PROFILE = {
+    "wav_subtype": "PCM_16",    # PCM_16 / PCM_24 / FLOAT
+    "dither": True,             # TPDF dither when reducing to 16 bits
+    "mp3_mode": "cbr",          # cbr / vbr
+    "mp3_bitrate": 192,         # kbps (CBR)
+    "mp3_vbr_quality": 2,       # 0 = best .. 9 = smallest (VBR)
+    "mp3_speed": 2,             # encoder effort: 0 = best/slow .. 7 = fast
+    "flac_level": 5,            # 0 = fast .. 8 = smallest
+}
+
+
+def export_profile(profile: dict | None = None) -> dict:
+    """Complete *profile* with the defaults (unknown keys are kept)."""
+    return {**DEFAULT_EXPORT_PROFILE, **(profile or {})}
+
+
+def _pcm16_blocks(data: np.ndarray, block: int | None = None,
+                  dither: bool = False, rng: np.random.Generator | None = None):
+    """Yield (frames done, int16 block) from float *data*, clipped.
+
+    Samples are rounded to the nearest code.  dither: add TPDF noise
+    (difference of two uniforms, +/-1 LSB) before rounding — drawn for the
+    whole block at once.
+    The conversion buffers are allocated once and reused, so the blocks
+    are views valid until the next iteration.
+    """
+    n = len(data)
+    block = block or _EXPORT_BLOCK
+    shape = (min(block, n),) + data.shape[1:]
+    fbuf = np.empty(shape, dtype=np.float32)
+    ibuf = np.empty(shape, dtype=np.int16)
+    if dither:
+        rng = rng or np.random.default_rng()
+        noise = np.empty(shape, dtype=np.float32)
+        noise2 = np.empty(shape, dtype=np.float32)
+    for s in range(0, n, block):
+        k = min(block, n - s)
+        f = fbuf[:k]
+        np.clip(data[s:s + k], -1.0, 1.0, out=f)
+        f *= 32767
+        if dither:
+            a, b = noise[:k], noise2[:k]
+            rng.random(dtype=np.float32, out=a)
+            rng.random(dtype=np.float32, out=b)
+            a -= b
+            f += a
+            np.clip(f, -32768, 32767, out=f)
+        np.rint(f, out=f)
+        np.copyto(ibuf[:k], f, casting="unsafe")
+        yield s + k, ibuf[:k]
+
+
+def _write_soundfile(data: np.ndarray, sr: int, filepath: str,
+                     fmt: str, subtype: str | None = None, progress=None,
+                     dither: bool = False, compression_level: float | None = None):
+    """Write WAV / FLAC block by block through soundfile.
+    16-bit output with *dither* is quantised here, the rest by libsndfile."""
+    channels = data.shape[1] if data.ndim > 1 else 1
+    n = len(data)
+    import soundfile as sf
+    kw = {"compression_level": compression_level} if compression_level is not None else {}
+    with sf.SoundFile(filepath, "w", samplerate=sr, channels=channels,
+                      format=fmt, subtype=subtype, **kw) as f:
+        if dither and (subtype or "PCM_16") == "PCM_16":
+            for done, pcm in _pcm16_blocks(data, dither=True):
+                f.write(pcm)
+                _report(progress, done, n)
+            return
+        for s in range(0, n, _EXPORT_BLOCK):
+            f.write(data[s:s + _EXPORT_BLOCK])
+            _report(progress, min(s + _EXPORT_BLOCK, n), n)
+
+
+def export_wav(data: np.ndarray, sr: int, filepath: str, progress=None,
+               profile: dict | None = None):
+    """Exporte un tableau numpy en fichier WAV (16/24 bits ou float)."""
+    p = export_profile(profile)
+    subtype = p["wav_subtype"] if p["wav_subtype"] in WAV_SUBTYPES else "PCM_16"
+    _write_soundfile(data, sr, filepath, "WAV", subtype, progress, dither=p["dither"])
+
+
+def _export_mp3_lameenc(data: np.ndarray, sr: int, filepath: str, progress=None,
+                        profile: dict | None = None):
+    """Pure Python MP3 export using lameenc — no ffmpeg needed.
+    Encodes block by block straight into the file."""
+    import lameenc
+
+    p = export_profile(profile)
     channels = data.shape[1] if data.ndim > 1 else 1
 
     encoder = lameenc.Encoder()
-    encoder.set_bit_rate(192)
     encoder.set_in_sample_rate(sr)
     encoder.set_channels(channels)
-    encoder.set_quality(2)  # 2=high quality, 7=fast
-
-    mp3_data = encoder.encode(pcm_bytes)
-    mp3_data += encoder.flush()
+    encoder.set_quality(int(p["mp3_speed"]))  # 2=high quality, 7=fast
+    if p["mp3_mode"] == "vbr":
+        # set_vbr_quality alone leaves LAME in CBR: the mode is set first
+        if not hasattr(encoder, "set_vbr"):
+            _log.warning("lameenc %s has no VBR support, trying ffmpeg",
+                         getattr(lameenc, "__version__", "< 1.7"))
+            raise RuntimeError("lameenc VBR unavailable")
+        encoder.set_vbr(lameenc.VBR_MTRH)
+        encoder.set_vbr_quality(int(p["mp3_vbr_quality"]))
+    else:
+        encoder.set_bit_rate(int(p["mp3_bitrate"]))
 
     with open(filepath, "wb") as f:
-        f.write(mp3_data)
+        for done, pcm in _pcm16_blocks(data, dither=p["dither"]):
+            f.write(encoder.encode(pcm.tobytes()))
+            _report(progress, done, len(data))
+        f.write(encoder.flush())
+
 
+def _export_ffmpeg_pipe(data: np.ndarray, sr: int, filepath: str, fmt: str,
+                        ffmpeg: str, progress=None, profile: dict | None = None) -> bool:
+    """Encode through ffmpeg, raw PCM streamed on its stdin (no temp WAV)."""
+    p = export_profile(profile)
+    channels = data.shape[1] if data.ndim > 1 else 1
+    codec = {"mp3": "libmp3lame", "ogg": "libvorbis"}[fmt]
+    cmd = [ffmpeg, "-y", "-f", "s16le", "-ar", str(sr), "-ac", str(channels),
+           "-i", "pipe:0", "-acodec", codec]
+    if fmt == "mp3":
+        if p["mp3_mode"] == "vbr":
+            cmd.extend(["-q:a", str(int(p["mp3_vbr_quality"]))])
+        else:
+            cmd.extend(["-b:a", f"{int(p['mp3_bitrate'])}k"])
+        cmd.extend(["-compression_level", str(int(p["mp3_speed"]))])
+    cmd.append(filepath)
+    proc = subprocess.Popen(
+        cmd, stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    try:
+        for done, pcm in _pcm16_blocks(data, dither=p["dither"]):
+            proc.stdin.write(pcm.data)
+            _report(progress, done, len(data))
+        proc.stdin.close()
+        proc.wait(timeout=60)
+    except Exception:
+        proc.kill()
+        raise
+    return proc.returncode == 0 and os.path.isfile(filepath)
 
-def export_audio(data: np.ndarray, sr: int, filepath: str, fmt: str = "wav"):
-    """Exporte en MP3 ou FLAC via FFmpeg/pydub."""
+
+@profiler.profiled("export_audio", "io")
+def export_audio(data: np.ndarray, sr: int, filepath: str, fmt: str = "wav",
+                 progress=None, profile: dict | None = None):
+    """Exporte en WAV, FLAC, MP3 ou OGG.
+    progress: callable(fraction 0..1) appelee au fil de l'encodage.
+    profile: reglages d'export (voir DEFAULT_EXPORT_PROFILE)."""
     _log.info("Exporting audio (%s): %s", fmt, filepath)
-    ext = os.path.splitext(filepath)[1].lower()
+    p = export_profile(profile)
     if fmt == "wav":
-        export_wav(data, sr, filepath)
+        export_wav(data, sr, filepath, progress, p)
         return
 
     # FLAC: soundfile native — no ffmpeg needed
     if fmt == "flac":
         try:
-            sf.write(filepath, data, sr, format="FLAC")
+            level = min(max(int(p["flac_level"]), 0), 8)
+            _write_soundfile(data, sr, filepath, "FLAC", progress=progress,
+                             dither=p["dither"], compression_level=level / 8)
             return
         except Exception as _ex:
             _log.debug("Non-critical: %s", _ex)
@@ -474,7 +725,7 @@ def export_audio(data: np.ndarray, sr: int, filepath: str, fmt: str = "wav"):
     # MP3: try lameenc first (pure Python, always works)
     if fmt == "mp3":
         try:
-            _export_mp3_lameenc(data, sr, filepath)
+            _export_mp3_lameenc(data, sr, filepath, progress, p)
             if os.path.isfile(filepath) and os.path.getsize(filepath) > 0:
                 return
         except ImportError:
@@ -487,29 +738,13 @@ def export_audio(data: np.ndarray, sr: int, filepath: str, fmt: str = "wav"):
 
     # ffmpeg path
     ffmpeg = _find_ffmpeg()
-    if ffmpeg:
-        tmp = None
+    codec = {"mp3": "libmp3lame", "ogg": "libvorbis"}[fmt]
+    if ffmpeg and ffmpeg_has_encoder(codec):
         try:
-            tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            tmp.close()
-            export_wav(data, sr, tmp.name)
-            codec = {"mp3": "libmp3lame", "ogg": "libvorbis"}[fmt]
-            cmd = [ffmpeg, "-y", "-i", tmp.name, "-acodec", codec]
-            if fmt == "mp3":
-                cmd.extend(["-b:a", "192k"])
-            cmd.append(filepath)
-            result = subprocess.run(
-                cmd, capture_output=True, timeout=60,
-                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
-            if result.returncode == 0 and os.path.isfile(filepath):
-                os.unlink(tmp.name)
+            if _export_ffmpeg_pipe(data, sr, filepath, fmt, ffmpeg, progress, p):
                 return
         except Exception as _ex:
             _log.debug("Non-critical: %s", _ex)
-        finally:
-            if tmp:
-                try: os.unlink(tmp.name)
-                except Exception as _ex: _log.debug("Non-critical: %s", _ex)
 
     # pydub fallback
     tmp = None
@@ -532,7 +767,7 @@ def export_audio(data: np.ndarray, sr: int, filepath: str, fmt: str = "wav"):
     try:
         download_ffmpeg()
         # Retry now that ffmpeg is available
-        return export_audio(data, sr, filepath, fmt)
+        return export_audio(data, sr, filepath, fmt, progress, p)
     except Exception as _ex:
         _log.debug("Non-critical: %s", _ex)
 
@@ -544,6 +779,43 @@ def export_audio(data: np.ndarray, sr: int, filepath: str, fmt: str = "wav"):
     )
 
 
+@profiler.profiled("export_stems", "io")
+def export_stems(jobs, fmt: str = "wav", workers: int | None = None,
+                 progress=None, profile: dict | None = None) -> list[str]:
+    """Exporte plusieurs fichiers en parallele (un processus par stem).
+
+    jobs: iterable de (data, sr, filepath).  Chaque stem est encode par
+    export_audio dans un processus du pool ; progress(fraction) est appele
+    a chaque fichier termine ; profile s'applique a tous.  Retourne les
+    chemins exportes, dans l'ordre des jobs ; la premiere erreur est
+    relevee une fois le pool termine.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) == 1:
+        for i, (data, sr, fp) in enumerate(jobs):
+            export_audio(data, sr, fp, fmt, profile=profile)
+            _report(progress, i + 1, len(jobs))
+        return [fp for _, _, fp in jobs]
+
+    error = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(export_audio, data, sr, fp, fmt, None, profile)
+                   for data, sr, fp in jobs]
+        for done, fut in enumerate(as_completed(futures), 1):
+            try:
+                fut.result()
+            except Exception as e:
+                error = error or e
+            _report(progress, done, len(jobs))
+    if error is not None:
+        raise error
+    return [fp for _, _, fp in jobs]
+
+
 # ═══════════════════════════════════════
 # Utilities
 # ═══════════════════════════════════════
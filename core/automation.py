@@ -1,5 +1,6 @@
 """Automation system — automate effect parameters over time (multi-param)."""
 import numpy as np
+from core.effects.utils import eval_curve
 from utils.logger import get_logger
 
 _log = get_logger("automation")
@@ -43,40 +44,15 @@ AUTOMATABLE_PARAMS = {
 }
 
 
-def _bezier_y(y0: float, y1: float, bend: float, t: float) -> float:
-    """Quadratic Bézier Y at parameter *t* with control-point shifted by *bend*."""
-    if abs(bend) < 0.005:
-        return y0 + t * (y1 - y0)
-    cy = (y0 + y1) / 2.0 + bend
-    u = 1.0 - t
-    return u * u * y0 + 2.0 * u * t * cy + t * t * y1
-
-
-def interpolate_curve(points: list, x: float, bends: list | None = None) -> float:
+def interpolate_curve(points: list, x, bends: list | None = None):
     """Interpolate y value at normalized x (0-1) from sorted control points.
 
     If *bends* is provided (one float per segment), quadratic Bézier
-    interpolation is used instead of linear.
+    interpolation is used instead of linear.  *x* may be a scalar (returns
+    a float) or an array (returns an array of the same shape).
     """
-    if not points:
-        return 0.0
-    if len(points) == 1:
-        return points[0][1]
-    if x <= points[0][0]:
-        return points[0][1]
-    if x >= points[-1][0]:
-        return points[-1][1]
-    for i in range(len(points) - 1):
-        x0, y0 = points[i]
-        x1, y1 = points[i + 1]
-        if x0 <= x <= x1:
-            if x1 == x0:
-                return y0
-            t = (x - x0) / (x1 - x0)
-            b = bends[i] if bends and i < len(bends) else 0.0
-            return _bezier_y(y0, y1, b, t)
-    return points[-1][1]
-
+    y = eval_curve(points, bends, x)
+    return float(y) if y.ndim == 0 else y
 
 
 def apply_automation_multi(audio: np.ndarray, start: int, end: int,
@@ -103,45 +79,50 @@ def apply_automation_multi(audio: np.ndarray, start: int, end: int,
 
     # State for stateful effects (e.g. filters)
     plugin_state = {}
+
+    # Effects that accept per-sample arrays for every automated param run
+    # in a single call (the others still step chunk by chunk)
+    curve_keys = getattr(process_fn, "param_curves", ())
+    if curve_keys and all(ap.get("mode") == "constant" or ap["key"] in curve_keys
+                          for ap in auto_params):
+        try:
+            chunk_params = {ap["key"]: _param_curve(ap, region_len)
+                            for ap in auto_params}
+            processed = process_fn(result[start:end], 0, region_len, sr=sr,
+                                   plugin_state=plugin_state, **chunk_params)
+            if processed is not None and len(processed) == region_len:
+                result[start:end] = processed
+                _log.info("Automation done: 1 call (%d samples)", region_len)
+                return result
+            _log.warning("Curve automation len mismatch, falling back to chunks")
+        except Exception as ex:
+            _log.warning("Curve automation error: %s — falling back to chunks", ex,
+                         exc_info=True)
+        plugin_state = {}
     chunks_ok = 0
     chunks_err = 0
 
-    pos = start
-    while pos < end:
+    # Curve value at the start of every chunk, evaluated in one pass
+    chunk_starts = np.arange(start, end, chunk_size)
+    norm_xs = (chunk_starts - start) / region_len
+    curves = {}
+    for ap in auto_params:
+        if ap.get("mode") != "constant":
+            curves[ap["key"]] = _curve_values(ap, norm_xs).tolist()
+
+    for ci, pos in enumerate(chunk_starts.tolist()):
         c_end = min(pos + chunk_size, end)
-        norm_x = (pos - start) / region_len if region_len > 0 else 0
 
         chunk_params = {}
         chunk_params["plugin_state"] = plugin_state
 
         for ap in auto_params:
             key = ap["key"]
-            step = ap.get("step")
-            pmin = ap.get("pmin")
-            pmax = ap.get("pmax")
-
             if ap.get("mode") == "constant":
                 val = ap["value"]
             else:
-                curve = ap.get("curve_points", [(0, 0), (1, 1)])
-                bends = ap.get("curve_bends")
-                ny = interpolate_curve(curve, norm_x, bends)
-                dv = ap.get("default_val", 0)
-                tv = ap.get("target_val", 1)
-                val = dv + ny * (tv - dv)
-
-            # Quantize to step if provided
-            if step is not None and step > 0:
-                val = round(val / step) * step
-                # Cast to int if step is integer-valued
-                if step == int(step):
-                    val = int(round(val))
-
-            # Clamp to valid range
-            if pmin is not None and pmax is not None:
-                val = max(pmin, min(pmax, val))
-
-            chunk_params[key] = val
+                val = curves[key][ci]
+            chunk_params[key] = _quantise(ap, val)
 
         seg_len = c_end - pos
         segment = result[pos:c_end].copy()
@@ -159,12 +140,54 @@ def apply_automation_multi(audio: np.ndarray, start: int, end: int,
             chunks_err += 1
             if chunks_err <= 2:
                 _log.warning("Chunk %d error: %s", pos, ex, exc_info=True)
-        pos = c_end
 
     _log.info("Automation done: %d ok, %d failed", chunks_ok, chunks_err)
     return result
 
 
+def _curve_values(ap: dict, norm_x) -> np.ndarray:
+    """Raw (unquantised) values of an automated param at positions *norm_x*."""
+    curve = ap.get("curve_points", [(0, 0), (1, 1)])
+    ny = interpolate_curve(curve, np.asarray(norm_x), ap.get("curve_bends"))
+    dv = ap.get("default_val", 0)
+    tv = ap.get("target_val", 1)
+    return dv + ny * (tv - dv)
+
+
+def _quantise(ap: dict, val):
+    """Quantise a scalar param value to its step and clamp it to [pmin, pmax]."""
+    step = ap.get("step")
+    if step is not None and step > 0:
+        val = round(val / step) * step
+        # Cast to int if step is integer-valued
+        if step == int(step):
+            val = int(round(val))
+    pmin = ap.get("pmin")
+    pmax = ap.get("pmax")
+    if pmin is not None and pmax is not None:
+        val = max(pmin, min(pmax, val))
+    return val
+
+
+def _param_curve(ap: dict, n: int):
+    """Per-sample values of one automation parameter over *n* samples.
+
+    Constant params stay scalar.  Automated curves are evaluated for every
+    sample; both are quantised / clamped like the chunked path.
+    """
+    if ap.get("mode") == "constant":
+        return _quantise(ap, ap["value"])
+    vals = _curve_values(ap, np.arange(n) / n)
+    step = ap.get("step")
+    if step is not None and step > 0:
+        vals = np.round(vals / step) * step
+    pmin = ap.get("pmin")
+    pmax = ap.get("pmax")
+    if pmin is not None and pmax is not None:
+        vals = np.clip(vals, pmin, pmax)
+    return vals.astype(np.float32)
+
+
 # Backward compat
 def apply_automation(audio, start, end, process_fn, base_params,
                      param_name, default_val, target_val,
@@ -0,0 +1,16 @@
+"""
+Effets DSP du Glitch Maker.
+
+Contrat de type (dtype) commun a tous les effets :
+
+- entree et sortie en float32, forme (n,) ou (n, canaux) ;
+- le traitement reste en float32 de bout en bout : pas de conversion du
+  segment entier en float64 puis retour ;
+- le float64 n'est utilise qu'a l'interieur des filtres recursifs
+  (sosfilt / lfilter, etats de filtre) et pour les positions de lecture
+  ou accumulateurs de phase sur de longues zones ; le resultat est
+  reconverti en float32 avant d'etre ecrit dans le segment.
+
+tests/test_effects.py (TestDtypePolicy) verifie le dtype de sortie et un
+plafond de memoire de pointe par effet.
+"""
@@ -1,26 +1,56 @@
 """Chorus — doubles the signal with slight pitch/time variations for thickness."""
 import numpy as np
 
+from core.effects.delay_line import modulated_delay
+from core.effects.tables import lfo
+
+
 def chorus(audio_data: np.ndarray, start: int, end: int,
-           depth_ms: float = 5.0, rate_hz: float = 1.5,
-           mix: float = 0.5, voices: int = 2, sr: int = 44100) -> np.ndarray:
-    """Applique un effet chorus (doublement avec modulation)."""
+           depth_ms=5.0, rate_hz=1.5,
+           mix=0.5, voices: int = 2, sr: int = 44100,
+           state: dict | None = None) -> np.ndarray:
+    """Applique un effet chorus (doublement avec modulation).
+
+    depth_ms / rate_hz / mix: scalars or per-sample arrays.  Each voice is a
+    fractional tap of one delay line.  With *state* (dict, updated in place)
+    the LFO phase and the delay-line history continue across blocks;
+    otherwise the audio preceding the selection feeds the line.
+    """
     out = audio_data.copy()
-    seg = out[start:end].astype(np.float64)
+    seg = out[start:end]
     n = len(seg)
-    depth_samp = int(depth_ms * sr / 1000.0)
-    t_arr = np.arange(n, dtype=np.float64) / sr
-    result = seg.copy()
-    for v in range(voices):
-        phase = 2.0 * np.pi * v / max(voices, 1)
-        delay_mod = (depth_samp * (1.0 + np.sin(2.0 * np.pi * rate_hz * t_arr + phase)) / 2.0).astype(int)
-        indices = np.arange(n) - delay_mod
-        indices = np.clip(indices, 0, n - 1)
-        if seg.ndim == 2:
-            for ch in range(seg.shape[1]):
-                result[:, ch] += seg[indices, ch]
-        else:
-            result += seg[indices]
-    result = result / (1 + voices)
-    out[start:end] = (seg * (1 - mix) + result * mix).astype(np.float32)
+    if n == 0:
+        return out
+    voices = max(1, int(voices))
+
+    # One LFO per voice, evenly spread in phase (phase in cycles)
+    phase = 0.0 if state is None else state.get("phase", 0.0)
+    depth_samp = np.asarray(depth_ms, dtype=np.float32) * (sr / 2000.0)
+    delays = np.empty((voices, n), dtype=np.float32)
+    delays[0], next_phase = lfo(rate_hz, n, sr, phase)
+    for v in range(1, voices):
+        delays[v], _ = lfo(rate_hz, n, sr, phase + v / voices)
+    delays += 1.0
+    delays *= depth_samp
+
+    if state is not None:
+        history = state.get("history")
+    else:
+        lookback = int(np.ceil(delays.max())) + 2
+        history = audio_data[max(0, start - lookback):start]
+    taps, history = modulated_delay(seg.astype(np.float32, copy=False), delays, history)
+    if state is not None:
+        state["phase"] = next_phase
+        state["history"] = history
+
+    wet = taps[0]
+    for v in range(1, voices):
+        wet += taps[v]
+    del taps
+    # wet = (seg + taps) / (1 + voices); out = seg + (wet - seg) * mix
+    wet -= voices * seg
+    wet /= 1 + voices
+    mix = np.broadcast_to(np.asarray(mix, dtype=np.float32), (n,))
+    wet *= mix.reshape((n,) + (1,) * (seg.ndim - 1))
+    seg += wet
     return out
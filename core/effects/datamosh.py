@@ -2,6 +2,10 @@
 Datamosh Audio — Corruption de donnees audio.
 Traite l'audio comme des donnees brutes et les corrompt.
 Equivalent audio du datamoshing video.
+
+La zone est vue comme une grille (n_blocks, block_size, canaux) : chaque
+mode est une permutation d'indices de blocs ou un masque de blocs applique
+en une seule operation, independante de l'ordre de tirage.
 """
 
 import numpy as np
@@ -9,62 +13,74 @@ import numpy as np
 
 def datamosh(audio_data: np.ndarray, start: int, end: int,
              intensity: float = 0.5, block_size: int = 512,
-             mode: str = "swap") -> np.ndarray:
+             mode: str = "swap", seed: int | None = None) -> np.ndarray:
     """Corrompt l'audio en manipulant les données brutes.
     Modes: swap (echange de blocs), repeat (repete des blocs),
-           zero (met des blocs a zero), noise (injecte du bruit)."""
+           zero (met des blocs a zero), noise (injecte du bruit).
+    seed: graine du generateur ; meme graine = meme resultat."""
     result = audio_data.copy()
-    segment = result[start:end].copy()
-    if len(segment) == 0:
+    seg_len = end - start
+    if seg_len <= 0:
         return result
 
-    rng = np.random.default_rng()
-    seg_len = len(segment)
-    n_blocks = max(1, seg_len // block_size)
+    rng = np.random.default_rng(seed)
+    block_size = max(1, min(int(block_size), seg_len))
+    n_full = seg_len // block_size
+    rem = seg_len - n_full * block_size
+    # Le reste < block_size forme un dernier bloc court, d'indice n_full
+    n_blocks = n_full + (rem > 0)
     n_affected = max(1, int(n_blocks * intensity))
 
+    # Vue en blocs complets (sans copie) + le bloc court a part
+    grid = result[start:start + n_full * block_size]
+    blocks = grid.reshape((n_full, block_size) + grid.shape[1:])
+    tail = result[start + n_full * block_size:end]
+
     if mode == "swap":
-        # Echange des blocs aleatoirement
-        for _ in range(n_affected):
-            i = rng.integers(0, n_blocks)
-            j = rng.integers(0, n_blocks)
-            s1, e1 = i * block_size, min((i + 1) * block_size, seg_len)
-            s2, e2 = j * block_size, min((j + 1) * block_size, seg_len)
-            block_len = min(e1 - s1, e2 - s2)
-            tmp = segment[s1:s1 + block_len].copy()
-            segment[s1:s1 + block_len] = segment[s2:s2 + block_len]
-            segment[s2:s2 + block_len] = tmp
+        # Permutation aleatoire d'un sous-ensemble de blocs (~2 par echange) ;
+        # avec le bloc court, seuls ses rem premiers echantillons s'echangent
+        k = min(n_blocks, 2 * n_affected)
+        moved = rng.choice(n_blocks, size=k, replace=False)
+        src = rng.permutation(moved)
+        full = moved < n_full
+        into_tail = src[~full]
+        new_tail = (blocks[into_tail[0], :rem].copy()
+                    if len(into_tail) and into_tail[0] < n_full else None)
+        dst, src = moved[full], src[full]
+        from_tail = src == n_full
+        old_tail = tail.copy() if from_tail.any() else None
+        blocks[dst[~from_tail]] = blocks[src[~from_tail]]
+        if old_tail is not None:
+            blocks[dst[from_tail], :rem] = old_tail
+        if new_tail is not None:
+            tail[:] = new_tail
 
     elif mode == "repeat":
         # Repete un bloc source sur d'autres positions
-        src_idx = rng.integers(0, n_blocks)
-        src_s = src_idx * block_size
-        src_e = min(src_s + block_size, seg_len)
-        src_block = segment[src_s:src_e].copy()
-
-        for _ in range(n_affected):
-            dst_idx = rng.integers(0, n_blocks)
-            dst_s = dst_idx * block_size
-            dst_e = min(dst_s + len(src_block), seg_len)
-            block_len = dst_e - dst_s
-            segment[dst_s:dst_e] = src_block[:block_len]
-
-    elif mode == "zero":
-        # Met des blocs a zero (silences brusques)
-        for _ in range(n_affected):
-            idx = rng.integers(0, n_blocks)
-            s = idx * block_size
-            e = min(s + block_size, seg_len)
-            segment[s:e] = 0
+        src = rng.integers(0, n_blocks)
+        dst = rng.integers(0, n_blocks, size=n_affected)
+        block = (blocks[src] if src < n_full else tail).copy()
+        blocks[dst[dst < n_full], :len(block)] = block
+        if (dst == n_full).any():
+            tail[:] = block[:rem]
 
-    elif mode == "noise":
-        # Injecte du bruit dans des blocs
-        for _ in range(n_affected):
-            idx = rng.integers(0, n_blocks)
-            s = idx * block_size
-            e = min(s + block_size, seg_len)
-            shape = segment[s:e].shape
-            segment[s:e] = rng.uniform(-0.5, 0.5, size=shape).astype(np.float32)
+    elif mode in ("zero", "noise"):
+        mask = np.zeros(n_blocks, dtype=bool)
+        mask[rng.integers(0, n_blocks, size=n_affected)] = True
+        hit, tail_hit = mask[:n_full], mask[n_full:].any()
+        if mode == "zero":
+            # Silences brusques
+            blocks[hit] = 0
+            if tail_hit:
+                tail[:] = 0
+        else:
+            # Bruit uniforme dans [-0.5, 0.5)
+            noise = rng.random((int(hit.sum()),) + blocks.shape[1:], dtype=np.float32)
+            noise -= 0.5
+            blocks[hit] = noise
+            if tail_hit:
+                tail[:] = rng.random(tail.shape, dtype=np.float32) - 0.5
 
-    result[start:end] = np.clip(segment, -1.0, 1.0)
+    segment = result[start:end]
+    np.clip(segment, -1.0, 1.0, out=segment)
     return result
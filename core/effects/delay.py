@@ -6,7 +6,56 @@ avec la suite du morceau.
 """
 
 import numpy as np
+from scipy.signal import lfilter
 
+_CHUNK = 1 << 15  # float64 values per column chunk of the echo train
+
+
+def _n_echoes(feedback: float) -> tuple[int, int]:
+    """Return (audible echoes, tail length in delay periods).
+
+    The tail covers every echo down to -40 dB; echoes quieter than that
+    (gain < 0.01) are not rendered.
+    """
+    n_tail = int(np.log(0.01) / np.log(max(feedback, 0.01))) + 1
+    n_tail = min(n_tail, 30)
+    n_audible = 0
+    while n_audible < n_tail and feedback ** (n_audible + 1) >= 0.01:
+        n_audible += 1
+    return n_audible, n_tail
+
+
+def _echo_train(segment: np.ndarray, delay_samples: int, feedback: float,
+                n_echoes: int, out_len: int) -> np.ndarray:
+    """Sum of the first *n_echoes* echoes of *segment* (dry signal excluded).
+
+    echo[t] = sum_{i=1..n_echoes} feedback**i * segment[t - i * delay_samples]
+
+    Computed as a recursive comb filter: the signal is folded into
+    delay-length blocks so the comb becomes a one-pole IIR running across
+    blocks (``lfilter``, O(n) for any delay).  Subtracting the same IIR
+    delayed by n_echoes blocks truncates the echo train exactly.  The
+    float32 output buffer holds the folded input; the float64 recursion
+    runs on column chunks of it, so no full-length float64 copy is made.
+    """
+    d = delay_samples
+    tail_shape = segment.shape[1:]
+    n_blocks = -(-out_len // d)
+    out = np.zeros((n_blocks * d,) + tail_shape, dtype=np.float32)
+    out[:len(segment)] = segment
+    folded = out.reshape(n_blocks, -1)
+    m = n_echoes + 1
+    c = feedback ** n_echoes
+    cols = max(1, _CHUNK // n_blocks)
+    for c0 in range(0, folded.shape[1], cols):
+        x = folded[:, c0:c0 + cols].astype(np.float64)
+        y = lfilter([feedback], [1.0, -feedback], x, axis=0)
+        x[0] = 0.0
+        x[1:] = y[:-1]
+        if m < n_blocks:
+            x[m:] -= c * y[:-m]
+        folded[:, c0:c0 + cols] = x
+    return out[:out_len]
 
 def delay(audio_data: np.ndarray, start: int, end: int,
           delay_ms: float = 200.0, feedback: float = 0.6,
@@ -20,117 +69,56 @@ def delay(audio_data: np.ndarray, start: int, end: int,
     Returns:
         ndarray potentiellement plus long que audio_data.
     """
-    segment = audio_data[start:end].copy()
-    if len(segment) == 0:
+    segment = audio_data[start:end]
+    seg_len = len(segment)
+    if seg_len == 0:
         return audio_data.copy()
 
     delay_samples = max(1, int(delay_ms * sr / 1000.0))
     feedback = max(0.0, min(0.95, feedback))
+    n_echoes, n_tail = _n_echoes(feedback)
 
-    # Calculate how many echoes are audible
-    n_echoes = int(np.log(0.01) / np.log(max(feedback, 0.01))) + 1
-    n_echoes = min(n_echoes, 30)
-
-    # Total tail length = last echo position
-    tail_samples = n_echoes * delay_samples
-
-    # Build echo buffer (covers segment + tail)
-    seg_len = len(segment)
-    echo_len = seg_len + tail_samples
-
-    if segment.ndim == 1:
-        echo_buf = np.zeros(echo_len, dtype=np.float32)
+    # Wet buffer covers the selection + the echo tail
+    echo_len = seg_len + n_tail * delay_samples
+    if n_echoes > 0:
+        wet = _echo_train(segment, delay_samples, feedback, n_echoes, echo_len)
+        wet *= mix
     else:
-        echo_buf = np.zeros((echo_len, segment.shape[1]), dtype=np.float32)
-
-    # Place original dry signal
-    echo_buf[:seg_len] = segment
-
-    # Add echoes
-    for i in range(1, n_echoes + 1):
-        offset = i * delay_samples
-        gain = feedback ** i
-        if gain < 0.01:
-            break
-        echo_end = min(offset + seg_len, echo_len)
-        echo_src_len = echo_end - offset
-        if echo_src_len <= 0:
-            break
-        echo_buf[offset:echo_end] += segment[:echo_src_len] * gain
-
-    # Mix dry/wet for the echo buffer
-    dry_buf = np.zeros_like(echo_buf)
-    dry_buf[:seg_len] = segment
-    wet_result = dry_buf * (1.0 - mix) + echo_buf * mix
-
-    # Trim silence from tail (below -60dB)
-    threshold = 0.001
-    if wet_result.ndim == 1:
-        last_loud = np.where(np.abs(wet_result) > threshold)[0]
-    else:
-        last_loud = np.where(np.max(np.abs(wet_result), axis=1) > threshold)[0]
+        wet = np.zeros((echo_len,) + segment.shape[1:], dtype=np.float32)
+    wet[:seg_len] += segment
 
-    if len(last_loud) > 0:
-        trim_end = min(last_loud[-1] + sr // 4, len(wet_result))  # + 0.25s safety
-        wet_result = wet_result[:trim_end]
+    # Trim silence from the tail (below -60dB), + 0.25s safety
+    threshold = 0.001
+    loud = np.abs(wet[seg_len:]) > threshold
+    if loud.ndim > 1:
+        loud = loud.any(axis=1)
+    hits = np.flatnonzero(loud)
+    if len(hits) == 0:
+        # Only the end of the selection can still reach into the tail
+        guard = max(0, seg_len - sr // 4)
+        loud = np.abs(wet[guard:seg_len]) > threshold
+        if loud.ndim > 1:
+            loud = loud.any(axis=1)
+        hits = np.flatnonzero(loud) + guard
     else:
-        wet_result = wet_result[:seg_len]
-
-    # ── Reassemble: mix the tail OVER the audio that follows ──
-    result = audio_data.copy()
-    before = result[:start]
-    after = result[end:]
-
-    # The wet_result has two parts:
-    #   1. [0:seg_len] → replaces the original selection
-    #   2. [seg_len:] → the echo tail, to be mixed OVER 'after'
-    selection_part = wet_result[:seg_len]
-    tail_part = wet_result[seg_len:] if len(wet_result) > seg_len else np.array([], dtype=np.float32)
-
-    tail_len = len(tail_part)
-    after_len = len(after)
-
-    if tail_len == 0:
-        # No tail — simple replacement
-        result[start:end] = np.clip(selection_part, -1.0, 1.0)
-        return result.astype(np.float32)
-
-    if tail_len <= after_len:
-        # Tail fits within existing 'after' — mix over it
-        if after.ndim == 1 and tail_part.ndim == 1:
-            after[:tail_len] = after[:tail_len] + tail_part
-        elif after.ndim > 1 and tail_part.ndim > 1:
-            after[:tail_len] = after[:tail_len] + tail_part
-        elif after.ndim > 1 and tail_part.ndim == 1:
-            for ch in range(after.shape[1]):
-                after[:tail_len, ch] = after[:tail_len, ch] + tail_part
-        else:
-            after[:tail_len] = after[:tail_len] + tail_part
-
-        parts = [before, np.clip(selection_part, -1.0, 1.0),
-                 np.clip(after, -1.0, 1.0)]
+        hits += seg_len
+    # Nothing loud at all (silent selection): no tail, the file keeps its length
+    tail_len = 0
+    if len(hits) > 0:
+        tail_len = max(0, min(int(hits[-1]) + sr // 4, echo_len) - seg_len)
+
+    # ── Reassemble: selection replaced, tail mixed OVER the following audio ──
+    total = len(audio_data)
+    extension = max(0, end + tail_len - total)
+    if extension > 0:
+        result = np.zeros((total + extension,) + audio_data.shape[1:], dtype=np.float32)
+        result[:total] = audio_data
     else:
-        # Tail extends beyond existing audio — mix what overlaps, extend the rest
-        if after_len > 0:
-            overlap = tail_part[:after_len]
-            if after.ndim == overlap.ndim:
-                mixed_after = after + overlap
-            elif after.ndim > 1 and overlap.ndim == 1:
-                mixed_after = after.copy()
-                for ch in range(after.shape[1]):
-                    mixed_after[:, ch] = after[:, ch] + overlap
-            else:
-                mixed_after = after + overlap
-            extension = tail_part[after_len:]
-        else:
-            mixed_after = np.array([], dtype=np.float32).reshape(0, *selection_part.shape[1:]) if selection_part.ndim > 1 else np.array([], dtype=np.float32)
-            extension = tail_part
-
-        parts = [before, np.clip(selection_part, -1.0, 1.0)]
-        if len(mixed_after) > 0:
-            parts.append(np.clip(mixed_after, -1.0, 1.0))
-        if len(extension) > 0:
-            parts.append(np.clip(extension, -1.0, 1.0))
-
-    result = np.concatenate([p for p in parts if len(p) > 0], axis=0)
-    return np.clip(result, -1.0, 1.0).astype(np.float32)
+        result = audio_data.astype(np.float32, copy=True)
+
+    result[start:end] = wet[:seg_len]
+    if tail_len > 0:
+        result[end:end + tail_len] += wet[seg_len:seg_len + tail_len]
+    touched = result[start:end + tail_len]
+    np.clip(touched, -1.0, 1.0, out=touched)
+    return result
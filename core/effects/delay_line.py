@@ -0,0 +1,83 @@
+"""
+Delay line fractionnaire — lecture interpolee partagee par les effets a
+modulation (chorus, flanger, wow/flutter de vinyl et tape_glitch) ; les
+variations de vitesse de bande passent par warp_positions.
+
+Toutes les voix et tous les canaux sont lus en un seul gather vectorise ;
+l'historique de la ligne est conserve d'un bloc a l'autre pour
+l'automation et la preview.
+"""
+
+import numpy as np
+
+# Samples per gather in modulated_delay (bounds the float64 positions)
+_CHUNK = 1 << 13
+
+
+def fractional_read(line: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    """Read *line* at fractional sample positions (linear interpolation).
+
+    line: (n,) or (n, channels).  pos: any shape, float positions in
+    [0, len(line) - 1].  Returns pos.shape + line.shape[1:] in line's dtype.
+    """
+    last = len(line) - 1
+    pos = np.clip(pos, 0.0, last)
+    i0 = pos.astype(np.intp)
+    pos -= i0
+    frac = pos.astype(line.dtype)
+    del pos
+    frac = frac.reshape(frac.shape + (1,) * (line.ndim - 1))
+    out = np.take(line, i0, axis=0)
+    i0 += 1
+    np.minimum(i0, last, out=i0)
+    step = np.take(line, i0, axis=0)
+    step -= out
+    step *= frac
+    out += step
+    return out
+
+
+def modulated_delay(x: np.ndarray, delays: np.ndarray,
+                    history: np.ndarray | None = None):
+    """Run *x* through a delay line with per-sample fractional delays.
+
+    delays: (n,) or (voices, n) in samples (>= 0); every voice is one tap
+    of the same line.  history: previous input samples (oldest first),
+    e.g. the tail returned by the previous block or the audio preceding
+    the selection; missing history reads as silence.
+
+    Returns (taps, new_history): taps has shape delays.shape + x.shape[1:],
+    new_history is the tail of the line needed by the next block.
+    """
+    n = len(x)
+    need = int(np.ceil(np.max(delays))) + 2 if n else 2
+    if history is None:
+        history = np.zeros((0,) + x.shape[1:], dtype=x.dtype)
+    if len(history) < need:
+        pad = np.zeros((need - len(history),) + x.shape[1:], dtype=x.dtype)
+        history = np.concatenate([pad, history.astype(x.dtype, copy=False)])
+    h = len(history)
+    line = np.concatenate([history, x])
+
+    taps = np.empty(delays.shape + x.shape[1:], dtype=x.dtype)
+    lead = (slice(None),) * (delays.ndim - 1)
+    for c0 in range(0, n, _CHUNK):
+        span = lead + (slice(c0, c0 + _CHUNK),)
+        pos = np.arange(h + c0, h + min(n, c0 + _CHUNK), dtype=np.float64) - delays[span]
+        taps[span] = fractional_read(line, pos)
+    return taps, line[-h:].copy()
+
+
+def warp_positions(speed: np.ndarray) -> np.ndarray:
+    """Read positions for a time-warp driven by a playback *speed* curve.
+
+    speed: (n,) relative tape speed (1.0 = nominal).  The integrated speed
+    is rescaled to span [0, n - 1], so the selection keeps its length and
+    only the local pitch/timing wobbles.  Returns float64 positions for
+    fractional_read.
+    """
+    pos = np.cumsum(speed, dtype=np.float64)
+    pos -= pos[0]
+    if pos[-1] > 0:
+        pos *= (len(pos) - 1) / pos[-1]
+    return pos
@@ -7,6 +7,14 @@ import numpy as np
 from core.effects.utils import apply_micro_fade
 
 
+def _per_sample(value, n):
+    """Broadcast a scalar or per-sample parameter to a float32 (n,) array."""
+    arr = np.asarray(value, dtype=np.float32)
+    if arr.ndim == 0:
+        return np.full(n, arr, dtype=np.float32)
+    return arr[:n]
+
+
 def digital_noise(audio_data, start, end, sr=44100,
                   bit_reduction=0.5, noise_amount=0.3, sample_hold=1):
     """
@@ -15,43 +23,52 @@ def digital_noise(audio_data, start, end, sr=44100,
     Args:
         bit_reduction: intensity of bit-depth reduction (0.0–1.0).
             0 = full resolution (256 levels), 1 = extreme (4 levels).
+            Scalar or per-sample array of length end - start.
         noise_amount: amplitude of added digital noise artifacts (0.0–1.0).
+            Scalar or per-sample array of length end - start.
         sample_hold: sample-and-hold factor (1 = off, higher = more steppy/aliased).
+            Every hold block, the last (partial) one included, repeats its
+            first sample; the old per-block loop left the final block as is.
     """
     result = audio_data.copy()
-    seg = result[start:end].copy().astype(np.float64)
+    seg = result[start:end].astype(np.float32)
     n = len(seg)
     if n < 2:
         return result
 
     is_stereo = seg.ndim == 2
-    dry = seg.copy()
+    bit_reduction = _per_sample(bit_reduction, n)
+    noise_amount = _per_sample(noise_amount, n)
 
     # ── 1. Bit-depth reduction ──
-    if bit_reduction > 0.01:
+    crush = bit_reduction > 0.01
+    if np.any(crush):
         # Map 0..1 to 256..4 quantization levels
-        levels = max(4, int(256 * (1.0 - bit_reduction * 0.95)))
-        seg = np.round(seg * levels) / levels
+        levels = np.maximum(4.0, np.floor(256.0 * (1.0 - bit_reduction * 0.95)))
+        levels = levels.astype(np.float32)
+        if is_stereo:
+            levels = levels[:, np.newaxis]
+            crush = crush[:, np.newaxis]
+        seg = np.where(crush, np.round(seg * levels) / levels, seg)
 
     # ── 2. Sample-and-hold (aliasing effect) ──
     if sample_hold > 1:
         sh = int(max(2, min(64, sample_hold)))
-        if is_stereo:
-            for ch in range(seg.shape[1]):
-                for i in range(0, n - sh, sh):
-                    seg[i:i + sh, ch] = seg[i, ch]
-        else:
-            for i in range(0, n - sh, sh):
-                seg[i:i + sh] = seg[i]
+        # Each sample reads the first sample of its hold block (all channels
+        # at once), the trailing partial block too
+        held = (np.arange(n) // sh) * sh
+        seg = seg[held]
 
     # ── 3. Digital noise injection ──
-    if noise_amount > 0.01:
-        noise_amp = noise_amount * 0.08
+    noise_amp = np.where(noise_amount > 0.01, noise_amount * 0.08, 0.0)
+    if np.any(noise_amp):
+        rng = np.random.default_rng()
+        noise = rng.random(seg.shape, dtype=np.float32) * 2.0 - 1.0
         if is_stereo:
-            noise = np.random.uniform(-noise_amp, noise_amp, seg.shape)
+            noise *= noise_amp[:, np.newaxis]
         else:
-            noise = np.random.uniform(-noise_amp, noise_amp, n)
-        seg = seg + noise
+            noise *= noise_amp
+        seg += noise
 
-    result[start:end] = apply_micro_fade(seg.astype(np.float32), 64)
+    result[start:end] = apply_micro_fade(seg, 64)
     return np.clip(result, -1.0, 1.0)
@@ -1,103 +1,116 @@
 """
 Filtre Resonant — Low-pass / High-pass avec cutoff et resonance.
 Peut aussi faire un sweep (balayage) automatique.
+
+Le cutoff et la resonance acceptent des tableaux par sample : le moteur
+decoupe la trajectoire en plages de coefficients constants (cutoff quantifie
+au 1/48 d'octave, plages d'au moins 64 samples, coefficients mis en cache)
+et enchaine les plages avec un seul etat de filtre, sans reinitialisation
+ni marches audibles.
 """
 
+from functools import lru_cache
+
 import numpy as np
 from scipy.signal import butter, sosfilt
 
+# Cutoff quantisation: 48 steps per octave (~1.5 % / step, below the
+# audible zipper threshold) starting from 20 Hz.
+_STEPS_PER_OCTAVE = 48
+_MIN_CUTOFF = 20.0
+# Every design is padded to this many biquads so the filter state keeps the
+# same shape when the order (resonance) changes mid-stream.
+_MAX_SECTIONS = 4
+_IDENTITY_SECTION = np.array([1.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+# Coefficients are held for at least this many samples, so a noisy
+# trajectory never turns into one sosfilt call per sample.
+_MIN_RUN = 64
+
 
 def resonant_filter(audio_data: np.ndarray, start: int, end: int,
-                    filter_type: str = "lowpass", cutoff: float = 2000.0,
-                    resonance: float = 1.0, sweep: bool = False,
-                    sr: int = 44100, zi=None) -> np.ndarray:
+                    filter_type: str = "lowpass", cutoff=2000.0,
+                    resonance=1.0, sweep: bool = False,
+                    sr: int = 44100, zi=None, return_zf: bool | None = None):
     """Filtre LP ou HP avec cutoff et resonance (Q).
 
-    If zi is provided, returns (result, zf) for stateful processing.
+    cutoff / resonance: scalar or per-sample arrays of length end - start.
+    If zi is provided (or return_zf is True), returns (result, zf) for
+    stateful processing; zf can be passed back as zi for the next block.
     Otherwise returns just result for backward compatibility.
     """
+    if return_zf is None:
+        return_zf = zi is not None
     result = audio_data.copy()
-    segment = result[start:end].copy()
+    segment = result[start:end]
     if len(segment) == 0:
-        if zi is not None:
+        if return_zf:
             return result, zi
         return result
 
     # Clamp le cutoff pour eviter les erreurs de Nyquist
     nyquist = sr / 2.0
-    cutoff = max(20.0, min(cutoff, nyquist * 0.95))
+    cutoff = np.clip(cutoff, _MIN_CUTOFF, nyquist * 0.95)
 
     if sweep:
-        # Sweep : applique le filtre par chunks avec cutoff variable
-        output = _apply_sweep(segment, filter_type, cutoff, resonance, sr)
-        result[start:end] = output
-        if zi is not None:
-            return np.clip(result, -1.0, 1.0), None
-        return np.clip(result, -1.0, 1.0)
+        # Sweep : cutoff variable (monte puis descend) sur toute la zone
+        cutoff = _sweep_curve(len(segment), float(np.mean(cutoff)), sr)
 
-    # Stateful filter
-    output, zf = _apply_filter(segment, filter_type, cutoff, resonance, sr, zi=zi)
+    output, zf = filter_block(segment, filter_type, cutoff, resonance, sr, zi=zi)
 
     result[start:end] = output
-    if zi is not None:
-        return np.clip(result, -1.0, 1.0), zf
-    return np.clip(result, -1.0, 1.0)
+    np.clip(result, -1.0, 1.0, out=result)
+    if return_zf:
+        return result, zf
+    return result
 
 
-def _apply_filter(segment, ftype, cutoff, Q, sr, zi=None):
-    """Applique un filtre Butterworth statique.
-    Returns (output, zf) tuple.
-    """
-    nyquist = sr / 2.0
-    norm_cutoff = cutoff / nyquist
-    norm_cutoff = max(0.001, min(0.999, norm_cutoff))
+def filter_block(segment, ftype, cutoff, Q, sr, zi=None):
+    """Filtre *segment* avec cutoff / Q scalaires ou par sample.
 
-    # Ordre du filtre depend de la resonance
-    order = max(2, min(8, int(Q * 2)))
+    The per-sample trajectory is read every _MIN_RUN samples and split into
+    runs of identical (quantised) coefficients; each run is one ``sosfilt``
+    call over all channels and the state flows from run to run.
+    Returns (output float32, zf).
+    """
+    n = len(segment)
+    cut_idx = _cutoff_index(np.broadcast_to(cutoff, (n,)))
+    order = np.clip((np.broadcast_to(Q, (n,)) * 2).astype(int), 2, 8)
+    key = cut_idx * 16 + order
     btype = "low" if ftype == "lowpass" else "high"
-    sos = butter(order, norm_cutoff, btype=btype, output="sos")
 
-    if segment.ndim == 1:
-        if zi is None:
-            zi = np.zeros((sos.shape[0], 2), dtype=np.float64)
-        res, zf = sosfilt(sos, segment, zi=zi)
-        return res.astype(np.float32), zf
-    else:
-        out = segment.copy()
-        n_ch = segment.shape[1]
-        if zi is None:
-            zi = [np.zeros((sos.shape[0], 2), dtype=np.float64) for _ in range(n_ch)]
-        new_zi = []
-        for ch in range(n_ch):
-            ch_zi = zi[ch] if ch < len(zi) else np.zeros((sos.shape[0], 2), dtype=np.float64)
-            res_ch, zf_ch = sosfilt(sos, segment[:, ch], zi=ch_zi)
-            out[:, ch] = res_ch.astype(np.float32)
-            new_zi.append(zf_ch)
-        return out, new_zi
-
-
-def _apply_sweep(segment, ftype, cutoff, Q, sr):
-    """Applique un sweep de filtre (cutoff monte puis descend)."""
-    n_chunks = 32
-    chunk_size = max(256, len(segment) // n_chunks)
-    output = np.zeros_like(segment)
-    nyquist = sr / 2.0
+    if zi is None or np.shape(zi) != (_MAX_SECTIONS, 2) + segment.shape[1:]:
+        zi = np.zeros((_MAX_SECTIONS, 2) + segment.shape[1:], dtype=np.float64)
+
+    steps = np.arange(0, n, _MIN_RUN)
+    changes = steps[np.flatnonzero(np.diff(key[steps])) + 1]
+    bounds = np.concatenate(([0], changes, [n]))
+    output = np.empty(segment.shape, dtype=np.float32)
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        sos = _design(btype, int(order[a]), int(cut_idx[a]), sr)
+        output[a:b], zi = sosfilt(sos, segment[a:b], axis=0, zi=zi)
+    return output, zi
+
 
-    for i in range(n_chunks):
-        s = i * chunk_size
-        e = min(s + chunk_size, len(segment))
-        if s >= len(segment):
-            break
+def _cutoff_index(cutoff):
+    """Quantise cutoff (Hz) to its coefficient-table index."""
+    return np.rint(np.log2(np.asarray(cutoff, dtype=np.float64) / _MIN_CUTOFF)
+                   * _STEPS_PER_OCTAVE).astype(int)
 
-        # Cutoff varie en sinus (monte et descend)
-        progress = i / max(n_chunks - 1, 1)
-        sweep_mult = 0.5 + 0.5 * np.sin(progress * np.pi * 2)
-        sweep_cutoff = max(60.0, cutoff * (0.2 + sweep_mult * 1.6))
-        sweep_cutoff = min(sweep_cutoff, nyquist * 0.95)
 
-        chunk = segment[s:e].copy()
-        filtered, _ = _apply_filter(chunk, ftype, sweep_cutoff, Q, sr)
-        output[s:e] = filtered
+@lru_cache(maxsize=4096)
+def _design(btype, order, cut_idx, sr):
+    """Butterworth SOS for a quantised cutoff, padded to _MAX_SECTIONS."""
+    cutoff = _MIN_CUTOFF * 2.0 ** (cut_idx / _STEPS_PER_OCTAVE)
+    norm_cutoff = max(0.001, min(0.999, cutoff / (sr / 2.0)))
+    sos = butter(order, norm_cutoff, btype=btype, output="sos")
+    pad = np.tile(_IDENTITY_SECTION, (_MAX_SECTIONS - len(sos), 1))
+    return np.vstack([sos, pad])
+
 
-    return output
+def _sweep_curve(n, cutoff, sr):
+    """Cutoff per sample : varie en sinus (monte et descend) autour de *cutoff*."""
+    nyquist = sr / 2.0
+    progress = np.linspace(0.0, 1.0, n)
+    sweep_mult = 0.5 + 0.5 * np.sin(progress * np.pi * 2)
+    return np.clip(cutoff * (0.2 + sweep_mult * 1.6), 60.0, nyquist * 0.95)
 
@@ -4,63 +4,66 @@ Textures impredictibles, signature dariacore / experimental.
 """
 
 import numpy as np
-from core.effects.utils import apply_micro_fade
+
+from core.effects.tables import fade_window
+
+
+def _grain_schedule(n_grains: int, density: float, randomize: float,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Table d'ordre de lecture des grains (permutation + repetitions)."""
+    order = np.arange(n_grains)
+    if randomize > 0:
+        # Melange partiel : une fraction `randomize` des grains echange de place
+        n_moved = min(n_grains, int(n_grains * randomize))
+        if n_moved > 1:
+            pos = rng.choice(n_grains, size=n_moved, replace=False)
+            order[pos] = order[rng.permutation(pos)]
+    if density > 1.0:
+        # Densite > 1 = certains grains sont joues deux fois
+        reps = 1 + (rng.random(n_grains) < (density - 1.0))
+        order = np.repeat(order, reps)
+    return order
 
 
 def granular(audio_data: np.ndarray, start: int, end: int,
              grain_size_ms: float = 50.0, density: float = 1.0,
-             randomize: float = 0.5, sr: int = 44100) -> np.ndarray:
-    """Decoupe la zone en grains et les repositionne aleatoirement."""
+             randomize: float = 0.5, sr: int = 44100,
+             seed: int | None = None) -> np.ndarray:
+    """Decoupe la zone en grains et les repositionne aleatoirement.
+    seed: graine du generateur ; meme graine = meme resultat."""
     result = audio_data.copy()
-    segment = result[start:end].copy()
+    segment = result[start:end]
+    target_len = end - start
     if len(segment) == 0:
         return result
 
     # Taille du grain en samples
     grain_samples = max(64, int(grain_size_ms * sr / 1000.0))
-    n_grains = max(1, len(segment) // grain_samples)
-
-    # Extraire les grains
-    grains = []
-    for i in range(n_grains):
-        s = i * grain_samples
-        e = min(s + grain_samples, len(segment))
-        g = segment[s:e].copy()
-        g = apply_micro_fade(g, fade_samples=min(32, len(g) // 4))
-        grains.append(g)
-
-    if not grains:
+    n_grains = len(segment) // grain_samples
+    if n_grains == 0:
+        # Zone plus courte qu'un grain : un seul grain partiel, juste fade
+        win = fade_window(len(segment), min(32, len(segment) // 4))
+        result[start:end] = segment * win.reshape((-1,) + (1,) * (segment.ndim - 1))
         return result
 
-    # Reorganiser selon le niveau de randomisation
-    rng = np.random.default_rng()
-    indices = np.arange(len(grains))
-
-    if randomize > 0:
-        # Melange partiel : plus randomize est haut, plus c'est chaotique
-        n_swaps = int(len(grains) * randomize)
-        for _ in range(n_swaps):
-            i, j = rng.integers(0, len(grains), size=2)
-            indices[i], indices[j] = indices[j], indices[i]
+    tail = segment.shape[1:]
+    # Vue sur la zone : la sortie est rendue a part puis recopiee
+    grains = segment[:n_grains * grain_samples].reshape((n_grains, grain_samples) + tail)
+    win = fade_window(grain_samples, min(32, grain_samples // 4))
+    win = win.reshape((grain_samples,) + (1,) * len(tail))
 
-    # Reconstruire avec densite (repetition de grains)
-    output_grains = []
-    for idx in indices:
-        output_grains.append(grains[idx])
-        # Densite > 1 = repete certains grains
-        if density > 1.0 and rng.random() < (density - 1.0):
-            output_grains.append(grains[idx])
+    order = _grain_schedule(n_grains, density, randomize, np.random.default_rng(seed))
 
-    output = np.concatenate(output_grains, axis=0)
-
-    # Ajuster a la taille originale (couper ou padder)
-    target_len = end - start
-    if len(output) > target_len:
-        output = output[:target_len]
-    elif len(output) < target_len:
-        pad = np.zeros((target_len - len(output),) + output.shape[1:],
-                        dtype=np.float32)
-        output = np.concatenate([output, pad], axis=0)
+    # Rendu : un seul gather dans la sortie preallouee
+    output = np.zeros((target_len,) + tail, dtype=result.dtype)
+    n_full = min(len(order), target_len // grain_samples)
+    if n_full > 0:
+        view = output[:n_full * grain_samples].reshape((n_full, grain_samples) + tail)
+        np.take(grains, order[:n_full], axis=0, out=view)
+        view *= win
+    rest = target_len - n_full * grain_samples
+    if n_full < len(order) and rest > 0:
+        output[n_full * grain_samples:] = grains[order[n_full], :rest] * win[:rest]
 
     result[start:end] = output
     return result
@@ -0,0 +1,93 @@
+"""
+Index-map renderer — effets de montage (stutter, buffer_freeze, shuffle).
+
+Un effet decrit sa sortie comme une suite de tranches de la source
+(debut, longueur, sens, gain).  slice_map en deduit un tableau d'indices
+et une enveloppe de gain (micro fades anti-clic + decay), puis render
+produit la sortie en un seul np.take dans un buffer preallouable.
+Memoire O(sortie), aucune copie ni allocation par tranche.
+"""
+
+import numpy as np
+
+
+def fade_gain(offset: np.ndarray, length: np.ndarray, fade: np.ndarray) -> np.ndarray:
+    """Gain of apply_micro_fade at *offset* inside a part of *length* samples.
+
+    All arguments broadcast; *fade* is capped at length // 2 like
+    apply_micro_fade.  Returns float32.
+    """
+    fade = np.minimum(fade, length // 2)
+    denom = np.maximum(fade - 1, 1).astype(np.float32)
+    head = offset / denom
+    tail = (length - 1 - offset) / denom
+    gain = np.minimum(head, tail, out=head).astype(np.float32)
+    np.minimum(gain, 1.0, out=gain)
+    # Degenerate fades, as linspace gives them: 1 sample mutes only the
+    # first sample, 0 samples leaves the part untouched
+    if np.any(fade < 2):
+        gain = np.where(fade == 1, offset > 0, gain).astype(np.float32)
+        gain[np.broadcast_to(fade == 0, gain.shape)] = 1.0
+    return gain
+
+
+def slice_map(starts, lengths, reverse=None, gains=None, fade: int = 0):
+    """Flatten a list of source slices into (index, gain) arrays.
+
+    starts / lengths: per part, source start and length in samples.
+    reverse: optional per-part bool (read the slice backwards).
+    gains: optional per-part gain (e.g. decay).
+    fade: micro fade per part, min(fade, length // 4) samples at each end.
+    Returns (index intp, gain float32), one entry per output sample.
+
+    The index is the running sum of per-sample steps (+1, or -1 inside
+    reversed parts) with a jump at each part boundary, so only the two
+    output-sized arrays are allocated; fades touch only the faded samples.
+    """
+    starts = np.asarray(starts, dtype=np.intp)
+    lengths = np.asarray(lengths, dtype=np.intp)
+    keep = lengths > 0
+    starts, lengths = starts[keep], lengths[keep]
+    rev = (np.zeros(len(lengths), dtype=bool) if reverse is None
+           else np.asarray(reverse, dtype=bool)[keep])
+    first = np.cumsum(lengths) - lengths
+    total = int(lengths.sum())
+
+    # Index: first sample of each part, then +1 / -1 per sample
+    begin = np.where(rev, starts + lengths - 1, starts)
+    last = np.where(rev, starts, starts + lengths - 1)
+    index = np.ones(total, dtype=np.intp)
+    for f, n in zip(first[rev], lengths[rev]):
+        index[f:f + n] = -1
+    if total:
+        index[first] = begin - np.concatenate(([0], last[:-1]))
+        np.cumsum(index, out=index)
+
+    # Gain: per-part level, then the micro fades at both ends
+    if gains is not None:
+        gain = np.repeat(np.asarray(gains, dtype=np.float32)[keep], lengths)
+    else:
+        gain = np.ones(total, dtype=np.float32)
+    fades = np.minimum(fade, lengths // 4)
+    width = int(fades.max()) if len(fades) else 0
+    if width > 0:
+        o = np.arange(width)
+        inside = o < fades[:, np.newaxis]
+        for offset in (o, lengths[:, np.newaxis] - 1 - o):
+            factor = fade_gain(offset, lengths[:, np.newaxis], fades[:, np.newaxis])
+            pos = first[:, np.newaxis] + offset
+            gain[pos[inside]] *= factor[inside]
+    return index, gain
+
+
+def render(source: np.ndarray, index: np.ndarray, gain: np.ndarray | None = None,
+           out: np.ndarray | None = None) -> np.ndarray:
+    """out[i] = source[index[i]] * gain[i] along axis 0, in one gather.
+
+    *out* (optional) must not overlap *source*; it receives the result in
+    place, e.g. a slice of a preallocated output buffer.
+    """
+    out = np.take(source, index, axis=0, out=out, mode="clip")
+    if gain is not None:
+        out *= gain if out.ndim == 1 else gain[:, np.newaxis]
+    return out
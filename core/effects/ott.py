@@ -1,93 +1,159 @@
 """
 OTT (Over The Top) — Compression multiband extreme.
 LA signature sonore de l'hyperpop : ecrase la dynamique sur 3 bandes.
+
+Moteur : crossover Linkwitz-Riley 4e ordre (200 Hz / 5 kHz, coefficients en
+cache par sample rate), suiveur d'enveloppe crete attack/release avec
+look-ahead, gain lie en stereo, compression vers le bas ET vers le haut.
+Tout est vectorise sur les deux canaux ; l'etat (filtres + enveloppes) peut
+etre conserve d'un bloc a l'autre via *state*.
 """
 
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import butter, sosfilt
+from scipy.ndimage import maximum_filter1d
+from scipy.signal import butter, lfilter, sosfilt
+
+_CROSSOVERS = (200.0, 5000.0)
+
+# Per band: (down threshold dB, down ratio, up threshold dB, up ratio,
+#            attack ms, release ms)
+_BANDS = (
+    (-20.0, 8.0, -42.0, 3.0, 10.0, 150.0),   # low
+    (-22.0, 10.0, -44.0, 3.0, 3.0, 80.0),    # mid
+    (-26.0, 12.0, -46.0, 3.0, 1.0, 40.0),    # high
+)
+_MAX_UPWARD_DB = 18.0
+_FLOOR_DB = -70.0          # below this nothing is lifted (keeps silence silent)
+_LOOKAHEAD_MS = 2.0
+_CHUNK = 1 << 14           # samples per filter / envelope pass (bounded float64 temporaries)
 
 
 def ott(audio_data: np.ndarray, start: int, end: int,
-        depth: float = 0.7, sr: int = 44100) -> np.ndarray:
+        depth=0.7, sr: int = 44100, state: dict | None = None) -> np.ndarray:
     """Compression multiband OTT sur la zone.
-    depth: 0.0 = pas d'effet, 1.0 = compression max."""
-    result = audio_data.copy()
-    segment = result[start:end].copy()
+    depth: 0.0 = pas d'effet, 1.0 = compression max (scalaire ou par sample).
+    state: dict optionnel, mis a jour en place pour enchainer les blocs."""
+    result = audio_data.astype(np.float32)
+    segment = result[start:end]
     if len(segment) == 0:
         return result
+    if state is None:
+        state = {}
 
-    nyquist = sr / 2.0
-    depth = max(0.0, min(1.0, depth))
-
-    # Travailler en mono temporairement si stereo
-    is_stereo = segment.ndim > 1 and segment.shape[1] >= 2
-    if is_stereo:
-        mono = np.mean(segment, axis=1)
-    else:
-        mono = segment.copy()
-
-    # Separer en 3 bandes : low / mid / high
-    low = _band_filter(mono, 0, 200, sr)
-    mid = _band_filter(mono, 200, 5000, sr)
-    high = _band_filter(mono, 5000, nyquist * 0.95, sr)
-
-    # Compresser chaque bande agressivement
-    low_c = _compress(low, threshold=0.1, ratio=8.0, depth=depth)
-    mid_c = _compress(mid, threshold=0.08, ratio=10.0, depth=depth)
-    high_c = _compress(high, threshold=0.05, ratio=12.0, depth=depth)
-
-    # Recombiner
-    combined = low_c + mid_c + high_c
-    combined = np.clip(combined, -1.0, 1.0).astype(np.float32)
-
-    # Remettre en stereo si necessaire
-    if is_stereo:
-        result[start:end, 0] = combined
-        result[start:end, 1] = combined
-    else:
-        result[start:end] = combined
-
-    return result
-
-
-def _band_filter(audio, low_freq, high_freq, sr):
-    """Extrait une bande de frequence."""
-    nyquist = sr / 2.0
-    low_n = max(0.001, low_freq / nyquist)
-    high_n = min(0.999, high_freq / nyquist)
-
-    if low_n <= 0.001:
-        # Passe-bas uniquement
-        sos = butter(4, high_n, btype="low", output="sos")
-    elif high_n >= 0.999:
-        # Passe-haut uniquement
-        sos = butter(4, low_n, btype="high", output="sos")
-    else:
-        sos = butter(4, [low_n, high_n], btype="band", output="sos")
-
-    return sosfilt(sos, audio).astype(np.float32)
+    n = len(segment)
+    depth = np.clip(np.broadcast_to(np.asarray(depth, dtype=np.float32), (n,)), 0.0, 1.0)
+    depth = depth.reshape((n,) + (1,) * (segment.ndim - 1))
 
+    low, mid, high = _split_bands(segment, sr, state)
 
-def _compress(audio, threshold=0.1, ratio=8.0, depth=1.0):
-    """Compression simple : reduit la dynamique au-dessus du seuil."""
-    output = audio.copy()
-    abs_signal = np.abs(output)
+    segment[:] = 0.0
+    for b, (band, params) in enumerate(zip((low, mid, high), _BANDS)):
+        gain = _band_gain_db(band, params, sr, state, b)
+        gain = gain.reshape((n,) + (1,) * (segment.ndim - 1))
+        gain *= depth
+        gain *= np.float32(np.log(10.0) / 20.0)
+        np.exp(gain, out=gain)          # 10 ** (gain_db * depth / 20)
+        band *= gain
+        segment += band
 
-    # Ou le signal depasse le seuil
-    mask = abs_signal > threshold
-    if np.any(mask):
-        # Gain reduction
-        excess = abs_signal[mask] - threshold
-        compressed_excess = excess / ratio
-        target = threshold + compressed_excess
+    # Makeup gain (compenser la reduction)
+    segment *= 1.0 + depth
+    np.clip(segment, -1.0, 1.0, out=segment)
+    return result
 
-        # Appliquer avec le depth
-        gain = np.ones_like(abs_signal)
-        gain[mask] = target / (abs_signal[mask] + 1e-10)
-        gain = 1.0 + (gain - 1.0) * depth
 
-        output *= gain
+# ── Crossover ──
 
-    # Makeup gain (compenser la reduction)
-    output *= (1.0 + depth * 2.0)
-    return np.clip(output, -1.0, 1.0).astype(np.float32)
+@lru_cache(maxsize=8)
+def _crossover(sr: int):
+    """LR4 low/high sections per crossover + the low band phase allpass."""
+    nyquist = sr / 2.0
+    sections = []
+    for fc in _CROSSOVERS:
+        wn = min(0.999, fc / nyquist)
+        lp = butter(2, wn, btype="low", output="sos")
+        hp = butter(2, wn, btype="high", output="sos")
+        sections.append((np.vstack([lp, lp]), np.vstack([hp, hp])))
+    # LP4 + HP4 of a Linkwitz-Riley pair is the 2nd-order allpass built on
+    # the Butterworth denominator: applying it to the low band keeps the
+    # three bands in phase at the upper crossover.
+    _, a1, a2 = sections[1][0][0, 3:]
+    allpass = np.array([[a2, a1, 1.0, 1.0, a1, a2]])
+    return sections, allpass
+
+
+def _split_bands(segment, sr, state):
+    """Low / mid / high bands (float32) that sum to an allpassed input.
+
+    The float64 filters run chunk by chunk, carrying their state."""
+    ((lp1, hp1), (lp2, hp2)), allpass = _crossover(sr)
+    zi = state.get("xover_zi")
+    if zi is None or zi[0].shape[2:] != segment.shape[1:]:
+        zi = [np.zeros((len(s), 2) + segment.shape[1:])
+              for s in (lp1, hp1, lp2, hp2, allpass)]
+    # Channel-major like sosfilt's own output: the detector reads channels
+    low, mid, high = (np.empty(segment.shape, dtype=np.float32, order="F")
+                      for _ in range(3))
+    for c0 in range(0, len(segment), _CHUNK):
+        x = segment[c0:c0 + _CHUNK]
+        c1 = c0 + len(x)
+        lo, zi[0] = sosfilt(lp1, x, axis=0, zi=zi[0])
+        rest, zi[1] = sosfilt(hp1, x, axis=0, zi=zi[1])
+        low[c0:c1], zi[4] = sosfilt(allpass, lo, axis=0, zi=zi[4])
+        mid[c0:c1], zi[2] = sosfilt(lp2, rest, axis=0, zi=zi[2])
+        high[c0:c1], zi[3] = sosfilt(hp2, rest, axis=0, zi=zi[3])
+    state["xover_zi"] = zi
+    return low, mid, high
+
+
+# ── Dynamics ──
+
+def _envelope(level, sr, attack_ms, release_ms, state, key):
+    """Decoupled peak follower: instant attack / exponential release peak
+    hold (running max in the log domain), then one-pole attack smoothing.
+
+    Both stages are vectorised (cumulative max + lfilter) and resume from
+    state[key] = (held peak, smoother zi).
+    """
+    n = len(level)
+    rel = np.exp(-1.0 / max(1.0, release_ms * sr / 1000.0))
+    att = np.exp(-1.0 / max(1.0, attack_ms * sr / 1000.0))
+    held, zi = state.get(key, (0.0, np.zeros(1)))
+
+    # held[t] = max_k level[k] * rel**(t - k)
+    #         = rel**t * max_k (level[k] / rel**k)        (in logs)
+    lr = np.log(rel)
+    k = np.arange(n, dtype=np.float64)
+    log_lvl = np.log(np.maximum(level, 1e-12)) - k * lr
+    log_lvl[0] = max(log_lvl[0], np.log(max(held, 1e-12)) + lr)
+    peak = np.exp(np.maximum.accumulate(log_lvl) + k * lr)
+
+    env, zi = lfilter([1.0 - att], [1.0, -att], peak, zi=zi)
+    state[key] = (float(peak[-1]), zi)
+    return env
+
+
+def _band_gain_db(band, params, sr, state, b):
+    """Stereo-linked gain (dB, at full depth) for one band."""
+    down_thr, down_ratio, up_thr, up_ratio, attack_ms, release_ms = params
+    level = np.abs(band)
+    if level.ndim > 1:
+        level = level.max(axis=1)
+    # Look-ahead: the detector sees each peak a few ms before it arrives
+    look = max(1, int(_LOOKAHEAD_MS * sr / 1000.0))
+    level = maximum_filter1d(level, look, origin=-(look // 2))
+
+    gain = np.empty(len(level), dtype=np.float32)
+    for c0 in range(0, len(level), _CHUNK):
+        env = _envelope(level[c0:c0 + _CHUNK], sr, attack_ms, release_ms,
+                        state, f"env{b}")
+        env_db = 20.0 * np.log10(np.maximum(env, 1e-7))
+
+        # Downward above down_thr, upward (limited) between the floor and up_thr
+        down = np.minimum(0.0, (down_thr - env_db) * (1.0 - 1.0 / down_ratio))
+        up = np.clip((up_thr - env_db) * (1.0 - 1.0 / up_ratio), 0.0, _MAX_UPWARD_DB)
+        up[env_db < _FLOOR_DB] = 0.0
+        gain[c0:c0 + len(env)] = down + up
+    return gain
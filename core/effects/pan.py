@@ -12,7 +12,7 @@ def pan_stereo(audio_data: np.ndarray, start: int, end: int,
         mono: if True, merge to mono (same signal on both channels)
     """
     out = audio_data.copy()
-    seg = out[start:end].astype(np.float64)
+    seg = out[start:end].astype(np.float32)
 
     # Ensure stereo
     if seg.ndim == 1:
@@ -36,7 +36,7 @@ def pan_stereo(audio_data: np.ndarray, start: int, end: int,
     seg[:, 0] *= gain_l
     seg[:, 1] *= gain_r
 
-    out[start:end] = seg.astype(np.float32)
+    out[start:end] = seg
     if out[start:end].ndim != audio_data[start:end].ndim:
-        out[start:end] = seg[:, :audio_data.shape[1] if audio_data.ndim > 1 else 1].astype(np.float32)
+        out[start:end] = seg[:, :audio_data.shape[1] if audio_data.ndim > 1 else 1]
     return out
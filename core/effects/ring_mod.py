@@ -5,28 +5,31 @@ Produit des sons metalliques, robotiques, inharmoniques.
 
 import numpy as np
 
+from core.effects.tables import lfo
+
 
 def ring_mod(audio_data: np.ndarray, start: int, end: int,
-             freq: float = 440.0, mix: float = 0.7,
-             sr: int = 44100) -> np.ndarray:
-    """Applique une modulation en anneau sur la zone."""
+             freq=440.0, mix=0.7,
+             sr: int = 44100, state: dict | None = None) -> np.ndarray:
+    """Applique une modulation en anneau sur la zone.
+
+    freq / mix: scalars or per-sample arrays.  With *state* (dict, updated
+    in place) the carrier phase continues across blocks.
+    """
     result = audio_data.copy()
-    segment = result[start:end].copy()
+    segment = result[start:end]
     if len(segment) == 0:
         return result
 
     # Generer la porteuse sinusoidale
-    t = np.arange(len(segment), dtype=np.float32) / sr
-    carrier = np.sin(2.0 * np.pi * freq * t).astype(np.float32)
-
-    # Appliquer la modulation
-    if segment.ndim == 1:
-        modulated = segment * carrier
-    else:
-        modulated = segment.copy()
-        for ch in range(segment.shape[1]):
-            modulated[:, ch] = segment[:, ch] * carrier
+    phase = 0.0 if state is None else state.get("phase", 0.0)
+    carrier, phase = lfo(freq, len(segment), sr, phase)
+    if state is not None:
+        state["phase"] = phase
 
-    # Mix dry/wet
-    result[start:end] = segment * (1.0 - mix) + modulated * mix
+    # Mix dry/wet : seg * (1 - mix) + seg * carrier * mix
+    gain = 1.0 + (carrier - 1.0) * np.asarray(mix, dtype=np.float32)
+    if segment.ndim > 1:
+        gain = gain.reshape(-1, 1)
+    result[start:end] = segment * gain
     return np.clip(result, -1.0, 1.0)
@@ -3,8 +3,12 @@ Robotic — Granular robotic voice effect.
 Creates a metallic, granular sound via micro-grain resynthesis + ring modulation.
 """
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from core.effects.tables import lfo, window
 from core.effects.utils import apply_micro_fade
 
+_CHUNK = 1 << 14  # rows per differencing pass in _box_smooth
+
 
 def robot(audio_data, start, end, sr=44100,
           grain_ms=8, robot_amount=0.7, metallic=0.4,
@@ -17,81 +21,102 @@ def robot(audio_data, start, end, sr=44100,
     monotone: 0.0 = keep pitch variation, 1.0 = flatten to fixed pitch
     pitch_hz: fixed pitch when monotone > 0
     """
-    result = audio_data.copy()
-    seg = result[start:end].copy().astype(np.float64)
-    n = len(seg)
+    result = audio_data.astype(np.float32)
+    dry = result[start:end]
+    n = len(dry)
     if n < 64:
         return result
-    is_stereo = seg.ndim == 2
-
-    dry = seg.copy()
+    is_stereo = dry.ndim == 2
 
     # ── 1. Micro-grain resynthesis (creates robotic texture) ──
     grain_size = max(16, int(grain_ms / 1000 * sr))
     grain_size = min(grain_size, n)
     hop = grain_size // 2
-    window = np.hanning(grain_size).astype(np.float64)
-    output = np.zeros_like(seg)
-    weight = np.zeros(n, dtype=np.float64)
-
-    for i in range(0, n - grain_size, hop):
-        if is_stereo:
-            grain = seg[i:i + grain_size].copy()
-            for ch in range(grain.shape[1]):
-                grain[:, ch] *= window
-            output[i:i + grain_size] += grain
-        else:
-            grain = seg[i:i + grain_size] * window
-            output[i:i + grain_size] += grain
-        weight[i:i + grain_size] += window
-
-    # Normalize overlap-add
-    if is_stereo:
-        w = np.maximum(weight, 1e-8)[:, np.newaxis]
-        seg = output / w
-    else:
-        seg = output / np.maximum(weight, 1e-8)
+    seg = _overlap_add(dry, window("hann", grain_size), hop)
 
     # ── 2. Monotone pitch flattening ──
     if monotone > 0.1:
-        t = np.arange(n, dtype=np.float64) / sr
-        carrier = np.sin(2 * np.pi * pitch_hz * t)
-        # Extract envelope
+        carrier, _ = lfo(pitch_hz, n, sr)
         if is_stereo:
-            for ch in range(seg.shape[1]):
-                env = np.abs(seg[:, ch])
-                # Smooth envelope
-                kernel_size = max(1, int(sr * 0.005))
-                if kernel_size > 1:
-                    kernel = np.ones(kernel_size) / kernel_size
-                    env = np.convolve(env, kernel, mode='same')
-                mono_signal = env * carrier
-                seg[:, ch] = seg[:, ch] * (1.0 - monotone) + mono_signal * monotone
-        else:
-            env = np.abs(seg)
-            kernel_size = max(1, int(sr * 0.005))
-            if kernel_size > 1:
-                kernel = np.ones(kernel_size) / kernel_size
-                env = np.convolve(env, kernel, mode='same')
-            mono_signal = env * carrier
-            seg = seg * (1.0 - monotone) + mono_signal * monotone
+            carrier = carrier[:, np.newaxis]
+        # Extract + smooth the envelope of every channel in one pass
+        env = _box_smooth(np.abs(seg), max(1, int(sr * 0.005)))
+        env *= carrier
+        env *= monotone
+        seg *= 1.0 - monotone
+        seg += env
+        del env
 
     # ── 3. Metallic ring modulation ──
     if metallic > 0.01:
-        t = np.arange(n, dtype=np.float64) / sr
         # Use multiple harmonically related frequencies
-        ring = (0.5 * np.sin(2 * np.pi * 180 * t) +
-                0.3 * np.sin(2 * np.pi * 320 * t) +
-                0.2 * np.sin(2 * np.pi * 520 * t))
-        if is_stereo:
-            ring2d = ring[:, np.newaxis]
-            seg = seg * (1.0 - metallic) + seg * ring2d * metallic
-        else:
-            seg = seg * (1.0 - metallic) + seg * ring * metallic
+        ring, _ = lfo(180, n, sr)
+        ring *= 0.5
+        for f, g in ((320, 0.3), (520, 0.2)):
+            partial, _ = lfo(f, n, sr)
+            partial *= g
+            ring += partial
+        # seg * (1 - metallic) + seg * ring * metallic
+        ring *= metallic
+        ring += 1.0 - metallic
+        seg *= ring[:, np.newaxis] if is_stereo else ring
 
     # ── Mix dry/wet ──
-    amount = np.clip(robot_amount, 0.0, 1.0)
-    seg = dry * (1.0 - amount) + seg * amount
+    amount = float(np.clip(robot_amount, 0.0, 1.0))
+    seg *= amount
+    dry *= 1.0 - amount
+    dry += seg
+    del seg
+
+    dry[:] = apply_micro_fade(dry, 128)
+    return np.clip(result, -1.0, 1.0, out=result)
+
+
+def _overlap_add(seg, window, hop):
+    """Windowed overlap-add resynthesis, normalised by the summed window.
+
+    Frames are read through a strided view of each channel.  They are
+    split into groups of frames that do not overlap (every G-th frame),
+    so each group is windowed and added to the output through one
+    writeable strided view, without an index array or frame copies.
+    """
+    n = len(seg)
+    grain_size = len(window)
+    if n - grain_size <= 0:
+        return np.zeros_like(seg)
+    groups = -(-grain_size // hop)
+    stride = groups * hop
+    weight = np.zeros(n, dtype=np.float32)
+    w_frames = sliding_window_view(weight, grain_size, writeable=True)
+    for g in range(groups):
+        w_frames[g * hop:n - grain_size:stride] += window
+    np.maximum(weight, 1e-8, out=weight)
+    chans = seg.reshape(n, -1)
+    output = np.zeros(chans.shape, dtype=np.float32)
+    for c in range(chans.shape[1]):
+        src = sliding_window_view(chans[:, c], grain_size)
+        dst = sliding_window_view(output[:, c], grain_size, writeable=True)
+        for g in range(groups):
+            sel = slice(g * hop, n - grain_size, stride)
+            dst[sel] += src[sel] * window
+        output[:, c] /= weight
+    return output.reshape(seg.shape)
+
 
-    result[start:end] = apply_micro_fade(seg.astype(np.float32), 128)
-    return np.clip(result, -1.0, 1.0)
+def _box_smooth(x, k):
+    """Centered moving average of length *k* along axis 0 (same alignment as
+    ``np.convolve(x, ones(k) / k, mode='same')``), O(n) via a cumulative sum
+    (float64, differenced chunk by chunk into the float32 result)."""
+    if k <= 1:
+        return x
+    # c[1:] is the cumulative sum of x zero-padded by k // 2 / (k - 1) // 2
+    c = np.zeros((len(x) + k,) + x.shape[1:], dtype=np.float64)
+    c[1 + k // 2:1 + k // 2 + len(x)] = x
+    np.cumsum(c, axis=0, out=c)
+    out = np.empty_like(x)
+    for i in range(0, len(x), _CHUNK):
+        j = min(i + _CHUNK, len(x))
+        d = c[k + i:k + j] - c[i:j]
+        d /= k
+        out[i:j] = d
+    return out
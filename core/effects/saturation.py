@@ -7,6 +7,7 @@ Effet Saturation — 3 modes avec des caractères sonores distincts.
 """
 
 import numpy as np
+from core.effects.utils import one_pole_lowpass
 from utils.logger import get_logger
 
 _log = get_logger("effect.saturation")
@@ -30,10 +31,10 @@ def saturate(audio_data: np.ndarray, start: int, end: int,
     Returns:
         Audio avec saturation appliquée, clippé à [-1, 1].
     """
-    result = audio_data.copy()
+    result = audio_data.astype(np.float32)
     drive = max(0.5, min(20.0, drive))
     tone = max(0.0, min(1.0, tone))
-    segment = result[start:end].copy().astype(np.float64)
+    segment = result[start:end]
 
     if mode == "hard":
         seg = _hard_mode(segment, drive)
@@ -46,14 +47,14 @@ def saturate(audio_data: np.ndarray, start: int, end: int,
     seg = _apply_tone(seg, tone, sr)
 
     # ── Output gain compensation ──
-    peak = np.max(np.abs(seg))
+    peak = max(float(seg.max(initial=0.0)), -float(seg.min(initial=0.0)))
     if peak > 1.0:
         seg /= peak * 1.02  # slight headroom
 
-    result[start:end] = seg.astype(np.float32)
+    result[start:end] = seg
     _log.debug("Saturation mode=%s drive=%.1f tone=%.1f applied to %d samples",
                mode, drive, tone, end - start)
-    return np.clip(result, -1.0, 1.0)
+    return np.clip(result, -1.0, 1.0, out=result)
 
 
 def _soft_mode(seg: np.ndarray, drive: float) -> np.ndarray:
@@ -92,23 +93,28 @@ def _hard_mode(seg: np.ndarray, drive: float) -> np.ndarray:
 def _overdrive_mode(seg: np.ndarray, drive: float) -> np.ndarray:
     """Saturation tube — courbe asymétrique chaude avec compression naturelle.
     Émule l'étage de gain d'un ampli à tubes. Son gras et musical."""
-    gained = seg * drive
+    gained = seg * np.float32(drive)
     # Tube-style asymmetric waveshaping:
-    # Positive half: soft knee compression (triode-like)
-    # Negative half: harder clipping (push-pull asymmetry)
-    pos = gained * (gained >= 0)
-    neg = gained * (gained < 0)
-    # Positive: polynomial soft clip (warm, compressive)
-    pos_sat = np.where(pos <= 1.0 / 3,
-                       2.0 * pos,
-                       np.where(pos <= 2.0 / 3,
-                                (3.0 - (2.0 - 3.0 * pos) ** 2) / 3.0,
-                                1.0))
-    # Negative: tanh for slightly harder character
-    neg_sat = np.tanh(neg * 1.5) / np.tanh(1.5)
-    result = pos_sat + neg_sat
+    # Negative half: tanh for slightly harder character (push-pull asymmetry)
+    neg = gained < 0
+    result = np.tanh(gained * np.float32(1.5))
+    result *= np.float32(1.0 / np.tanh(1.5))
+    # Positive half: polynomial soft clip (warm, compressive, triode-like),
+    # 2x up to 1/3, 1 - (2 - 3x)^2 / 3 up to 2/3, then flat at 1
+    pos = np.clip(gained, 0.0, 2.0 / 3, out=gained)
+    knee = pos * -3.0
+    knee += 2.0
+    knee *= knee
+    knee *= -1.0 / 3
+    knee += 1.0
+    low = pos <= 1.0 / 3
+    pos *= 2.0
+    np.copyto(knee, pos, where=low)
+    np.copyto(result, knee, where=~neg)
     # Add subtle 2nd harmonic (tube warmth)
-    result = result + 0.1 * result ** 2
+    np.multiply(result, result, out=knee)
+    knee *= 0.1
+    result += knee
     return result
 
 
@@ -133,16 +139,7 @@ def _apply_tone(seg: np.ndarray, tone: float, sr: int) -> np.ndarray:
 
 def _one_pole_lp(seg: np.ndarray, alpha: float) -> np.ndarray:
     """Filtre passe-bas 1-pole simple. alpha ∈ [0,1] : 0 = pas de filtre, 1 = très filtré."""
-    a = max(0.01, min(0.99, alpha))
-    result = seg.copy()
-    if result.ndim == 1:
-        for i in range(1, len(result)):
-            result[i] = result[i - 1] * a + result[i] * (1 - a)
-    else:
-        for ch in range(result.shape[1]):
-            for i in range(1, len(result)):
-                result[i, ch] = result[i - 1, ch] * a + result[i, ch] * (1 - a)
-    return result
+    return one_pole_lowpass(seg, max(0.01, min(0.99, alpha)))
 
 
 # ── Rétrocompatibilité ──
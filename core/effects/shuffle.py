@@ -4,7 +4,7 @@ Style dariacore / mashcore : reorganisation rythmique chaotique.
 """
 
 import numpy as np
-from core.effects.utils import apply_micro_fade
+from core.effects.index_map import render, slice_map
 
 
 def shuffle(audio_data: np.ndarray, start: int, end: int,
@@ -13,50 +13,29 @@ def shuffle(audio_data: np.ndarray, start: int, end: int,
     Modes: random (ordre aleatoire), reverse (ordre inverse),
            interleave (1,3,5,7,2,4,6,8)."""
     result = audio_data.copy()
-    segment = result[start:end].copy()
-    if len(segment) == 0:
+    seg_len = end - start
+    if seg_len <= 0:
         return result
 
-    seg_len = len(segment)
     slice_len = max(64, seg_len // slices)
     rng = np.random.default_rng()
 
-    # Decouper en tranches
-    chunks = []
-    for i in range(slices):
-        s = i * slice_len
-        e = min(s + slice_len, seg_len)
-        if s >= seg_len:
-            break
-        chunk = segment[s:e].copy()
-        chunk = apply_micro_fade(chunk, fade_samples=min(16, len(chunk) // 4))
-        chunks.append(chunk)
-
-    if not chunks:
-        return result
+    # Decouper en tranches (debut relatif, longueur)
+    starts = np.arange(0, seg_len, slice_len)[:slices]
+    lengths = np.minimum(slice_len, seg_len - starts)
 
     # Reordonner
+    order = np.arange(len(starts))
     if mode == "random":
-        rng.shuffle(chunks)
+        order = rng.permutation(order)
     elif mode == "reverse":
-        chunks.reverse()
+        order = order[::-1]
     elif mode == "interleave":
-        odds = chunks[0::2]
-        evens = chunks[1::2]
-        chunks = odds + evens
-
-    # Recombiner
-    output = np.concatenate(chunks, axis=0)
-
-    # Ajuster a la taille originale
-    target_len = end - start
-    if len(output) > target_len:
-        output = output[:target_len]
-    elif len(output) < target_len:
-        pad_shape = (target_len - len(output),) + output.shape[1:]
-        output = np.concatenate(
-            [output, np.zeros(pad_shape, dtype=np.float32)], axis=0
-        )
+        order = np.concatenate([order[0::2], order[1::2]])
 
-    result[start:end] = output
+    # Recombiner en un seul gather, ajuste a la taille originale
+    index, gain = slice_map(starts[order] + start, lengths[order], fade=16)
+    index, gain = index[:seg_len], gain[:seg_len]
+    render(audio_data, index, gain, out=result[start:start + len(index)])
+    result[start + len(index):end] = 0.0
     return result
@@ -4,6 +4,7 @@ Le fameux "Bonjou-ou-ou-ou-r" du glitchcore.
 """
 
 import numpy as np
+from core.effects.index_map import render, slice_map
 from core.effects.utils import apply_micro_fade
 
 
@@ -27,46 +28,31 @@ def stutter(audio_data: np.ndarray, start: int, end: int,
     Returns:
         Audio avec l'effet stutter appliqué
     """
-    segment = audio_data[start:end].copy()
-    
-    if len(segment) == 0:
+    seg_len = end - start
+    if seg_len <= 0:
         return audio_data.copy()
-    
-    # Appliquer micro fade pour éviter les clics
-    segment = apply_micro_fade(segment, fade_samples=min(64, len(segment) // 4))
-    
-    parts = []
-    
-    for i in range(repeats):
-        if stutter_mode == "halving":
-            # Chaque répétition est 2x plus courte
-            length = max(64, len(segment) // (2 ** i))
-            part = segment[:length].copy()
-        elif stutter_mode == "reverse_alt":
-            # Alterne normal / inversé
-            if i % 2 == 0:
-                part = segment.copy()
-            else:
-                part = segment[::-1].copy()
-        else:
-            part = segment.copy()
-        
-        # Appliquer le decay
-        if decay > 0:
-            volume = (1.0 - decay) ** i
-            part = part * volume
-        
-        # Micro fade
-        part = apply_micro_fade(part, fade_samples=min(32, len(part) // 4))
-        parts.append(part)
-    
-    stuttered = np.concatenate(parts, axis=0)
-    
-    # Reconstruire l'audio : avant + stutter + après
-    before = audio_data[:start]
-    after = audio_data[end:]
-    
-    result = np.concatenate([before, stuttered, after], axis=0)
+
+    # Une tranche de la zone par repetition : (longueur, sens, volume)
+    i = np.arange(repeats)
+    if stutter_mode == "halving":
+        # Chaque répétition est 2x plus courte
+        lengths = np.minimum(seg_len, np.maximum(64, seg_len // (2 ** i)))
+    else:
+        lengths = np.full(repeats, seg_len)
+    # Alterne normal / inversé
+    reverse = (i % 2 == 1) if stutter_mode == "reverse_alt" else None
+    gains = (1.0 - decay) ** i if decay > 0 else None
+
+    # Micro fade de la zone elle-meme (anti-clic), une seule copie
+    segment = apply_micro_fade(audio_data[start:end], fade_samples=min(64, seg_len // 4))
+    index, gain = slice_map(np.zeros(repeats), lengths, reverse, gains, fade=32)
+
+    # Reconstruire l'audio : avant + stutter + après, dans un seul buffer
+    out_len = len(audio_data) - seg_len + len(index)
+    result = np.empty((out_len,) + audio_data.shape[1:], dtype=audio_data.dtype)
+    result[:start] = audio_data[:start]
+    render(segment, index, gain, out=result[start:start + len(index)])
+    result[start + len(index):] = audio_data[end:]
     return result
 
 
@@ -76,25 +62,19 @@ def quick_stutter(audio_data: np.ndarray, start: int, end: int,
     Stutter rapide : découpe la zone en N tranches et répète chacune 2x.
     Crée un effet de bégaiement rapide type glitchcore.
     """
-    segment = audio_data[start:end]
-    if len(segment) == 0:
+    seg_len = end - start
+    if seg_len <= 0:
         return audio_data.copy()
-    
-    slice_len = max(64, len(segment) // slice_count)
-    parts = []
-    
-    for i in range(slice_count):
-        s = i * slice_len
-        e = min(s + slice_len, len(segment))
-        if s >= len(segment):
-            break
-        sl = segment[s:e].copy()
-        sl = apply_micro_fade(sl, fade_samples=min(16, len(sl) // 4))
-        parts.append(sl)
-        parts.append(sl)  # Répète chaque tranche
-    
-    stuttered = np.concatenate(parts, axis=0)
-    
-    before = audio_data[:start]
-    after = audio_data[end:]
-    return np.concatenate([before, stuttered, after], axis=0)
+
+    slice_len = max(64, seg_len // slice_count)
+    starts = np.arange(0, seg_len, slice_len)[:slice_count]
+    lengths = np.minimum(slice_len, seg_len - starts)
+    # Répète chaque tranche
+    index, gain = slice_map(np.repeat(starts + start, 2), np.repeat(lengths, 2), fade=16)
+
+    out_len = len(audio_data) - seg_len + len(index)
+    result = np.empty((out_len,) + audio_data.shape[1:], dtype=audio_data.dtype)
+    result[:start] = audio_data[:start]
+    render(audio_data, index, gain, out=result[start:start + len(index)])
+    result[start + len(index):] = audio_data[end:]
+    return result
@@ -0,0 +1,77 @@
+"""
+Tables partagees — fenetres mises en cache et LFO.
+
+Les effets a modulation partagent un LFO a accumulateur de phase (phase
+repliee sur une periode, forme d'onde evaluee en float32) et reutilisent
+les fenetres d'un appel (ou d'un chunk d'automation) a l'autre.  Les
+tableaux en cache sont en lecture seule : copier avant de modifier.
+Seules les petites tables (fenetres de grain, fondus) sont mises en
+cache ; tout ce qui a la longueur de la selection est calcule a chaque
+appel.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def window(name: str, n: int) -> np.ndarray:
+    """Window function of length *n* ("hann", "hamming", "blackman"), float32."""
+    makers = {"hann": np.hanning, "hamming": np.hamming, "blackman": np.blackman}
+    win = makers[name](n).astype(np.float32)
+    win.flags.writeable = False
+    return win
+
+
+@lru_cache(maxsize=32)
+def fade_window(n: int, fade: int) -> np.ndarray:
+    """Flat window of length *n* with *fade*-sample linear fade in/out, float32."""
+    win = np.ones(n, dtype=np.float32)
+    if fade > 0:
+        win[:fade] = np.linspace(0, 1, fade, dtype=np.float32)
+        win[-fade:] = np.linspace(1, 0, fade, dtype=np.float32)
+    win.flags.writeable = False
+    return win
+
+
+def lfo(rate_hz, n: int, sr: int, phase: float = 0.0,
+        shape: str = "sine"):
+    """Bipolar (-1..1) LFO of *n* samples.
+
+    rate_hz: scalar or per-sample array (Hz).  phase: start phase in cycles.
+    The phase accumulator runs in float64 and is wrapped to one period
+    before the waveform is evaluated in float32, so precision does not
+    degrade over long selections.
+    shape: "sine", "square", "triangle" (-1 at phase 0, +1 at 0.5) or
+    "saw" (ramp from -1 to +1).
+    Returns (values float32, phase after the last sample) so the next
+    block continues seamlessly.
+    """
+    if np.ndim(rate_hz) == 0:
+        ph = np.arange(n, dtype=np.float64)
+        ph *= float(rate_hz) / sr
+        end_phase = phase + n * float(rate_hz) / sr
+    else:
+        inc = np.asarray(rate_hz, dtype=np.float64) / sr
+        ph = np.cumsum(inc)
+        end_phase = phase + (float(ph[-1]) if n else 0.0)
+        ph -= inc
+    ph += phase
+    np.remainder(ph, 1.0, out=ph)
+    ph = ph.astype(np.float32)
+    if shape == "square":
+        out = np.where(ph < 0.5, np.float32(1.0), np.float32(-1.0))
+    elif shape == "triangle":
+        ph -= 0.5
+        out = np.abs(ph, out=ph)
+        out *= -4.0
+        out += 1.0
+    elif shape == "saw":
+        out = ph
+        out *= 2.0
+        out -= 1.0
+    else:
+        ph *= np.float32(2.0 * np.pi)
+        out = np.sin(ph, out=ph)
+    return out, end_phase % 1.0
@@ -1,10 +1,20 @@
 """
 Tape Glitch — Random micro-glitches, wow/flutter, dropouts.
 Lo-fi tape degradation for emo/digicore aesthetic.
+
+Wow, flutter and micro-glitches are composed into a single read-position
+map, rendered with one interpolated gather over all channels.  Glitch and
+dropout events are drawn as NumPy event tables and applied without a
+per-event Python loop.
 """
 import numpy as np
+from core.effects.delay_line import fractional_read, warp_positions
+from core.effects.tables import lfo
 from core.effects.utils import apply_micro_fade
 
+# Micro-glitch kinds
+_REPEAT, _REVERSE, _FREEZE = 0, 1, 2
+
 
 def tape_glitch(audio_data, start, end, sr=44100,
                 glitch_rate=0.4, dropout_chance=0.15,
@@ -18,103 +28,102 @@ def tape_glitch(audio_data, start, end, sr=44100,
     noise: tape hiss amount
     """
     result = audio_data.copy()
-    seg = result[start:end].copy().astype(np.float64)
+    seg = result[start:end].astype(np.float32)
     n = len(seg)
     if n < 64:
         return result
-    is_stereo = seg.ndim == 2
-    rng = np.random.RandomState(hash(n) % (2**31))
+    rng = np.random.default_rng(n)
 
-    t = np.arange(n, dtype=np.float64) / sr
-
-    # ── 1. Wow (slow pitch wobble) ──
+    # ── 1. Wow + flutter → one tape speed curve ──
+    speed = np.ones(n, dtype=np.float32)
     if wow > 0.01:
         wow_freq = 0.5 + rng.random() * 1.5  # 0.5-2 Hz
-        wow_signal = wow * 0.008 * np.sin(2 * np.pi * wow_freq * t +
-                                           rng.random() * 2 * np.pi)
-        speed = 1.0 + wow_signal
-        read_idx = np.cumsum(speed)
-        read_idx = read_idx / read_idx[-1] * (n - 1)
-        i0 = np.clip(np.floor(read_idx).astype(int), 0, n - 1)
-        i1 = np.clip(i0 + 1, 0, n - 1)
-        frac = read_idx - i0
-        if is_stereo:
-            for ch in range(seg.shape[1]):
-                seg[:, ch] = seg[i0, ch] * (1.0 - frac) + seg[i1, ch] * frac
-        else:
-            seg = seg[i0] * (1.0 - frac) + seg[i1] * frac
-
-    # ── 2. Flutter (fast pitch variation) ──
+        speed += wow * 0.008 * lfo(wow_freq, n, sr, phase=rng.random())[0]
     if flutter > 0.01:
         flutter_freq = 6.0 + rng.random() * 10.0  # 6-16 Hz
-        flutter_sig = flutter * 0.004 * np.sin(2 * np.pi * flutter_freq * t)
-        flutter_sig += flutter * 0.002 * np.sin(2 * np.pi * flutter_freq * 2.7 * t)
-        speed = 1.0 + flutter_sig
-        read_idx = np.cumsum(speed)
-        read_idx = read_idx / read_idx[-1] * (n - 1)
-        i0 = np.clip(np.floor(read_idx).astype(int), 0, n - 1)
-        i1 = np.clip(i0 + 1, 0, n - 1)
-        frac = read_idx - i0
-        if is_stereo:
-            for ch in range(seg.shape[1]):
-                seg[:, ch] = seg[i0, ch] * (1.0 - frac) + seg[i1, ch] * frac
-        else:
-            seg = seg[i0] * (1.0 - frac) + seg[i1] * frac
-
-    # ── 3. Micro-glitches (tiny repeated/frozen sections) ──
+        speed += flutter * 0.004 * lfo(flutter_freq, n, sr)[0]
+        speed += flutter * 0.002 * lfo(flutter_freq * 2.7, n, sr)[0]
+    warped = wow > 0.01 or flutter > 0.01
+
+    # ── 2. Micro-glitches (tiny repeated/reversed/frozen sections) ──
+    src = None
     if glitch_rate > 0.01:
         num_glitches = int(glitch_rate * n / sr * 15)  # ~15 glitches/sec at rate=1
-        for _ in range(num_glitches):
-            pos = rng.randint(0, max(1, n - 2048))
-            glitch_len = rng.randint(64, min(2048, n - pos))
-            glitch_type = rng.randint(0, 3)
-            end_pos = min(pos + glitch_len, n)
-
-            if glitch_type == 0:
-                # Repeat a tiny slice
-                repeat_src = rng.randint(0, max(1, n - glitch_len))
-                src_end = min(repeat_src + glitch_len, n)
-                copy_len = min(end_pos - pos, src_end - repeat_src)
-                if copy_len > 0:
-                    if is_stereo:
-                        seg[pos:pos + copy_len] = seg[repeat_src:repeat_src + copy_len]
-                    else:
-                        seg[pos:pos + copy_len] = seg[repeat_src:repeat_src + copy_len]
-            elif glitch_type == 1:
-                # Reverse a tiny section
-                if is_stereo:
-                    seg[pos:end_pos] = seg[pos:end_pos][::-1]
-                else:
-                    seg[pos:end_pos] = seg[pos:end_pos][::-1]
-            else:
-                # Freeze (repeat first sample)
-                if is_stereo:
-                    seg[pos:end_pos] = seg[pos:pos + 1]
-                else:
-                    seg[pos:end_pos] = seg[pos]
-
-    # ── 4. Signal dropouts ──
+        if num_glitches > 0:
+            src = _glitch_map(n, _glitch_table(rng, n, num_glitches))
+
+    # One gather for the whole time-warp + glitch map
+    if warped:
+        pos = warp_positions(speed)
+        if src is not None:
+            pos = np.take(pos, src)
+        seg = fractional_read(seg, pos)
+    elif src is not None:
+        seg = np.take(seg, src, axis=0)
+
+    # ── 3. Signal dropouts ──
     if dropout_chance > 0.01:
         num_dropouts = max(1, int(dropout_chance * n / sr * 5))
-        for _ in range(num_dropouts):
-            if rng.random() < dropout_chance:
-                pos = rng.randint(0, max(1, n - 4096))
-                drop_len = rng.randint(128, min(4096, n - pos))
-                fade = min(64, drop_len // 4)
-                env = np.ones(drop_len)
-                env[fade:-fade] = 0.0
-                if fade > 0:
-                    env[:fade] = np.linspace(1, 0, fade)
-                    env[-fade:] = np.linspace(0, 1, fade)
-                if is_stereo:
-                    seg[pos:pos + drop_len] *= env[:, np.newaxis]
-                else:
-                    seg[pos:pos + drop_len] *= env
-
-    # ── 5. Tape hiss ──
+        gain = _dropout_gain(rng, n, num_dropouts, dropout_chance)
+        if gain is not None:
+            seg *= gain if seg.ndim == 1 else gain[:, np.newaxis]
+
+    # ── 4. Tape hiss ──
     if noise > 0.01:
-        hiss = rng.normal(0, noise * 0.03, seg.shape)
+        hiss = rng.standard_normal(seg.shape, dtype=np.float32)
+        hiss *= noise * 0.03
         seg += hiss
 
-    result[start:end] = apply_micro_fade(seg.astype(np.float32), 64)
+    result[start:end] = apply_micro_fade(seg, 64)
     return np.clip(result, -1.0, 1.0)
+
+
+def _expand(starts, lengths):
+    """Flatten events into (event index, offset inside event) per sample."""
+    event = np.repeat(np.arange(len(lengths)), lengths)
+    first = np.cumsum(lengths) - lengths
+    offset = np.arange(int(lengths.sum())) - np.repeat(first, lengths)
+    return event, offset
+
+
+def _glitch_table(rng, n, count):
+    """Event table: (pos, length, kind, source) arrays, one row per glitch."""
+    pos = rng.integers(0, max(1, n - 2048), size=count)
+    length = rng.integers(64, np.maximum(65, np.minimum(2048, n - pos)))
+    length = np.minimum(length, n - pos)
+    kind = rng.integers(0, 3, size=count)
+    source = rng.integers(0, np.maximum(1, n - length))
+    return pos, length, kind, source
+
+
+def _glitch_map(n, table):
+    """Source index for every output sample; later events win on overlap."""
+    pos, length, kind, source = table
+    event, offset = _expand(pos, length)
+    dest = pos[event] + offset
+    k = kind[event]
+    src = np.where(k == _REPEAT, source[event] + offset,
+                   np.where(k == _REVERSE, pos[event] + length[event] - 1 - offset,
+                            pos[event]))
+    index = np.arange(n)
+    index[dest] = np.minimum(src, n - 1)
+    return index
+
+
+def _dropout_gain(rng, n, count, chance):
+    """Gain curve with faded dips to silence, or None when nothing drops."""
+    hit = rng.random(count) < chance
+    pos = rng.integers(0, max(1, n - 4096), size=count)
+    length = rng.integers(128, np.maximum(129, np.minimum(4096, n - pos)))
+    pos, length = pos[hit], np.minimum(length, n - pos)[hit]
+    if len(pos) == 0:
+        return None
+    # Per event: fade 1 → 0 over *fade* samples, silence, fade 0 → 1
+    fade = np.maximum(2, np.minimum(64, length // 4))
+    event, offset = _expand(pos, length)
+    f = (fade[event] - 1).astype(np.float32)
+    env = np.maximum(1.0 - offset / f, (offset - (length[event] - fade[event])) / f)
+    np.clip(env, 0.0, 1.0, out=env)
+    gain = np.ones(n, dtype=np.float32)
+    np.minimum.at(gain, pos[event] + offset, env.astype(np.float32))
+    return gain
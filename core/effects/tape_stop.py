@@ -1,76 +1,74 @@
 """
 Tape Stop — Ralentissement progressif style arret de cassette.
 Le son descend en pitch et ralentit jusqu'a l'arret complet.
+
+La vitesse de bande suit une courbe continue (lineaire, exponentielle ou
+Bezier) ; son integrale donne la position de lecture, rendue en un seul
+gather interpole (cout lineaire en longueur). Le mode "start" fait
+l'inverse : la bande demarre a l'arret et rejoint la vitesse normale.
 """
 
 import numpy as np
-from scipy.signal import resample
 
+from core.effects.delay_line import fractional_read
+from core.effects.utils import eval_curve
 
-def tape_stop(audio_data: np.ndarray, start: int, end: int,
-              duration_pct: float = 0.5, sr: int = 44100) -> np.ndarray:
-    """Simule l'arret d'un lecteur cassette sur la zone."""
-    result = audio_data.copy()
-    segment = result[start:end].copy()
-    if len(segment) == 0:
-        return result
-
-    seg_len = len(segment)
-    # Duree de l'effet (portion du segment affecte)
-    effect_len = max(256, int(seg_len * duration_pct))
+_EXP_K = 5.0          # steepness of the "exponential" speed curve
+_END_VOLUME = 0.2     # gain when the tape has (almost) stopped
 
-    # Partie non affectee au debut
-    clean_len = seg_len - effect_len
-    if clean_len < 0:
-        clean_len = 0
-        effect_len = seg_len
 
-    clean_part = segment[:clean_len].copy()
-    effect_part = segment[clean_len:].copy()
+def speed_curve(t: np.ndarray, curve: str = "linear",
+                points=None, bends=None) -> np.ndarray:
+    """Tape speed (1.0 = normal, 0.0 = stopped) over stop progress *t* in [0, 1].
 
-    # Construire le ralentissement : vitesse 1.0 -> 0.0
-    n_chunks = 64
-    chunk_size = max(1, len(effect_part) // n_chunks)
-    output_chunks = []
+    curve: "linear", "exponential" (fast drop, long tail) or "custom", in
+    which case *points* [(x, y), ...] and *bends* describe a Bezier curve
+    as in the automation editor (x = progress, y = speed).
+    """
+    if curve == "custom" and points:
+        return np.clip(eval_curve(points, bends, t), 0.0, 1.0)
+    if curve == "exponential":
+        floor = np.exp(-_EXP_K)
+        return (np.exp(-_EXP_K * t) - floor) / (1.0 - floor)
+    return 1.0 - t
 
-    for i in range(n_chunks):
-        s = i * chunk_size
-        e = min(s + chunk_size, len(effect_part))
-        if s >= len(effect_part):
-            break
 
-        chunk = effect_part[s:e].copy()
-        # Vitesse decroissante (1.0 -> 0.05)
-        speed = max(0.05, 1.0 - (i / n_chunks) * 0.95)
-        new_len = max(4, int(len(chunk) / speed))
+def tape_stop(audio_data: np.ndarray, start: int, end: int,
+              duration_pct: float = 0.5, sr: int = 44100,
+              curve: str = "linear", mode: str = "stop",
+              points=None, bends=None) -> np.ndarray:
+    """Simule l'arret (ou le demarrage, mode="start") d'un lecteur cassette."""
+    result = audio_data.copy()
+    segment = result[start:end]
+    seg_len = len(segment)
+    if seg_len == 0:
+        return result
 
-        if chunk.ndim == 1:
-            stretched = resample(chunk, new_len).astype(np.float32)
-        else:
-            cols = []
-            for ch in range(chunk.shape[1]):
-                cols.append(resample(chunk[:, ch], new_len))
-            stretched = np.column_stack(cols).astype(np.float32)
+    # Duree de l'effet (portion du segment affecte)
+    effect_len = min(seg_len, max(256, int(seg_len * duration_pct)))
+    spin_up = mode == "start"
 
-        # Volume decroissant aussi
-        volume = max(0.0, 1.0 - (i / n_chunks) * 0.8)
-        stretched *= volume
-        output_chunks.append(stretched)
+    # Progression de l'arret 0 → 1 sur la zone d'effet
+    t = np.arange(effect_len, dtype=np.float64) / effect_len
+    if spin_up:
+        t = t[::-1]
+    speed = speed_curve(t, curve, points, bends)
 
-    if output_chunks:
-        effect_out = np.concatenate(output_chunks, axis=0)
+    # Integrale de la vitesse → trajectoire de lecture (en samples)
+    travel = np.cumsum(speed)
+    if spin_up:
+        # La bande rejoint la lecture normale a la fin de la zone
+        pos = (effect_len - travel[-1]) + travel - speed
     else:
-        effect_out = effect_part
+        pos = (seg_len - effect_len) + travel - speed
 
-    # Ajuster a la taille du segment original
-    combined = np.concatenate([clean_part, effect_out], axis=0)
-    if len(combined) > seg_len:
-        combined = combined[:seg_len]
-    elif len(combined) < seg_len:
-        pad_shape = (seg_len - len(combined),) + combined.shape[1:]
-        combined = np.concatenate(
-            [combined, np.zeros(pad_shape, dtype=np.float32)], axis=0
-        )
+    effect = fractional_read(segment, pos)
+    # Volume decroissant avec l'arret
+    volume = (1.0 - (1.0 - _END_VOLUME) * t).astype(np.float32)
+    effect *= volume if effect.ndim == 1 else volume[:, np.newaxis]
 
-    result[start:end] = combined
+    if spin_up:
+        result[start:start + effect_len] = effect
+    else:
+        result[end - effect_len:end] = effect
     return result
@@ -1,24 +1,35 @@
 """Tremolo — rhythmic volume wobble."""
 import numpy as np
 
+from core.effects.tables import lfo
+
+
 def tremolo(audio_data: np.ndarray, start: int, end: int,
-            rate_hz: float = 5.0, depth: float = 0.7,
-            shape: str = "sine", sr: int = 44100) -> np.ndarray:
-    """Modulation d amplitude periodique."""
+            rate_hz=5.0, depth=0.7,
+            shape: str = "sine", sr: int = 44100,
+            state: dict | None = None) -> np.ndarray:
+    """Modulation d amplitude periodique.
+
+    rate_hz / depth: scalars or per-sample arrays.  With *state* (dict,
+    updated in place) the LFO phase continues across blocks.
+    """
     out = audio_data.copy()
-    seg = out[start:end].astype(np.float64)
+    seg = out[start:end]
     n = len(seg)
-    t_arr = np.arange(n, dtype=np.float64) / sr
-    if shape == "sine":
-        lfo = 0.5 * (1.0 + np.sin(2.0 * np.pi * rate_hz * t_arr))
-    elif shape == "square":
-        lfo = (np.sin(2.0 * np.pi * rate_hz * t_arr) >= 0).astype(np.float64)
-    elif shape == "triangle":
-        lfo = 2.0 * np.abs(2.0 * (rate_hz * t_arr - np.floor(rate_hz * t_arr + 0.5)))
+    if n == 0:
+        return out
+    phase = 0.0 if state is None else state.get("phase", 0.0)
+    if shape in ("sine", "square", "triangle"):
+        wave, phase = lfo(rate_hz, n, sr, phase, shape)
     else:
-        lfo = np.mod(rate_hz * t_arr, 1.0)
-    envelope = 1.0 - depth * (1.0 - lfo)
+        wave, phase = lfo(rate_hz, n, sr, phase, "saw")
+    if state is not None:
+        state["phase"] = phase
+    # Unipolar 0..1 LFO → envelope 1 - depth * (1 - lfo)
+    wave += 1.0
+    wave *= 0.5
+    envelope = 1.0 - np.asarray(depth, dtype=np.float32) * (1.0 - wave)
     if seg.ndim == 2:
         envelope = envelope.reshape(-1, 1)
-    out[start:end] = (seg * envelope).astype(np.float32)
+    out[start:end] = seg * envelope
     return out
@@ -5,6 +5,9 @@ Micro-fades, normalisation, fade in/out, crossfade.
 
 import numpy as np
 
+# Samples per lfilter call in one_pole_lowpass (bounds the float64 temporaries)
+_FILTER_CHUNK = 1 << 14
+
 
 def apply_micro_fade(audio: np.ndarray, fade_samples: int = 64) -> np.ndarray:
     """Micro fade-in/out anti-clic aux jointures."""
@@ -24,6 +27,25 @@ def apply_micro_fade(audio: np.ndarray, fade_samples: int = 64) -> np.ndarray:
     return result
 
 
+def one_pole_lowpass(audio: np.ndarray, alpha: float) -> np.ndarray:
+    """Filtre passe-bas 1-pole le long de l'axe 0 (tous les canaux).
+
+    y[i] = alpha * y[i-1] + (1 - alpha) * x[i], avec y[0] = x[0].
+    Recursion en float64 (lfilter) par blocs, l'etat passe d'un bloc a
+    l'autre ; resultat dans le dtype de *audio*.
+    """
+    if len(audio) == 0:
+        return audio.copy()
+    from scipy.signal import lfilter
+    out = np.empty_like(audio)
+    zi = alpha * np.asarray(audio[:1], dtype=np.float64)
+    for i in range(0, len(audio), _FILTER_CHUNK):
+        y, zi = lfilter([1.0 - alpha], [1.0, -alpha], audio[i:i + _FILTER_CHUNK],
+                        axis=0, zi=zi)
+        out[i:i + len(y)] = y
+    return out
+
+
 def normalize(audio: np.ndarray, target_peak: float = 0.95) -> np.ndarray:
     """Normalise au pic donne."""
     peak = np.max(np.abs(audio))
@@ -127,39 +149,51 @@ def _bezier_y(y0: float, y1: float, bend: float, t: float) -> float:
     return u * u * y0 + 2.0 * u * t * cy + t * t * y1
 
 
+def eval_curve(points: list, bends: list | None, x) -> np.ndarray:
+    """Evaluate a point + bend curve at every normalised position of *x*.
+
+    *points* must be sorted by x.  Segments are located with one
+    ``searchsorted`` and the quadratic Bezier (control point shifted by the
+    segment bend) is evaluated for the whole array at once:
+    y = y0 + t (y1 - y0) + 2 u t bend.  Bends below 0.005 are linear.
+    Returns a float64 array shaped like *x*.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if not points:
+        return np.zeros_like(x)
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    xs, ys = pts[:, 0], pts[:, 1]
+    if len(pts) == 1:
+        return np.full_like(x, ys[0])
+
+    n_seg = len(pts) - 1
+    b = np.zeros(n_seg)
+    if bends:
+        k = min(n_seg, len(bends))
+        b[:k] = bends[:k]
+    b[np.abs(b) < 0.005] = 0.0
+
+    seg = np.clip(np.searchsorted(xs, x, side="left") - 1, 0, n_seg - 1)
+    x0, y0 = xs[seg], ys[seg]
+    dx = xs[seg + 1] - x0
+    flat = dx < 1e-9
+    t = np.where(flat, 0.0, (x - x0) / np.where(flat, 1.0, dx))
+    y = y0 + t * (ys[seg + 1] - y0) + 2.0 * (1.0 - t) * t * b[seg]
+    y = np.where(x <= xs[0], ys[0], y)
+    return np.where(x >= xs[-1], ys[-1], y)
+
+
 def eval_envelope(pts: list, bends: list, x: float) -> float:
     """Evaluate envelope value at normalised *x* in [0, 1]."""
-    if not pts:
-        return 0.0
-    if len(pts) == 1:
-        return pts[0][1]
-    if x <= pts[0][0]:
-        return pts[0][1]
-    if x >= pts[-1][0]:
-        return pts[-1][1]
-    for i in range(len(pts) - 1):
-        x0, y0 = pts[i]
-        x1, y1 = pts[i + 1]
-        if x0 <= x <= x1:
-            dx = x1 - x0
-            if dx < 1e-9:
-                return y0
-            t = (x - x0) / dx
-            b = bends[i] if i < len(bends) else 0.0
-            return _bezier_y(y0, y1, b, t)
-    return pts[-1][1]
+    return float(eval_curve(pts, bends, x))
 
 
 def make_envelope_curve(n: int, points: list, bends: list) -> np.ndarray:
     """Build an *n*-sample volume envelope from control points + bends."""
     pts = sorted(points, key=lambda p: p[0])
-    if not bends:
-        bends = [0.0] * max(0, len(pts) - 1)
-    curve = np.empty(n, dtype=np.float32)
-    for i in range(n):
-        x = i / max(1, n - 1)
-        curve[i] = eval_envelope(pts, bends, x)
-    return np.clip(curve, 0.0, 1.0)
+    x = np.arange(n, dtype=np.float64) / max(1, n - 1)
+    curve = eval_curve(pts, bends, x).astype(np.float32)
+    return np.clip(curve, 0.0, 1.0, out=curve)
 
 
 def apply_envelope_fade(audio: np.ndarray, duration_samples: int,
@@ -6,6 +6,9 @@ Patine lo-fi nostalgique.
 import numpy as np
 from scipy.signal import butter, sosfilt
 
+from core.effects.delay_line import fractional_read, warp_positions
+from core.effects.tables import lfo
+
 
 def vinyl(audio_data: np.ndarray, start: int, end: int,
           crackle: float = 0.5, noise: float = 0.3,
@@ -33,11 +36,7 @@ def vinyl(audio_data: np.ndarray, start: int, end: int,
         sos = butter(2, min(1000.0 / nyq, 0.99), btype="high", output="sos")
         crackle_signal = sosfilt(sos, crackle_signal).astype(np.float32)
 
-        if segment.ndim == 1:
-            segment += crackle_signal
-        else:
-            for ch in range(segment.shape[1]):
-                segment[:, ch] += crackle_signal
+        segment += crackle_signal if segment.ndim == 1 else crackle_signal[:, np.newaxis]
 
     # 2) Bruit de fond (hiss)
     if noise > 0:
@@ -47,26 +46,14 @@ def vinyl(audio_data: np.ndarray, start: int, end: int,
         sos = butter(2, min(3000.0 / nyq, 0.99), btype="high", output="sos")
         hiss = sosfilt(sos, hiss).astype(np.float32)
 
-        if segment.ndim == 1:
-            segment += hiss
-        else:
-            for ch in range(segment.shape[1]):
-                segment[:, ch] += hiss
+        segment += hiss if segment.ndim == 1 else hiss[:, np.newaxis]
 
     # 3) Wow/Flutter : variation lente de vitesse
     if wow > 0:
-        t = np.arange(seg_len, dtype=np.float32) / sr
         # Variation sinusoidale lente (0.5-2 Hz)
-        wow_signal = 1.0 + wow * 0.005 * np.sin(2 * np.pi * 1.5 * t)
-        # Appliquer comme variation de phase (simplifiee)
-        indices = np.cumsum(wow_signal).astype(np.float32)
-        indices = indices / indices[-1] * (seg_len - 1)
-        indices = np.clip(indices, 0, seg_len - 1).astype(int)
-
-        if segment.ndim == 1:
-            segment = segment[indices]
-        else:
-            segment = segment[indices]
+        wow_signal = 1.0 + wow * 0.005 * lfo(1.5, seg_len, sr)[0]
+        # Vitesse integree → positions de lecture, un seul gather interpole
+        segment = fractional_read(segment, warp_positions(wow_signal))
 
     result[start:end] = np.clip(segment, -1.0, 1.0)
     return result
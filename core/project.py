@@ -4,7 +4,6 @@ v4.4 — Stores base_audio, effect_ops, undo/redo stacks.
 """
 import os, json, tempfile, zipfile, copy
 import numpy as np
-import soundfile as sf
 from core.timeline import Timeline, AudioClip
 from utils.logger import get_logger
 
@@ -15,6 +14,7 @@ def save_project(filepath, timeline, sr, source_path="",
                  base_audio=None, effect_ops=None,
                  undo_stack=None, redo_stack=None):
     _log.info("Saving project: %s", filepath)
+    import soundfile as sf
     with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as zf:
         meta = {
             "version": "8.1",
@@ -66,6 +66,7 @@ def save_project(filepath, timeline, sr, source_path="",
 
 def load_project(filepath):
     _log.info("Loading project: %s", filepath)
+    import soundfile as sf
     result = {"timeline": Timeline(), "sr": 44100, "source": "",
               "base_audio": None, "effect_ops": [], "undo_stack": [], "redo_stack": []}
 
@@ -124,7 +125,7 @@ def load_project(filepath):
 def _ser_ops(ops):
     out = []
     for op in ops:
-        d = {k: v for k, v in op.items() if k not in ("_process_fn", "_state_after")}
+        d = {k: v for k, v in op.items() if k not in ("_process_fn", "_state_after", "_perf")}
         # Convert numpy types
         for key in ["start", "end", "init_start", "init_end"]:
             if key in d and hasattr(d[key], 'item'):
@@ -0,0 +1,184 @@
+"""
+Recording pipeline — audio callback → ring buffer → writer thread → disk.
+
+The callback only copies its block into a preallocated ring (no lock, no
+allocation).  A writer thread drains the ring every few milliseconds into a
+float32 take file in the data dir and, when the project runs at another
+rate, through a StreamingResampler at the same time.  Memory stays flat for
+any take length and the converted take is complete when the stream stops.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from utils.config import get_data_dir
+from utils.logger import get_logger
+
+_log = get_logger("recorder")
+
+# Take file formats: libsndfile format -> subtype
+_TAKE_SUBTYPES = {"WAV": "FLOAT", "FLAC": "PCM_24"}
+
+
+class RingBuffer:
+    """Single-producer / single-consumer float32 ring of (frames, channels).
+
+    The producer (audio callback) only moves the write index and the
+    consumer (writer thread) only the read index, so no lock is needed.
+    Frames that do not fit are dropped and counted in ``overruns``.
+    """
+
+    def __init__(self, capacity: int, channels: int = 2):
+        self._buf = np.zeros((capacity, channels), dtype=np.float32)
+        self.capacity = capacity
+        self._w = 0             # total frames written
+        self._r = 0             # total frames read
+        self.overruns = 0
+
+    def available(self) -> int:
+        """Frames waiting to be read."""
+        return self._w - self._r
+
+    def write(self, block: np.ndarray) -> int:
+        """Copy *block* in (producer side); returns the frames stored."""
+        n = min(len(block), self.capacity - (self._w - self._r))
+        if n < len(block):
+            self.overruns += len(block) - n
+        i = self._w % self.capacity
+        k = min(n, self.capacity - i)
+        self._buf[i:i + k] = block[:k]
+        self._buf[:n - k] = block[k:n]
+        self._w += n            # publish after the copy
+        return n
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Move up to len(out) frames into *out* (consumer side)."""
+        n = min(len(out), self._w - self._r)
+        i = self._r % self.capacity
+        k = min(n, self.capacity - i)
+        out[:k] = self._buf[i:i + k]
+        out[k:n] = self._buf[:n - k]
+        self._r += n
+        return n
+
+    def peak(self, frames: int) -> float:
+        """Peak level of the last *frames* written (level meter)."""
+        w = self._w
+        n = min(frames, w, self.capacity)
+        if n <= 0:
+            return 0.0
+        i = (w - n) % self.capacity
+        k = min(n, self.capacity - i)
+        p = float(np.abs(self._buf[i:i + k]).max())
+        if n > k:
+            p = max(p, float(np.abs(self._buf[:n - k]).max()))
+        return p
+
+
+class TakeRecorder:
+    """Streams one take to disk, resampled on the fly to *target_sr*.
+
+    write() is meant for the audio callback, peak() / frames for the GUI,
+    stop() returns (data, sr, original, original_sr) like the resample
+    step of the import path: original is None when no conversion was
+    needed.
+    """
+
+    def __init__(self, sr: int, channels: int = 2, target_sr: int | None = None,
+                 folder: str | None = None, fmt: str = "WAV",
+                 ring_seconds: float = 2.0, poll: float = 0.02):
+        self.sr = int(sr)
+        self.channels = channels
+        self.target_sr = int(target_sr) if target_sr and target_sr != sr else None
+        self.folder = folder or os.path.join(get_data_dir(), "recordings")
+        self.fmt = fmt
+        self.ring = RingBuffer(max(1, int(ring_seconds * sr)), channels)
+        self._poll = poll
+        self._scratch = np.zeros((self.ring.capacity, channels), dtype=np.float32)
+        self._stop = threading.Event()
+        self._thread = None
+        self._files = []
+        self._resampler = None
+        self.paths = []
+        self.error = None
+
+    @property
+    def frames(self) -> int:
+        """Frames received so far."""
+        return self.ring._w
+
+    def start(self):
+        """Open the take file(s) and start the writer thread."""
+        import soundfile as sf
+        os.makedirs(self.folder, exist_ok=True)
+        stem = os.path.join(self.folder, datetime.now().strftime("take_%Y%m%d_%H%M%S_%f"))
+        ext = "." + self.fmt.lower()
+        targets = [(stem + ext, self.sr)]
+        if self.target_sr:
+            from core.resample import StreamingResampler
+            self._resampler = StreamingResampler(self.sr, self.target_sr, self.channels)
+            targets.append((f"{stem}_{self.target_sr}{ext}", self.target_sr))
+        for path, sr in targets:
+            self._files.append(sf.SoundFile(path, "w", samplerate=sr, channels=self.channels,
+                                            format=self.fmt, subtype=_TAKE_SUBTYPES[self.fmt]))
+            self.paths.append(path)
+        self._thread = threading.Thread(target=self._run, name="take-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, block: np.ndarray):
+        """Audio callback side: never blocks, never allocates."""
+        self.ring.write(block)
+
+    def peak(self, frames: int = 2048) -> float:
+        return self.ring.peak(frames)
+
+    def _drain(self):
+        n = self.ring.read_into(self._scratch)
+        if n:
+            block = self._scratch[:n]
+            self._files[0].write(block)
+            if self._resampler is not None:
+                self._files[1].write(self._resampler.process(block))
+        return n
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self._poll):
+                self._drain()
+            while self._drain():
+                pass
+            if self._resampler is not None:
+                self._files[1].write(self._resampler.flush())
+        except Exception as ex:
+            self.error = ex
+            _log.error("Take writer failed: %s", ex)
+        finally:
+            for f in self._files:
+                f.close()
+
+    def stop(self):
+        """Flush and close the take; returns (data, sr, original, original_sr)."""
+        import soundfile as sf
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.error is not None:
+            raise self.error
+        if self.ring.overruns:
+            _log.warning("Recording dropped %d frames (writer too slow)", self.ring.overruns)
+        takes = [sf.read(p, dtype="float32", always_2d=True)[0] for p in self.paths]
+        if self.target_sr:
+            return takes[1], self.target_sr, takes[0], self.sr
+        return takes[0], self.sr, None, 0
+
+    def discard(self):
+        """Delete the take files."""
+        for p in self.paths:
+            try:
+                os.remove(p)
+            except OSError as ex:
+                _log.debug("Non-critical: %s", ex)
+        self.paths = []
@@ -0,0 +1,101 @@
+"""
+Resampling — conversion de sample rate par filtres polyphases rationnels.
+
+resample_poly (up/down reduits par le PGCD) remplace le resample FFT :
+cout lineaire, pas de ringing aux bords, tous les canaux en un appel.
+Le filtre anti-repliement (Kaiser, comme le defaut de scipy) est mis en
+cache par couple de rates.
+
+StreamingResampler applique le meme filtre bloc par bloc (enregistrement) :
+la concatenation de ses sorties egale resample_audio sur le signal entier.
+"""
+
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+from scipy.signal import firwin, resample_poly
+
+
+def rate_ratio(src_sr: int, dst_sr: int) -> tuple[int, int]:
+    """(up, down) factors taking *src_sr* to *dst_sr*, reduced."""
+    g = gcd(int(src_sr), int(dst_sr))
+    return int(dst_sr) // g, int(src_sr) // g
+
+
+@lru_cache(maxsize=16)
+def _filter_bank(up: int, down: int) -> np.ndarray:
+    """Low-pass prototype for an up/down pair (read-only, float64)."""
+    max_rate = max(up, down)
+    h = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    h.flags.writeable = False
+    return h
+
+
+def resample_audio(data: np.ndarray, src_sr: int, dst_sr: int) -> np.ndarray:
+    """Resample *data* (n,) or (n, channels) from *src_sr* to *dst_sr*.
+
+    Returns float32 with ceil(n * dst_sr / src_sr) samples; a copy when
+    the rates already match.
+    """
+    if src_sr == dst_sr or src_sr <= 0 or dst_sr <= 0 or len(data) == 0:
+        return np.array(data, dtype=np.float32)
+    up, down = rate_ratio(src_sr, dst_sr)
+    out = resample_poly(data, up, down, axis=0, window=_filter_bank(up, down))
+    return out.astype(np.float32, copy=False)
+
+
+class StreamingResampler:
+    """Incremental resample_audio for a signal arriving in blocks.
+
+    process() returns every output sample whose input window is complete;
+    flush() returns the tail.  Together they give the same samples as one
+    resample_audio() call on the whole signal, whatever the block sizes.
+    """
+
+    def __init__(self, src_sr: int, dst_sr: int, channels: int = 2):
+        self.up, self.down = rate_ratio(src_sr, dst_sr)
+        h = _filter_bank(self.up, self.down) * self.up
+        self._half = (len(h) - 1) // 2
+        self._taps = -(-len(h) // self.up)               # taps per phase
+        padded = np.zeros(self._taps * self.up)
+        padded[:len(h)] = h
+        # bank[p, k] weights x[n_max - taps + 1 + k] for output phase p
+        self._bank = padded.reshape(self._taps, self.up).T[:, ::-1].copy()
+        # Last taps-1 input frames (zeros before the start)
+        self._hist = np.zeros((self._taps - 1, channels), dtype=np.float32)
+        self._n_in = 0      # input frames received
+        self._fed = 0       # frames buffered so far, flush padding included
+        self._n_out = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feed (n, channels) float32 frames; returns the outputs now complete."""
+        self._n_in += len(block)
+        # Output m needs inputs up to (m*down + half) // up
+        ready = (self._n_in * self.up - 1 - self._half) // self.down + 1
+        return self._run(block, ready)
+
+    def flush(self) -> np.ndarray:
+        """Outputs left once the input has ended (zero padded)."""
+        total = -(-self._n_in * self.up // self.down)
+        if total <= self._n_out:
+            return np.zeros((0, self._hist.shape[1]), dtype=np.float32)
+        last = ((total - 1) * self.down + self._half) // self.up
+        pad = np.zeros((max(0, last - self._n_in + 1), self._hist.shape[1]),
+                       dtype=np.float32)
+        return self._run(pad, total)
+
+    def _run(self, block, ready):
+        buf = np.concatenate([self._hist, block.astype(np.float32, copy=False)])
+        base = self._fed - len(self._hist)      # input index of buf[0]
+        self._fed += len(block)
+        self._hist = buf[len(buf) - len(self._hist):].copy()
+        m = np.arange(self._n_out, max(ready, self._n_out))
+        if len(m) == 0:
+            return np.zeros((0, buf.shape[1]), dtype=np.float32)
+        self._n_out = ready
+        j = m * self.down + self._half
+        start = j // self.up - self._taps + 1 - base
+        windows = np.lib.stride_tricks.sliding_window_view(buf, self._taps, axis=0)
+        out = np.einsum("mct,mt->mc", windows[start], self._bank[j % self.up])
+        return out.astype(np.float32)
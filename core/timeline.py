@@ -5,9 +5,12 @@ Auto-assigns visually distinct colors to new clips.
 
 import uuid
 import colorsys
+import itertools
 import numpy as np
 from dataclasses import dataclass, field
 
+from utils import profiler
+
 
 # ── Distinct color generator ──
 # Uses golden-angle hue rotation for maximum visual separation
@@ -24,11 +27,27 @@ def _generate_distinct_color(index: int) -> str:
     return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
 
 
-@dataclass
+# ── Clip versions ──
+# Any assignment to one of these fields changes what the clip plays.
+# Versions are unique across clips, so a restored clip never matches a
+# stale render.
+
+_SAMPLE_FIELDS = frozenset(("source", "offset", "length", "gain"))
+_versions = itertools.count(1)
+
+
+@dataclass(init=False, eq=False)
 class AudioClip:
-    """A single audio clip in the timeline."""
+    """A single audio clip in the timeline.
+
+    Non-destructive view: the clip plays ``source[offset:offset + length]``
+    scaled by an optional per-sample ``gain`` envelope (fades).  Clips made
+    by split / duplicate share the same source buffer, so both are O(1);
+    ``audio_data`` materialises the clip on demand.  Sources are never
+    modified in place: assigning ``audio_data`` swaps in a new buffer.
+    """
     name: str
-    audio_data: np.ndarray
+    source: np.ndarray | None = field(default=None, repr=False)
     sample_rate: int = 44100
     position: int = 0       # sample offset in timeline
     color: str = ""
@@ -39,11 +58,109 @@ class AudioClip:
     # Original audio before fade was applied (for undo/redo of fade)
     _audio_before_fade_in: np.ndarray | None = field(default=None, repr=False)
     _audio_before_fade_out: np.ndarray | None = field(default=None, repr=False)
+    # View on the source + gain envelope (float32, one value per sample)
+    offset: int = 0
+    length: int = 0
+    gain: np.ndarray | None = field(default=None, repr=False)
+    # Audio as loaded, before any sample-rate conversion (kept so that a
+    # later conversion starts from it instead of compounding losses)
+    original: np.ndarray | None = field(default=None, repr=False)
+    original_sr: int = 0
+    # Bumped on every change of source / offset / length / gain
+    version: int = 0
+
+    def __init__(self, name: str, audio_data: np.ndarray | None = None,
+                 sample_rate: int = 44100, position: int = 0, color: str = "",
+                 id: str | None = None, fade_in_params: dict | None = None,
+                 fade_out_params: dict | None = None, *,
+                 source: np.ndarray | None = None, offset: int = 0,
+                 length: int | None = None, gain: np.ndarray | None = None):
+        """Clip over *audio_data*, or over source[offset:offset + length]."""
+        self.name = name
+        self.sample_rate = sample_rate
+        self.position = position
+        self.color = color
+        self.id = id or uuid.uuid4().hex[:8]
+        self.fade_in_params = fade_in_params if fade_in_params is not None else {}
+        self.fade_out_params = fade_out_params if fade_out_params is not None else {}
+        self._audio_before_fade_in = None
+        self._audio_before_fade_out = None
+        self.original = None
+        self.original_sr = 0
+        if source is None:
+            self.audio_data = audio_data
+        else:
+            self.source = source
+            self.offset = offset
+            self.length = len(source) - offset if length is None else length
+            self.gain = gain
+
+    def __setattr__(self, name, value):
+        """Assign, bumping ``version`` when the clip's samples change.
+
+        Buffers are swapped, never edited in place, so this sees every
+        change a render needs to know about.
+        """
+        if name in _SAMPLE_FIELDS:
+            object.__setattr__(self, "version", next(_versions))
+        object.__setattr__(self, name, value)
+
+    @property
+    def audio_data(self) -> np.ndarray | None:
+        """Clip samples: a view on the source, a gained copy when faded."""
+        return self.read() if self.source is not None else None
+
+    @audio_data.setter
+    def audio_data(self, data: np.ndarray | None):
+        """Replace the clip content with a new buffer (drops the gain and
+        the pre-conversion original)."""
+        self.source = data
+        self.offset = 0
+        self.length = len(data) if data is not None else 0
+        self.gain = None
+        self.original = None
+        self.original_sr = 0
+
+    def read(self, start: int = 0, end: int | None = None) -> np.ndarray:
+        """Samples [start, end) of the clip with the gain applied.
+
+        Only that range is materialised; without a gain envelope the
+        result is a view on the source.
+        """
+        end = self.length if end is None else min(end, self.length)
+        start = max(0, min(start, end))
+        view = self.source[self.offset + start:self.offset + end]
+        if self.gain is None:
+            return view
+        g = self.gain[start:end]
+        return view * (g if view.ndim == 1 else g[:, np.newaxis])
+
+    def view(self, start: int = 0, end: int | None = None, **kw) -> "AudioClip":
+        """New clip sharing this clip's source over [start, end) — O(1).
+
+        Keyword arguments (name, position, color, ...) set the new clip's
+        metadata; the sample rate is inherited unless given.
+        """
+        end = self.length if end is None else min(end, self.length)
+        gain = self.gain[start:end] if self.gain is not None else None
+        kw.setdefault("sample_rate", self.sample_rate)
+        clip = AudioClip(kw.pop("name", self.name), source=self.source,
+                         offset=self.offset + start, length=end - start,
+                         gain=gain, **kw)
+        if start == 0 and end == self.length:
+            clip.original, clip.original_sr = self.original, self.original_sr
+        return clip
+
+    def gain_envelope(self) -> np.ndarray:
+        """Current gain envelope as a new float32 array (ones when unset)."""
+        if self.gain is None:
+            return np.ones(self.length, dtype=np.float32)
+        return self.gain.copy()
 
     @property
     def duration_samples(self) -> int:
         """Retourne la durée du clip en samples."""
-        return len(self.audio_data) if self.audio_data is not None else 0
+        return self.length if self.source is not None else 0
 
     @property
     def duration_seconds(self) -> float:
@@ -64,6 +181,12 @@ class Timeline:
         self.clips: list[AudioClip] = []
         self.sample_rate: int = 44100
         self._color_counter: int = 0
+        # Last render: mix buffer and the clip layout it was built from,
+        # as (id, version, length) per clip
+        self._mix: np.ndarray | None = None
+        self._layout: list[tuple[str, int, int]] = []
+        # Range [start, end) of the mix changed by the last render
+        self.dirty: tuple[int, int] = (0, 0)
 
     def clear(self):
         """Supprime tous les clips de la timeline."""
@@ -88,9 +211,11 @@ class Timeline:
 
     def add_clip(self, audio_data: np.ndarray, sr: int,
                  name: str = "Clip", position: int | None = None,
-                 color: str = "", copy: bool = True):
+                 color: str = "", copy: bool = True,
+                 original: np.ndarray | None = None, original_sr: int = 0):
         """Add a clip. If position is None, append after last clip.
-        If color is empty, auto-assigns a distinct color."""
+        If color is empty, auto-assigns a distinct color.
+        original / original_sr: the audio before it was resampled to *sr*."""
         if position is None:
             position = max((c.end_position for c in self.clips), default=0)
 
@@ -103,6 +228,8 @@ class Timeline:
             name=name, audio_data=audio_data.copy() if copy else audio_data,
             sample_rate=sr, position=position, color=color
         )
+        if original is not None:
+            clip.original, clip.original_sr = original, original_sr
         is_first = len(self.clips) == 0
         self.clips.append(clip)
         if is_first:
@@ -111,50 +238,106 @@ class Timeline:
 
     def render(self) -> tuple[np.ndarray, int]:
         """Render all clips into a single stereo float32 buffer.
-        Resamples any clip whose sample_rate differs from the timeline's."""
+        Resamples any clip whose sample_rate differs from the timeline's.
+
+        Incremental: only the clips whose version changed are read again;
+        the spans of the previous mix that did not change are copied over
+        (shifted when lengths change).  ``dirty`` receives the changed range.
+        The result belongs to the caller: later renders build a new buffer
+        and never write into a returned one, so clips may be views on it.
+        A caller that writes into it must give the clips covering those
+        samples a new version (ClipBounds.assign does), since the next
+        render copies the spans of unchanged clips from it."""
         if not self.clips:
+            self._layout = []
+            self.dirty = (0, 0)
             return np.zeros((0, 2), dtype=np.float32), self.sample_rate
 
-        self.clips.sort(key=lambda c: c.position)
+        with profiler.span("timeline.render", "render", clips=len(self.clips)):
+            self._conform_sample_rates()
+            # Recalculate positions after potential resample
+            self.reposition_clips()
+            layout = [(c.id, c.version, c.duration_samples) for c in self.clips]
+            total = self.total_duration_samples
+            self.dirty = self._patch_mix(layout, total)
+            self._layout = layout
+        profiler.count("timeline.rendered_samples", self.dirty[1] - self.dirty[0])
+        return self._mix, self.sample_rate
 
-        # Resample clips that don't match the target sample rate
-        from scipy.signal import resample as scipy_resample
-        for clip in self.clips:
-            if clip.sample_rate != self.sample_rate and clip.sample_rate > 0 and self.sample_rate > 0:
-                new_len = int(len(clip.audio_data) * self.sample_rate / clip.sample_rate)
-                if new_len > 0 and new_len != len(clip.audio_data):
-                    d = clip.audio_data
-                    if d.ndim == 1:
-                        clip.audio_data = scipy_resample(d, new_len).astype(np.float32)
-                    else:
-                        channels = [scipy_resample(d[:, ch], new_len).astype(np.float32)
-                                    for ch in range(d.shape[1])]
-                        clip.audio_data = np.column_stack(channels)
-                clip.sample_rate = self.sample_rate
-
-        # Recalculate positions after potential resample
-        self.reposition_clips()
+    def _patch_mix(self, layout, total: int) -> tuple[int, int]:
+        """Build the mix for *layout* from the previous one; returns the changed range."""
+        old = self._layout
+        old_total = sum(n for _, _, n in old)
+        # Unchanged clips at the start (same place) and at the end (maybe shifted)
+        common = min(len(old), len(layout))
+        head = 0
+        while head < common and old[head] == layout[head]:
+            head += 1
+        tail = 0
+        while tail < common - head and old[-1 - tail] == layout[-1 - tail]:
+            tail += 1
+        if head == len(layout) and total == old_total:
+            return (total, total)
+        start = self.clips[head].position if head < len(layout) else total
+        new_tail = self.clips[-tail].position if tail else total
+        old_tail = old_total - (total - new_tail)
 
-        total = max(c.end_position for c in self.clips)
-        out = np.zeros((total, 2), dtype=np.float32)
+        # The previous mix may be held by the caller (and clips cut from
+        # it): it is only read, the new one gets its unchanged spans
+        mix = np.empty((total, 2), dtype=np.float32)
+        if self._mix is not None:
+            mix[:start] = self._mix[:start]
+            mix[new_tail:] = self._mix[old_tail:old_total]
+        mix[start:new_tail] = 0
+        for clip in self.clips[head:len(layout) - tail]:
+            if clip.source is None or clip.duration_samples == 0:
+                continue
+            d = clip.read()
+            if d.ndim == 1:
+                d = d[:, np.newaxis]
+            # Mono broadcasts to both channels, extra channels are dropped
+            mix[clip.position:clip.end_position] = d[:, :2]
+        self._mix = mix
+        return (start, total if new_tail != old_tail else new_tail)
 
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Stereo float32 samples [start, end) of the timeline.
+
+        Lazy concatenation: only the clips overlapping the range are read,
+        and only their overlapping part is materialised (gain included).
+        """
+        out = np.zeros((max(0, end - start), 2), dtype=np.float32)
         for clip in self.clips:
-            d = clip.audio_data
-            if d is None or len(d) == 0:
+            s = max(start, clip.position)
+            e = min(end, clip.end_position)
+            if e <= s or clip.source is None:
                 continue
+            d = clip.read(s - clip.position, e - clip.position)
             if d.ndim == 1:
-                d = np.column_stack([d, d])
-            elif d.shape[1] == 1:
-                d = np.column_stack([d[:, 0], d[:, 0]])
-            else:
-                d = d[:, :2]
+                d = d[:, np.newaxis]
+            # Mono broadcasts to both channels, extra channels are dropped
+            out[s - start:e - start] += d[:, :2]
+        return out
 
-            s = clip.position
-            e = min(s + len(d), total)
-            n = e - s
-            out[s:e] += d[:n].astype(np.float32)
+    def _conform_sample_rates(self):
+        """Resample clips that don't match the target sample rate.
 
-        return out, self.sample_rate
+        Polyphase conversion (core.resample) from the clip's original audio
+        when it still has one, so switching rates back and forth does not
+        compound losses; the original stays attached to the clip.
+        """
+        from core.resample import resample_audio
+        for clip in self.clips:
+            if clip.sample_rate == self.sample_rate or clip.sample_rate <= 0 or self.sample_rate <= 0:
+                continue
+            if clip.original is not None and clip.gain is None:
+                src, src_sr = clip.original, clip.original_sr
+            else:
+                src, src_sr = clip.audio_data, clip.sample_rate
+            if src is not None and len(src) > 0:
+                clip.audio_data = resample_audio(src, src_sr, self.sample_rate)
+                clip.original, clip.original_sr = src, src_sr
+            clip.sample_rate = self.sample_rate
 
     @property
     def total_duration_samples(self) -> int:
@@ -165,3 +348,75 @@ class Timeline:
     def total_duration_seconds(self) -> float:
         """Retourne la durée totale en secondes."""
         return self.total_duration_samples / self.sample_rate if self.sample_rate > 0 else 0.0
+
+
+class ClipBounds:
+    """Clip boundaries inside a rendered buffer, tracked through edits.
+
+    Effects rewrite samples [start, end) of the mix, possibly with another
+    length.  ``edit`` moves the boundaries accordingly (those inside the
+    range scale with it) and marks the clips it touched, then ``assign``
+    hands each of those its exact span of the final buffer as a view: no
+    copy, no guess from length ratios.  The other clips keep their source
+    (and version), so the next render stays incremental.
+    """
+
+    __slots__ = ("ends", "changed")
+
+    def __init__(self, clips):
+        """Start from the current clip lengths (clips end to end)."""
+        self.ends = np.cumsum([c.duration_samples for c in clips], dtype=np.int64)
+        self.changed = np.zeros(len(self.ends), dtype=bool)
+
+    @property
+    def total(self) -> int:
+        """Buffer length the boundaries describe."""
+        return int(self.ends[-1]) if len(self.ends) else 0
+
+    def edit(self, start: int, end: int, new_len: int):
+        """Samples [start, end) were replaced by *new_len* samples."""
+        ends = self.ends
+        old = ends.copy()
+        starts = np.concatenate(([0], old[:-1]))
+        old_len = end - start
+        if new_len != old_len:
+            inside = (ends > start) & (ends < end)
+            ends[ends >= end] += new_len - old_len
+            ends[inside] = start + (ends[inside] - start) * new_len // max(old_len, 1)
+        # Clips overlapping the range, or whose length changed
+        self.changed |= (starts < end) & (old > start)
+        self.changed |= np.diff(ends, prepend=0) != np.diff(old, prepend=0)
+
+    def effect(self, start: int, end: int, old_total: int, new_total: int,
+               grows_at_end: bool = False):
+        """An effect rewrote [start, end) of a buffer of *old_total* samples,
+        which now holds *new_total*.  Usually the length change is inside
+        the range; with *grows_at_end* (delay) the range keeps its length,
+        its tail is mixed over what follows and the buffer was extended
+        past its old end."""
+        if grows_at_end:
+            self.edit(start, old_total, old_total - start)
+            self.edit(old_total, old_total, new_total - old_total)
+        else:
+            self.edit(start, end, end - start + new_total - old_total)
+
+    def fit(self, total: int):
+        """Scale all boundaries to a buffer of *total* samples (the change
+        could not be located: every clip counts as changed)."""
+        if self.total and total != self.total:
+            self.ends = self.ends * total // self.total
+            self.changed[:] = True
+
+    def assign(self, clips, audio: np.ndarray):
+        """Point each changed clip at its span of *audio* (zero-copy views)
+        and place all clips end to end.  Unchanged clips keep their source,
+        version and pre-conversion original; empty spans leave a clip
+        unchanged."""
+        self.fit(len(audio))
+        start = 0
+        for clip, end, changed in zip(clips, self.ends.tolist(), self.changed.tolist()):
+            if changed and end > start:
+                clip.audio_data = audio[start:end]
+            clip.position = start
+            start = max(start, end)
+
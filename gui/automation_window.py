@@ -16,11 +16,12 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QRectF, QTimer
 from PyQt6.QtGui import (
     QPainter, QColor, QPen, QBrush, QFont, QCursor, QPainterPath,
-    QMouseEvent, QPaintEvent
+    QMouseEvent, QPaintEvent, QPolygonF
 )
 from utils.config import COLORS, get_colors, checkbox_css
 from utils.translator import t
 from core.automation import AUTOMATABLE_PARAMS, interpolate_curve
+from core.effects.utils import eval_curve
 
 
 # ═══════════════════════════════════════
@@ -462,18 +463,20 @@ class _CurveEditor(QWidget):
         return best
 
     def _near_seg(self, px, py, rad=16):
-        from core.automation import _bezier_y
         pts = sorted(self._points, key=lambda p: p[0])
+        cand = []   # (segment, t, x) under the cursor
         for si in range(len(pts) - 1):
-            x0, y0 = pts[si]
-            x1, y1 = pts[si + 1]
-            sx0, _ = self._to_pixel(x0, y0)
-            sx1, _ = self._to_pixel(x1, y1)
+            x0, x1 = pts[si][0], pts[si + 1][0]
+            sx0, _ = self._to_pixel(x0, 0)
+            sx1, _ = self._to_pixel(x1, 0)
             if not (sx0 - 8 <= px <= sx1 + 8) or (sx1 - sx0) < 3:
                 continue
             t = max(0.05, min(0.95, (px - sx0) / (sx1 - sx0)))
-            bd = self._bends[si] if si < len(self._bends) else 0.0
-            by = _bezier_y(y0, y1, bd, t)
+            cand.append((si, t, x0 + t * (x1 - x0)))
+        if not cand:
+            return None
+        ys = eval_curve(pts, self._bends, [x for _, _, x in cand])
+        for (si, t, _), by in zip(cand, ys.tolist()):
             _, sy_curve = self._to_pixel(0, by)
             if abs(py - sy_curve) < rad:
                 return si, t
@@ -726,7 +729,6 @@ class _CurveEditor(QWidget):
     # ── painting ──
 
     def paintEvent(self, e: QPaintEvent):
-        from core.automation import _bezier_y
         p = QPainter(self)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
         w, h = self.width(), self.height()
@@ -812,52 +814,28 @@ class _CurveEditor(QWidget):
 
         # ── Curve rendering ──
         sorted_pts = sorted(self._points, key=lambda pt: pt[0])
-        if len(sorted_pts) >= 2:
-            # Fill path (area under curve)
-            fill_path = QPainterPath()
-            sx, sy = self._to_pixel(sorted_pts[0][0], sorted_pts[0][1])
-            fill_path.moveTo(sx, t + dh)
-            fill_path.lineTo(sx, sy)
-            for si in range(len(sorted_pts) - 1):
-                x0, y0 = sorted_pts[si]
-                x1, y1 = sorted_pts[si + 1]
-                sx1, sy1 = self._to_pixel(x1, y1)
-                bd = self._bends[si] if si < len(self._bends) else 0.0
-                if abs(bd) < 0.005:
-                    fill_path.lineTo(sx1, sy1)
-                else:
-                    cx = (x0 + x1) / 2
-                    cy = (y0 + y1) / 2 + bd
-                    cpx, cpy = self._to_pixel(cx, cy)
-                    fill_path.quadTo(cpx, cpy, sx1, sy1)
-            ex, ey = self._to_pixel(sorted_pts[-1][0], sorted_pts[-1][1])
-            fill_path.lineTo(ex, t + dh)
-            fill_path.closeSubpath()
+        if len(sorted_pts) >= 2 and dw > 0:
+            # One evaluation per pixel column, same evaluator as the render
+            x_first, x_last = sorted_pts[0][0], sorted_pts[-1][0]
+            nx = np.linspace(x_first, x_last, max(2, int((x_last - x_first) * dw) + 1))
+            ny = eval_curve(sorted_pts, self._bends, nx)
+            line = QPolygonF([QPointF(x, y) for x, y in
+                              zip((l + nx * dw).tolist(), (t + (1 - ny) * dh).tolist())])
+
+            # Fill (area under curve)
+            fill = QPolygonF(line)
+            fill.append(QPointF(line.last().x(), t + dh))
+            fill.append(QPointF(line.first().x(), t + dh))
             fc = QColor("#7c3aed")
             fc.setAlpha(30)
             p.setPen(Qt.PenStyle.NoPen)
             p.setBrush(QBrush(fc))
-            p.drawPath(fill_path)
+            p.drawPolygon(fill)
 
             # Curve line
-            curve_path = QPainterPath()
-            sx, sy = self._to_pixel(sorted_pts[0][0], sorted_pts[0][1])
-            curve_path.moveTo(sx, sy)
-            for si in range(len(sorted_pts) - 1):
-                x0, y0 = sorted_pts[si]
-                x1, y1 = sorted_pts[si + 1]
-                sx1, sy1 = self._to_pixel(x1, y1)
-                bd = self._bends[si] if si < len(self._bends) else 0.0
-                if abs(bd) < 0.005:
-                    curve_path.lineTo(sx1, sy1)
-                else:
-                    cx = (x0 + x1) / 2
-                    cy = (y0 + y1) / 2 + bd
-                    cpx, cpy = self._to_pixel(cx, cy)
-                    curve_path.quadTo(cpx, cpy, sx1, sy1)
             p.setBrush(Qt.BrushStyle.NoBrush)
             p.setPen(QPen(QColor("#7c3aed"), 2.5))
-            p.drawPath(curve_path)
+            p.drawPolyline(line)
 
         # ── Control points ──
         for i, (x, y) in enumerate(sorted_pts):
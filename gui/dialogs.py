@@ -8,6 +8,9 @@ from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QPainter, QColor, QBrush, QPen, QLinearGradient, QPainterPath
 from utils.config import COLORS, RECORDING_SAMPLE_RATE, RECORDING_CHANNELS, APP_NAME, APP_VERSION
 from utils.translator import t
+from utils.logger import get_logger
+
+_log = get_logger("dialogs")
 
 
 class _WaveVisualizer(QWidget):
@@ -121,9 +124,15 @@ class _WaveVisualizer(QWidget):
 
 
 class RecordDialog(QDialog):
-    recording_done = pyqtSignal(np.ndarray, int)
+    """Records a take to disk (core.recorder.TakeRecorder).
+
+    With *project_sr* the take is converted while recording;
+    recording_done carries (data, sr, original, original_sr), original
+    being None when no conversion was needed.
+    """
+    recording_done = pyqtSignal(np.ndarray, int, object, int)
 
-    def __init__(self, input_device=None, parent=None):
+    def __init__(self, input_device=None, project_sr=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle(t("record.title"))
         self.setFixedSize(480, 440)
@@ -132,12 +141,12 @@ class RecordDialog(QDialog):
         self._playing = False
         self._play_stream = None
         self._play_thread = None
-        self._data = []
+        self._rec = None        # TakeRecorder while recording
+        self._take = None       # (data, sr, original, original_sr) once stopped
         self._stream = None
-        self._level = 0.0
         self._input_device = input_device
+        self._project_sr = project_sr
         self._actual_sr = RECORDING_SAMPLE_RATE
-        self._elapsed = 0.0
         self._blink_on = True
 
         lo = QVBoxLayout(self)
@@ -318,9 +327,8 @@ class RecordDialog(QDialog):
 
     def _start(self):
         self._stop_play()
-        self._data.clear()
+        self._discard_take()
         self._recording = True
-        self._elapsed = 0.0
         self._actual_sr = RECORDING_SAMPLE_RATE
         self._btn_rec.setText(t("record.stop"))
         self._set_rec_style_active()
@@ -334,17 +342,25 @@ class RecordDialog(QDialog):
         self._btn_play.setEnabled(False)
         self._blink_timer.start()
         try:
+            from core.recorder import TakeRecorder
             self._stream = sd.InputStream(
                 samplerate=RECORDING_SAMPLE_RATE, channels=RECORDING_CHANNELS,
                 dtype="float32", callback=self._cb, blocksize=1024,
                 device=self._input_device)
             self._actual_sr = int(self._stream.samplerate)
+            self._rec = TakeRecorder(self._actual_sr, RECORDING_CHANNELS,
+                                     target_sr=self._project_sr)
+            self._rec.start()
             self._stream.start()
             self._timer.start()
         except Exception as e:
             self._lbl_status.setText(f"Error : {e}")
             self._recording = False
             self._blink_timer.stop()
+            if self._stream:
+                self._stream.close()
+                self._stream = None
+            self._discard_take()
 
     def _stop_rec(self):
         self._recording = False
@@ -354,6 +370,12 @@ class RecordDialog(QDialog):
             self._stream.stop()
             self._stream.close()
             self._stream = None
+        if self._rec is not None:
+            try:
+                self._take = self._rec.stop()
+            except Exception as e:
+                _log.error("Recording failed: %s", e)
+                self._take = None
         self._btn_rec.setText(t("record.start"))
         self._set_rec_style_idle()
         self._lbl_status.setText(t("record.done"))
@@ -362,21 +384,21 @@ class RecordDialog(QDialog):
         self._dot.setText("✓")
         self._dot.setStyleSheet(
             f"color: #00b894; font-size: 11px; background: transparent;")
-        has_data = len(self._data) > 0
+        has_data = self._take is not None and len(self._take[0]) > 0
         self._btn_done.setEnabled(has_data)
         self._btn_play.setEnabled(has_data)
         self._wave.reset()
 
     def _cb(self, indata, frames, ti, status):
         if self._recording:
-            self._data.append(indata.copy())
-            self._level = float(np.max(np.abs(indata)))
+            self._rec.write(indata)
 
     def _upd(self):
-        self._wave.set_level(self._level)
-        self._elapsed += 0.04
-        m = int(self._elapsed // 60)
-        s = self._elapsed % 60
+        # Meter: peak of the last ~40 ms in the ring
+        self._wave.set_level(self._rec.peak(self._actual_sr // 25))
+        elapsed = self._rec.frames / self._actual_sr
+        m = int(elapsed // 60)
+        s = elapsed % 60
         self._lbl_timer.setText(f"{m:02d}:{s:04.1f}")
 
     def _blink(self):
@@ -394,10 +416,11 @@ class RecordDialog(QDialog):
             self._start_play()
 
     def _start_play(self):
-        if not self._data:
+        if not self._take:
             return
         self._stop_play()
-        audio = np.concatenate(self._data, axis=0)
+        data, sr, original, original_sr = self._take
+        audio, play_sr = (original, original_sr) if original is not None else (data, sr)
         self._playing = True
         self._btn_play.setText(t("record.stop_listen"))
         self._set_play_style_active()
@@ -416,7 +439,7 @@ class RecordDialog(QDialog):
         try:
             ch = audio.shape[1] if audio.ndim > 1 else 1
             self._play_stream = sd.OutputStream(
-                samplerate=self._actual_sr, channels=ch, dtype="float32")
+                samplerate=play_sr, channels=ch, dtype="float32")
             self._play_stream.start()
             # Play in a thread to avoid blocking
             self._play_thread = threading.Thread(
@@ -467,7 +490,7 @@ class RecordDialog(QDialog):
         self._wave.set_idle_animate(False)
         self._wave.reset()
         # Restore status to "done" if we were playing
-        if was_playing and self._data:
+        if was_playing and self._take:
             self._lbl_status.setText(t("record.done"))
             self._lbl_status.setStyleSheet(
                 f"color: #00b894; font-size: 12px; background: transparent;")
@@ -482,15 +505,30 @@ class RecordDialog(QDialog):
 
     def _finish(self):
         self._stop_play()
-        if self._data:
-            self.recording_done.emit(
-                np.concatenate(self._data, axis=0), self._actual_sr)
+        if self._take:
+            self.recording_done.emit(*self._take)
         self.accept()
 
+    def _discard_take(self):
+        """Drop the current take and delete its files."""
+        if self._rec is not None:
+            self._rec.discard()
+            self._rec = None
+        self._take = None
+
+    def done(self, r):
+        # Accept, Cancel or close: the take is in memory (or unwanted)
+        self._stop_play()
+        if self._recording:
+            self._stop_rec()
+        self._discard_take()
+        super().done(r)
+
     def closeEvent(self, e):
         self._stop_play()
         if self._recording:
             self._stop_rec()
+        self._discard_take()
         e.accept()
 
 
@@ -1,6 +1,8 @@
 """Effect parameter dialogs for all 22 effects.
 Small-range params use Slider + SpinBox combo.
 """
+import random
+
 from utils.logger import get_logger
 _log = get_logger("dialogs")
 from PyQt6.QtWidgets import (
@@ -328,12 +330,28 @@ class TapeStopDialog(_Base):
     def __init__(self, p=None):
         """Initialise les sliders de parametres pour TapeStop."""
         super().__init__("Tape Stop", p)
+        self._row("Mode"); self.md = QComboBox(); self.md.addItems(["stop", "start"]); self._lo.addWidget(self.md)
+        self._row("Curve"); self.cv = QComboBox(); self.cv.addItems(["linear", "exponential"]); self._lo.addWidget(self.cv)
         self.d = _slider_int(self._lo, "Duration (ms)", 100, 5000, 1500, " ms")
+        # Courbe "custom" : points / bends de vitesse venus d'un preset
+        self._speed_points, self._speed_bends = None, None
         self._finish()
-    """Retourne les parametres actuels sous forme de dict."""
-    def get_params(self): return {"duration_ms": self.d.value()}
-    """Charge les parametres depuis un dict."""
-    def set_params(self, p): self.d.setValue(int(p.get("duration_ms", 1500)))
+    def get_params(self):
+        """Retourne les parametres actuels sous forme de dict."""
+        d = {"duration_ms": self.d.value(), "mode": self.md.currentText(), "curve": self.cv.currentText()}
+        if d["curve"] == "custom":
+            d["speed_points"], d["speed_bends"] = self._speed_points, self._speed_bends
+        return d
+    def set_params(self, p):
+        """Charge les parametres depuis un dict."""
+        self.d.setValue(int(p.get("duration_ms", 1500)))
+        idx = self.md.findText(p.get("mode", "stop"))
+        if idx >= 0: self.md.setCurrentIndex(idx)
+        if p.get("speed_points"):
+            self._speed_points, self._speed_bends = p["speed_points"], p.get("speed_bends")
+            if self.cv.findText("custom") < 0: self.cv.addItem("custom")
+        idx = self.cv.findText(p.get("curve", "linear"))
+        if idx >= 0: self.cv.setCurrentIndex(idx)
 
 # ─── Distortion ───
 
@@ -543,13 +561,21 @@ class DatamoshDialog(_Base):
     def __init__(self, p=None):
         """Initialise les sliders de parametres pour Datamosh."""
         super().__init__("Datamosh", p)
+        self._row("Mode"); self.md = QComboBox(); self.md.addItems(["swap", "repeat", "zero", "noise"]); self._lo.addWidget(self.md)
         self.bs = _slider_int(self._lo, "Block size", 64, 8192, 512)
         self.ch = _slider_float(self._lo, "Chaos", 0, 1, 0.5, 0.1, 2)
+        self.sd = _slider_int(self._lo, "Seed", 0, 9999, random.randint(0, 9999))
         self._finish()
     """Retourne les parametres actuels sous forme de dict."""
-    def get_params(self): return {"block_size": self.bs.value(), "chaos": self.ch.value()}
-    """Charge les parametres depuis un dict."""
-    def set_params(self, p): self.bs.setValue(p.get("block_size", 512)); self.ch.setValue(p.get("chaos", 0.5))
+    def get_params(self):
+        return {"block_size": self.bs.value(), "chaos": self.ch.value(),
+                "mode": self.md.currentText(), "seed": self.sd.value()}
+    def set_params(self, p):
+        """Charge les parametres depuis un dict."""
+        self.bs.setValue(p.get("block_size", 512)); self.ch.setValue(p.get("chaos", 0.5))
+        idx = self.md.findText(p.get("mode", "swap"))
+        if idx >= 0: self.md.setCurrentIndex(idx)
+        if p.get("seed") is not None: self.sd.setValue(int(p["seed"]))
 
 # ─── Pan & Stereo ───
 
@@ -59,13 +59,26 @@ def _get_scope_label(op: dict) -> str:
     return "local"
 
 
+def _get_perf_label(op: dict) -> str:
+    """Wall time and memory delta of the op's last run (profiling on)."""
+    perf = op.get("_perf")
+    if perf is None or perf.ms is None:
+        return ""
+    label = f"{perf.ms:.0f} ms" if perf.ms >= 10 else f"{perf.ms:.1f} ms"
+    if perf.mem is not None:
+        mb = perf.mem / (1 << 20)
+        label += f" · {mb:+.1f} MB" if abs(mb) >= 0.1 else f" · {perf.mem / 1024:+.0f} KB"
+    return label
+
+
 class _HistItem(QWidget):
     delete_clicked = pyqtSignal(str)
     toggle_clicked = pyqtSignal(str)
     edit_clicked = pyqtSignal(str)
 
     def __init__(self, uid, index, name, scope, color="#6c5ce7",
-                 timestamp="", enabled=True, icon="🎛", editable=False, parent=None):
+                 timestamp="", enabled=True, icon="🎛", editable=False, perf="",
+                 parent=None):
         super().__init__(parent)
         self._uid = uid; self._color = color; self._hovered = False
         self.setFixedHeight(44); self.setMinimumWidth(180)
@@ -99,10 +112,12 @@ class _HistItem(QWidget):
         lbl = QLabel(f"{index + 1}. {name}")
         lbl.setStyleSheet(f"{ns} font-size: 11px; font-weight: bold;")
         col.addWidget(lbl)
-        parts = [s for s in [scope, timestamp] if s]
+        parts = [s for s in [scope, timestamp, perf] if s]
         if parts:
             meta = QLabel(" · ".join(parts))
             meta.setStyleSheet(f"color: {C['text_dim']}; font-size: 9px;")
+            if perf:
+                meta.setToolTip(t("history.perf_tip"))
             col.addWidget(meta)
         lo.addLayout(col, stretch=1)
 
@@ -223,7 +238,8 @@ class EffectHistoryPanel(QWidget):
                 timestamp=op.get('timestamp', ''),
                 enabled=op.get('enabled', True),
                 icon=icon,
-                editable=editable)
+                editable=editable,
+                perf=_get_perf_label(op))
             item.delete_clicked.connect(self.op_deleted.emit)
             item.toggle_clicked.connect(self.op_toggled.emit)
             item.edit_clicked.connect(self.op_edit_clicked.emit)
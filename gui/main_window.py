@@ -17,7 +17,8 @@ from gui.effects_panel import EffectsPanel
 from gui.transport_bar import TransportBar
 from gui.dialogs import RecordDialog, AboutDialog, FadeDialog
 from gui.catalog_dialog import CatalogDialog
-from gui.settings_dialog import AudioSettingsDialog, LanguageSettingsDialog, ThemeSettingsDialog
+from gui.settings_dialog import (AudioSettingsDialog, LanguageSettingsDialog, ThemeSettingsDialog,
+                                 ExportSettingsDialog)
 from gui.preset_dialog import (PresetCreateDialog, PresetManageDialog,
     TagManageDialog, ExportPresetDialog, ImportChooserDialog, HelpDialog)
 from gui.spectrum_widget import SpectrumWidget
@@ -27,11 +28,11 @@ from gui.progress_overlay import ProgressOverlay
 from gui.automation_window import AutomationWindow
 
 from core.audio_engine import (
-    load_audio, export_audio, ensure_stereo, get_duration, format_time,
+    load_audio, export_audio, export_stems, ensure_stereo, get_duration, format_time,
     ffmpeg_available, download_ffmpeg
 )
 from core.playback import PlaybackEngine
-from core.timeline import Timeline, AudioClip, _generate_distinct_color
+from core.timeline import Timeline, AudioClip, ClipBounds, _generate_distinct_color
 from core.project import save_project, load_project
 from core.preset_manager import PresetManager
 from core.effects.utils import fade_in, fade_out, apply_envelope_fade
@@ -45,6 +46,7 @@ from utils.config import (
 )
 from utils.translator import t, set_language, get_language
 from utils.logger import get_logger
+from utils import profiler
 
 _log = get_logger("main_window")
 
@@ -231,6 +233,7 @@ class MainWindow(QMainWindow):
         self._was_playing_before_drag = False
         self.preset_manager = PresetManager()
         self._active_worker = None
+        self._resample_workers: list[QThread] = []
         self._last_params: dict[str, dict] = {}
 
         # ── Non-destructive effect system (v4.4) ──
@@ -501,6 +504,14 @@ class MainWindow(QMainWindow):
         self._menu_action(om, t("menu.options.audio"), "", self._settings_audio)
         self._menu_action(om, t("menu.options.language"), "", self._settings_language)
         self._menu_action(om, t("menu.options.theme"), "", self._settings_theme)
+        self._menu_action(om, t("menu.options.export"), "", self._settings_export)
+        om.addSeparator()
+        act = QAction(t("menu.options.profiling"), self)
+        act.setCheckable(True)
+        act.setChecked(profiler.enabled())
+        act.toggled.connect(self._toggle_profiling)
+        om.addAction(act)
+        self._menu_action(om, t("menu.options.export_trace"), "", self._export_trace)
         om.addSeparator()
         self._menu_action(om, t("menu.options.metronome"), "", self._open_metronome_dialog)
         self._menu_action(om, t("menu.options.grid"), "", self._show_grid_menu)
@@ -1083,28 +1094,11 @@ class MainWindow(QMainWindow):
             if self.audio_data is None:
                 self._load_audio(fp)
                 return
-            self._push_undo("Add clip")
-            # Resample to match project sample rate if needed
-            if sr != self.sample_rate and self.sample_rate > 0:
-                from scipy.signal import resample as scipy_resample
-                new_len = int(len(st) * self.sample_rate / sr)
-                if new_len > 0:
-                    channels = []
-                    for ch in range(st.shape[1] if st.ndim > 1 else 1):
-                        ch_data = st[:, ch] if st.ndim > 1 else st
-                        channels.append(scipy_resample(ch_data, new_len))
-                    st = np.column_stack(channels).astype(np.float32)
-                sr = self.sample_rate
-            color = CLIP_COLORS[self._clip_color_idx % len(CLIP_COLORS)]
-            self._clip_color_idx += 1
-            self.timeline.add_clip(st, sr, name=name, color=color)
-            self._rebuild_audio()
-            self._base_audio = self.audio_data.copy()
-            self._add_structural_op("add_clip", f"➕ {name}",
-                                    replay_data={"audio": st.copy(), "name": name, "color": color})
-            self._refresh_all()
-            self._unsaved = True
-            self.statusBar().showMessage(f"Added : {os.path.basename(fp)}")
+            # Resample to match project sample rate if needed (worker thread)
+            status = f"Added : {os.path.basename(fp)}"
+            self._resample_then(st, sr, lambda data, orig, orig_sr: self._append_clip(
+                data, name, "add_clip", f"➕ {name}", orig, orig_sr, status,
+                undo="Add clip"))
         except Exception as e:
             _log.error("Add audio error: %s", e, exc_info=True)
             QMessageBox.critical(self, APP_NAME, str(e))
@@ -1177,32 +1171,51 @@ class MainWindow(QMainWindow):
         fmap = {"wav": "WAV (*.wav)", "mp3": "MP3 (*.mp3)", "flac": "FLAC (*.flac)"}
         fp, _ = QFileDialog.getSaveFileName(self, "Export", f"export.{fmt}", fmap.get(fmt, ""))
         if fp:
+            # Quality options for this format (remembered as the new defaults)
+            d = ExportSettingsDialog(load_settings().get("export_profile"), fmt, parent=self)
+            if d.exec() != d.DialogCode.Accepted:
+                return
+            self._save_export_profile(d.profile)
             try:
                 _log.info("Action: Export %s to %s", fmt, fp)
-                export_audio(self.audio_data, self.sample_rate, fp, fmt)
+                self._set_busy(True, f"Export {fmt.upper()}")
+                export_audio(self.audio_data, self.sample_rate, fp, fmt,
+                             progress=self._export_progress, profile=d.profile)
                 self.statusBar().showMessage(t("status.exported").format(f=fp))
             except Exception as e:
                 QMessageBox.critical(self, APP_NAME, str(e))
+            finally:
+                self._set_busy(False)
+
+    def _export_progress(self, fraction):
+        """Progress callback of the exporters (runs in the UI thread)."""
+        self.progress_overlay.set_progress(int(fraction * 100))
+        QApplication.processEvents()
 
     # ══════ Refresh ══════
 
-    def _refresh_all(self):
+    def _refresh_all(self, dirty=None):
+        """Push the current audio to the views; *dirty* = (start, end) limits
+        the waveform / minimap cache refresh to the range that changed."""
         self.timeline_w.timeline = self.timeline
         self.timeline_w.sample_rate = self.sample_rate
         self.timeline_w.update()
         if self.audio_data is not None:
-            self.waveform.set_audio(self.audio_data, self.sample_rate)
-            self.minimap.set_audio(self.audio_data, self.sample_rate)
+            self.waveform.set_audio(self.audio_data, self.sample_rate, dirty)
+            self.minimap.set_audio(self.audio_data, self.sample_rate, dirty)
             self.playback.load(self.audio_data, self.sample_rate)
             self.transport.set_time(
                 "00:00.00",
                 format_time(get_duration(self.audio_data, self.sample_rate)))
 
     def _rebuild_audio(self):
+        # Incremental: only the clips changed since the last render are mixed
         rendered, sr = self.timeline.render()
         if len(rendered) > 0:
             self.audio_data, self.sample_rate = rendered, sr
-        self._refresh_all()
+            self._refresh_all(self.timeline.dirty)
+        else:
+            self._refresh_all()
 
     # ══════ Clip selection → waveform highlight ══════
 
@@ -1313,44 +1326,64 @@ class MainWindow(QMainWindow):
         """Apply a single op on current audio_data (fast, for new ops)."""
         if not op.get("enabled", True) or self.audio_data is None:
             return
+        bounds = ClipBounds(self.timeline.clips)
+        n = len(self.audio_data)
         if op.get("type") == "automation":
-            self._render_auto_op(op)
-            self._update_clips_from_audio()
+            with profiler.span(op.get("name", "?"), "op", uid=op.get("uid", ""),
+                               type="automation") as sp:
+                op["_perf"] = sp
+                edited = self._render_auto_op(op)
+            if edited:
+                s, e = edited
+                plugin = self._find_plugin(op.get("effect_id"))
+                self._edit_bounds(bounds, plugin and plugin.process_fn, s, e, n)
+            self._update_clips_from_audio(bounds)
             self._refresh_all()
             return
         plugin = self._find_plugin(op["effect_id"])
         if not plugin: return
         s = op.get("start", 0)
-        e = op.get("end", len(self.audio_data))
-        s = max(0, min(s, len(self.audio_data)))
-        e = max(s, min(e, len(self.audio_data)))
+        e = op.get("end", n)
+        s = max(0, min(s, n))
+        e = max(s, min(e, n))
         if e - s < 1: return
         try:
-            # Delay needs the full audio to mix the echo tail over following content
-            if op["effect_id"] == "delay":
-                mod = plugin.process_fn(self.audio_data, s, e,
-                                        sr=self.sample_rate, **op.get("params", {}))
-                if mod is None: return
-                self.audio_data = mod.astype(np.float32)
-            else:
-                segment = self.audio_data[s:e].copy()
-                mod = plugin.process_fn(segment, 0, len(segment),
-                                        sr=self.sample_rate, **op.get("params", {}))
-                if mod is None: return
-                if mod.dtype != np.float32:
-                    mod = mod.astype(np.float32)
-                if len(mod) == (e - s):
-                    self.audio_data[s:e] = mod
+            with profiler.span(op.get("name", "?"), "op", uid=op.get("uid", ""),
+                               type="effect") as sp:
+                op["_perf"] = sp
+                # Delay needs the full audio to mix the echo tail over following content
+                if op["effect_id"] == "delay":
+                    mod = plugin.process_fn(self.audio_data, s, e,
+                                            sr=self.sample_rate, **op.get("params", {}))
+                    if mod is None: return
+                    self.audio_data = mod.astype(np.float32, copy=False)
                 else:
-                    before = self.audio_data[:s]
-                    after = self.audio_data[e:]
-                    parts = [p for p in [before, mod, after] if len(p) > 0]
-                    self.audio_data = np.concatenate(parts, axis=0).astype(np.float32)
-            self._update_clips_from_audio()
+                    segment = self.audio_data[s:e].copy()
+                    mod = plugin.process_fn(segment, 0, len(segment),
+                                            sr=self.sample_rate, **op.get("params", {}))
+                    if mod is None: return
+                    if mod.dtype != np.float32:
+                        mod = mod.astype(np.float32)
+                    if len(mod) == (e - s):
+                        self.audio_data[s:e] = mod
+                    else:
+                        before = self.audio_data[:s]
+                        after = self.audio_data[e:]
+                        parts = [p for p in [before, mod, after] if len(p) > 0]
+                        self.audio_data = np.concatenate(parts, axis=0).astype(np.float32)
+            self._edit_bounds(bounds, plugin.process_fn, s, e, n)
+            self._update_clips_from_audio(bounds)
             self._refresh_all()
         except Exception as ex:
             _log.error("Apply op error: %s", ex, exc_info=True)
 
+    def _edit_bounds(self, bounds, process_fn, s, e, n):
+        """Record in *bounds* the op that rewrote [s, e) of a buffer of *n*
+        samples; effects flagged grows_at_end only extend the file."""
+        bounds.effect(s, e, n, len(self.audio_data),
+                      getattr(process_fn, "grows_at_end", False))
+
+    @profiler.profiled("render_from_ops", "render")
     def _render_from_ops(self):
         """Re-render audio by replaying ALL enabled ops from the initial state.
         Uses _ReplayOffsetTracker (v7) to convert initial-space coordinates
@@ -1371,100 +1404,119 @@ class MainWindow(QMainWindow):
 
         # Step 2: Reset the offset tracker for this replay pass
         self._offset_tracker.reset()
+        # Clip boundaries are tracked through effect ops; the clips are
+        # re-pointed at the buffer only before a structural op and at the end
+        # (restored initial clips already match the base audio)
+        bounds = None if self._initial_base_audio is not None else ClipBounds(self.timeline.clips)
 
         # Step 3: Replay all enabled ops in order
         for op in self._effect_ops:
             if not op.get("enabled", True):
+                op.pop("_perf", None)
                 continue
 
-            op_type = op.get("type", "effect")
-
-            # ── Structural ops → replay from _replay data ──
-            if op_type in self._STRUCTURAL_TYPES:
-                replay_op = op
-                rd = op.get("_replay", {})
-
-                # Convert init-space → current-space for position-based ops (v7)
-                if op_type in ("cut_splice", "cut_silence"):
-                    init_s = rd.get("init_start")
-                    init_e = rd.get("init_end")
-                    if init_s is not None and init_e is not None:
-                        cur_s, cur_e = self._offset_tracker.initial_range_to_current(init_s, init_e)
-                        # Create a shallow copy with converted positions (don't mutate stored op)
-                        rd_copy = dict(rd, sel_start=cur_s, sel_end=cur_e)
-                        replay_op = dict(op, _replay=rd_copy)
-
-                if not self._replay_structural_op(replay_op):
-                    _log.warning("Replay skipped (failed): %s", op.get("name"))
-                else:
-                    # Register removal in tracker so subsequent ops get correct offsets
-                    if op_type == "cut_splice":
+            # Per-op wall time / memory delta, shown in the History panel
+            with profiler.span(op.get("name", "?"), "op", uid=op.get("uid", ""),
+                               type=op.get("type", "effect")) as sp:
+                op["_perf"] = sp
+                op_type = op.get("type", "effect")
+
+                # ── Structural ops → replay from _replay data ──
+                if op_type in self._STRUCTURAL_TYPES:
+                    if bounds is not None:
+                        self._update_clips_from_audio(bounds)
+                        bounds = None
+                    replay_op = op
+                    rd = op.get("_replay", {})
+
+                    # Convert init-space → current-space for position-based ops (v7)
+                    if op_type in ("cut_splice", "cut_silence"):
                         init_s = rd.get("init_start")
                         init_e = rd.get("init_end")
                         if init_s is not None and init_e is not None:
-                            self._offset_tracker.register_remove(init_s, init_e)
-                continue
-
-            # ── Automation ops ──
-            if op_type == "automation":
-                self._render_auto_op_tracked(op)
-                # Sync modified audio back to clips so next structural op sees changes
-                self._update_clips_from_audio()
-                continue
+                            cur_s, cur_e = self._offset_tracker.initial_range_to_current(init_s, init_e)
+                            # Create a shallow copy with converted positions (don't mutate stored op)
+                            rd_copy = dict(rd, sel_start=cur_s, sel_end=cur_e)
+                            replay_op = dict(op, _replay=rd_copy)
 
-            # ── Effect ops ──
-            plugin = self._find_plugin(op.get("effect_id"))
-            if not plugin:
-                continue
-            if op.get("is_global", False):
-                s = 0
-                e = len(self.audio_data)
-            else:
-                # Use initial-space coordinates if available (v7)
-                init_s = op.get("init_start")
-                init_e = op.get("init_end")
-                if init_s is not None and init_e is not None:
-                    s, e = self._offset_tracker.initial_range_to_current(init_s, init_e)
-                else:
-                    # Backward compat: use stored current-space positions
-                    s = op.get("start", 0)
-                    e = op.get("end", len(self.audio_data))
-                s = max(0, min(s, len(self.audio_data)))
-                e = max(s, min(e, len(self.audio_data)))
-            if e - s < 1:
-                continue
-            try:
-                # Delay needs the full audio to mix the echo tail over following content
-                if op.get("effect_id") == "delay":
-                    mod = plugin.process_fn(self.audio_data, s, e,
-                                            sr=self.sample_rate, **op.get("params", {}))
-                    if mod is None:
-                        continue
-                    self.audio_data = mod.astype(np.float32)
+                    if not self._replay_structural_op(replay_op):
+                        _log.warning("Replay skipped (failed): %s", op.get("name"))
+                    else:
+                        # Register removal in tracker so subsequent ops get correct offsets
+                        if op_type == "cut_splice":
+                            init_s = rd.get("init_start")
+                            init_e = rd.get("init_end")
+                            if init_s is not None and init_e is not None:
+                                self._offset_tracker.register_remove(init_s, init_e)
+                    continue
+
+                if bounds is None:
+                    bounds = ClipBounds(self.timeline.clips)
+                n = len(self.audio_data)
+
+                # ── Automation ops ──
+                if op_type == "automation":
+                    edited = self._render_auto_op_tracked(op)
+                    if edited:
+                        s, e = edited
+                        plugin = self._find_plugin(op.get("effect_id"))
+                        self._edit_bounds(bounds, plugin and plugin.process_fn, s, e, n)
+                    continue
+
+                # ── Effect ops ──
+                plugin = self._find_plugin(op.get("effect_id"))
+                if not plugin:
+                    continue
+                if op.get("is_global", False):
+                    s = 0
+                    e = len(self.audio_data)
                 else:
-                    segment = self.audio_data[s:e].copy()
-                    mod = plugin.process_fn(segment, 0, len(segment),
-                                            sr=self.sample_rate, **op.get("params", {}))
-                    if mod is None:
-                        continue
-                    if mod.dtype != np.float32:
-                        mod = mod.astype(np.float32)
-                    if len(mod) == (e - s):
-                        self.audio_data[s:e] = mod
+                    # Use initial-space coordinates if available (v7)
+                    init_s = op.get("init_start")
+                    init_e = op.get("init_end")
+                    if init_s is not None and init_e is not None:
+                        s, e = self._offset_tracker.initial_range_to_current(init_s, init_e)
                     else:
-                        before = self.audio_data[:s]
-                        after = self.audio_data[e:]
-                        parts = [p for p in [before, mod, after] if len(p) > 0]
-                        self.audio_data = np.concatenate(parts, axis=0).astype(np.float32)
-                # Sync modified audio back to clips so next structural op sees changes
-                self._update_clips_from_audio()
-            except Exception as ex:
-                _log.warning("Render op %s failed: %s", op.get("name"), ex)
-        self._update_clips_from_audio()
+                        # Backward compat: use stored current-space positions
+                        s = op.get("start", 0)
+                        e = op.get("end", len(self.audio_data))
+                    s = max(0, min(s, len(self.audio_data)))
+                    e = max(s, min(e, len(self.audio_data)))
+                if e - s < 1:
+                    continue
+                try:
+                    # Delay needs the full audio to mix the echo tail over following content
+                    if op.get("effect_id") == "delay":
+                        mod = plugin.process_fn(self.audio_data, s, e,
+                                                sr=self.sample_rate, **op.get("params", {}))
+                        if mod is None:
+                            continue
+                        self.audio_data = mod.astype(np.float32, copy=False)
+                    else:
+                        segment = self.audio_data[s:e].copy()
+                        mod = plugin.process_fn(segment, 0, len(segment),
+                                                sr=self.sample_rate, **op.get("params", {}))
+                        if mod is None:
+                            continue
+                        if mod.dtype != np.float32:
+                            mod = mod.astype(np.float32)
+                        if len(mod) == (e - s):
+                            self.audio_data[s:e] = mod
+                        else:
+                            before = self.audio_data[:s]
+                            after = self.audio_data[e:]
+                            parts = [p for p in [before, mod, after] if len(p) > 0]
+                            self.audio_data = np.concatenate(parts, axis=0).astype(np.float32)
+                    self._edit_bounds(bounds, plugin.process_fn, s, e, n)
+                except Exception as ex:
+                    _log.warning("Render op %s failed: %s", op.get("name"), ex)
+        if bounds is not None:
+            self._update_clips_from_audio(bounds)
         self._refresh_all()
 
     def _render_auto_op(self, op):
-        """Render a single automation op on self.audio_data (multi-param)."""
+        """Render a single automation op on self.audio_data (multi-param).
+        Returns the (start, end) range it rewrote, None if nothing was done."""
         from core.automation import apply_automation_multi
         plugin = self._find_plugin(op.get("effect_id"))
         if not plugin:
@@ -1489,11 +1541,13 @@ class MainWindow(QMainWindow):
             self.audio_data = apply_automation_multi(
                 self.audio_data, s, e,
                 plugin.process_fn, auto_params, self.sample_rate)
+            return s, e
         except Exception as ex:
             _log.warning("Automation render %s failed: %s", op.get("name"), ex)
 
     def _render_auto_op_tracked(self, op):
-        """Like _render_auto_op but uses init-space coordinates via _offset_tracker (v7)."""
+        """Like _render_auto_op but uses init-space coordinates via _offset_tracker (v7).
+        Returns the (start, end) range it rewrote, None if nothing was done."""
         from core.automation import apply_automation_multi
         plugin = self._find_plugin(op.get("effect_id"))
         if not plugin:
@@ -1524,6 +1578,7 @@ class MainWindow(QMainWindow):
             self.audio_data = apply_automation_multi(
                 self.audio_data, s, e,
                 plugin.process_fn, auto_params, self.sample_rate)
+            return s, e
         except Exception as ex:
             _log.warning("Automation render %s failed: %s", op.get("name"), ex)
 
@@ -1928,13 +1983,11 @@ class MainWindow(QMainWindow):
         clip = clips[idx]
         if local_pos <= 0 or local_pos >= clip.duration_samples:
             return False
-        d1 = clip.audio_data[:local_pos]
-        d2 = clip.audio_data[local_pos:]
-        c1 = AudioClip(name=f"{clip.name}_L", audio_data=d1,
+        c1 = clip.view(0, local_pos, name=f"{clip.name}_L",
                         sample_rate=self.sample_rate, position=clip.position,
                         color=_generate_distinct_color(self.timeline._color_counter))
         self.timeline._color_counter += 1
-        c2 = AudioClip(name=f"{clip.name}_R", audio_data=d2,
+        c2 = clip.view(local_pos, None, name=f"{clip.name}_R",
                         sample_rate=self.sample_rate, position=clip.position + local_pos,
                         color=_generate_distinct_color(self.timeline._color_counter))
         self.timeline._color_counter += 1
@@ -1951,7 +2004,7 @@ class MainWindow(QMainWindow):
         clip = clips[idx]
         color = _generate_distinct_color(self.timeline._color_counter)
         self.timeline._color_counter += 1
-        dup = AudioClip(name=f"{clip.name} (dup)", audio_data=clip.audio_data.copy(),
+        dup = clip.view(name=f"{clip.name} (dup)",
                         sample_rate=self.sample_rate,
                         position=clip.end_position, color=color)
         clips.insert(idx + 1, dup)
@@ -2018,8 +2071,8 @@ class MainWindow(QMainWindow):
         if clip._audio_before_fade_in is None:
             clip._audio_before_fade_in = clip.audio_data.copy()
         fade_samples = int(params["duration_ms"] / 1000.0 * self.sample_rate)
-        clip.audio_data = apply_envelope_fade(
-            clip.audio_data, fade_samples,
+        clip.gain = apply_envelope_fade(
+            clip.gain_envelope(), fade_samples,
             params["points"], params["bends"], "in")
         clip.fade_in_params = params
         self._rebuild_audio()
@@ -2037,8 +2090,8 @@ class MainWindow(QMainWindow):
         if clip._audio_before_fade_out is None:
             clip._audio_before_fade_out = clip.audio_data.copy()
         fade_samples = int(params["duration_ms"] / 1000.0 * self.sample_rate)
-        clip.audio_data = apply_envelope_fade(
-            clip.audio_data, fade_samples,
+        clip.gain = apply_envelope_fade(
+            clip.gain_envelope(), fade_samples,
             params["points"], params["bends"], "out")
         clip.fade_out_params = params
         self._rebuild_audio()
@@ -2145,27 +2198,16 @@ class MainWindow(QMainWindow):
         else:
             self.progress_overlay.hide_progress()
 
-    def _update_clips_from_audio(self):
-        if not self.timeline.clips: return
-        total = len(self.audio_data)
-        if len(self.timeline.clips) == 1:
-            c = self.timeline.clips[0]
-            c.audio_data = ensure_stereo(self.audio_data)
-            c.position = 0; return
-        old_total = sum(c.duration_samples for c in self.timeline.clips)
-        if old_total == 0: return
-        ratio = total / old_total
-        pos = 0
-        for c in self.timeline.clips:
-            new_len = int(c.duration_samples * ratio)
-            new_len = min(new_len, total - pos)
-            if new_len > 0:
-                c.audio_data = ensure_stereo(self.audio_data[pos:pos + new_len])
-            c.position = pos; pos += new_len
-        if pos < total and self.timeline.clips:
-            last = self.timeline.clips[-1]
-            extra = ensure_stereo(self.audio_data[pos:total])
-            last.audio_data = np.concatenate([last.audio_data, extra], axis=0)
+    def _update_clips_from_audio(self, bounds=None):
+        """Hand each clip changed by the tracked edits its span of
+        self.audio_data as a zero-copy view; the others only move.
+        bounds: ClipBounds tracked through the edits made since the clips
+        were last in sync; by default the current clip lengths (scaled to
+        the new total if it changed)."""
+        if not self.timeline.clips or self.audio_data is None: return
+        if bounds is None:
+            bounds = ClipBounds(self.timeline.clips)
+        bounds.assign(self.timeline.clips, ensure_stereo(self.audio_data))
 
     # ══════ Presets ══════
 
@@ -2383,14 +2425,12 @@ class MainWindow(QMainWindow):
         local = pos - clip.position
         if local <= 0 or local >= clip.duration_samples: return
         self._push_undo("Split")
-        d1 = clip.audio_data[:local]
-        d2 = clip.audio_data[local:]
         idx = self.timeline.clips.index(clip)
-        c1 = AudioClip(name=f"{clip.name}_L", audio_data=d1,
+        c1 = clip.view(0, local, name=f"{clip.name}_L",
                         sample_rate=self.sample_rate, position=clip.position,
                         color=_generate_distinct_color(self.timeline._color_counter))
         self.timeline._color_counter += 1
-        c2 = AudioClip(name=f"{clip.name}_R", audio_data=d2,
+        c2 = clip.view(local, None, name=f"{clip.name}_R",
                         sample_rate=self.sample_rate, position=clip.position + local,
                         color=_generate_distinct_color(self.timeline._color_counter))
         self.timeline._color_counter += 1
@@ -2408,7 +2448,7 @@ class MainWindow(QMainWindow):
         self._push_undo("Duplicate")
         color = CLIP_COLORS[self._clip_color_idx % len(CLIP_COLORS)]
         self._clip_color_idx += 1
-        dup = AudioClip(name=f"{clip.name} (dup)", audio_data=clip.audio_data.copy(),
+        dup = clip.view(name=f"{clip.name} (dup)",
                         sample_rate=self.sample_rate,
                         position=clip.end_position, color=color)
         idx = self.timeline.clips.index(clip)
@@ -2604,19 +2644,19 @@ class MainWindow(QMainWindow):
                 p = clip.fade_out_params
                 fs = int(p["duration_ms"] / 1000.0 * self.sample_rate)
                 if "points" in p:
-                    clip.audio_data = apply_envelope_fade(
-                        clip.audio_data, fs, p["points"], p["bends"], "out")
+                    clip.gain = apply_envelope_fade(
+                        clip.gain_envelope(), fs, p["points"], p["bends"], "out")
                 else:
-                    clip.audio_data = fade_out(clip.audio_data, fs,
-                                               p["curve_type"], p["start_level"], p["end_level"],
-                                               p.get("curvature", 0.0))
+                    clip.gain = fade_out(clip.gain_envelope(), fs,
+                                         p["curve_type"], p["start_level"], p["end_level"],
+                                         p.get("curvature", 0.0))
         # Save original for future re-edits
         if clip._audio_before_fade_in is None:
             clip._audio_before_fade_in = clip.audio_data.copy()
         # Apply new fade-in (envelope-based)
         fade_samples = int(params["duration_ms"] / 1000.0 * self.sample_rate)
-        clip.audio_data = apply_envelope_fade(
-            clip.audio_data, fade_samples,
+        clip.gain = apply_envelope_fade(
+            clip.gain_envelope(), fade_samples,
             params["points"], params["bends"], "in")
         clip.fade_in_params = params
         clip_idx = self.timeline.clips.index(clip)
@@ -2652,19 +2692,19 @@ class MainWindow(QMainWindow):
                 p = clip.fade_in_params
                 fs = int(p["duration_ms"] / 1000.0 * self.sample_rate)
                 if "points" in p:
-                    clip.audio_data = apply_envelope_fade(
-                        clip.audio_data, fs, p["points"], p["bends"], "in")
+                    clip.gain = apply_envelope_fade(
+                        clip.gain_envelope(), fs, p["points"], p["bends"], "in")
                 else:
-                    clip.audio_data = fade_in(clip.audio_data, fs,
-                                              p["curve_type"], p["start_level"], p["end_level"],
-                                              p.get("curvature", 0.0))
+                    clip.gain = fade_in(clip.gain_envelope(), fs,
+                                        p["curve_type"], p["start_level"], p["end_level"],
+                                        p.get("curvature", 0.0))
         # Save original for future re-edits
         if clip._audio_before_fade_out is None:
             clip._audio_before_fade_out = clip.audio_data.copy()
         # Apply new fade-out (envelope-based)
         fade_samples = int(params["duration_ms"] / 1000.0 * self.sample_rate)
-        clip.audio_data = apply_envelope_fade(
-            clip.audio_data, fade_samples,
+        clip.gain = apply_envelope_fade(
+            clip.gain_envelope(), fade_samples,
             params["points"], params["bends"], "out")
         clip.fade_out_params = params
         clip_idx = self.timeline.clips.index(clip)
@@ -2815,17 +2855,24 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, APP_NAME, t("stems.single")); return
         folder = QFileDialog.getExistingDirectory(self, t("stems.choose_folder"))
         if not folder: return
+        jobs = []
+        for i, clip in enumerate(self.timeline.clips):
+            name = clip.name or f"stem_{i+1}"
+            safe = "".join(c for c in name if c.isalnum() or c in " _-")[:50]
+            fp = os.path.join(folder, f"{safe}.wav")
+            jobs.append((clip.audio_data, clip.sample_rate, fp))
+        n = len(jobs)
         try:
-            exported = 0
-            for i, clip in enumerate(self.timeline.clips):
-                name = clip.name or f"stem_{i+1}"
-                safe = "".join(c for c in name if c.isalnum() or c in " _-")[:50]
-                fp = os.path.join(folder, f"{safe}.wav")
-                export_audio(clip.audio_data, clip.sample_rate, fp, "wav")
-                exported += 1
-            self.statusBar().showMessage(t("stems.done").format(n=exported))
+            # Stems are encoded in parallel worker processes
+            self._set_busy(True, t("stems.exporting").format(n=n))
+            exported = export_stems(jobs, "wav", progress=self._export_progress,
+                                    profile=load_settings().get("export_profile"))
+            self.statusBar().showMessage(t("stems.done").format(
+                done=len(exported), total=n, folder=folder))
         except Exception as e:
             QMessageBox.critical(self, APP_NAME, str(e))
+        finally:
+            self._set_busy(False)
 
     # ══════ Settings ══════
 
@@ -2863,6 +2910,40 @@ class MainWindow(QMainWindow):
                 save_settings(s)
                 QMessageBox.information(self, APP_NAME, t("settings.restart"))
 
+    def _settings_export(self):
+        d = ExportSettingsDialog(load_settings().get("export_profile"), parent=self)
+        if d.exec() == d.DialogCode.Accepted:
+            self._save_export_profile(d.profile)
+            self.statusBar().showMessage(t("settings.updated"))
+
+    @staticmethod
+    def _save_export_profile(profile):
+        s = load_settings()
+        s["export_profile"] = profile
+        save_settings(s)
+
+    def _toggle_profiling(self, on):
+        profiler.set_enabled(on)
+        s = load_settings()
+        s["profiling"] = on
+        save_settings(s)
+        self.statusBar().showMessage(t("status.profiling_on" if on else "status.profiling_off"))
+
+    def _export_trace(self):
+        """Save the session's profiling events as Chrome trace JSON."""
+        fp, _ = QFileDialog.getSaveFileName(
+            self, t("menu.options.export_trace"),
+            datetime.now().strftime("glitchmaker_trace_%Y%m%d_%H%M%S.json"),
+            "Chrome trace (*.json)")
+        if not fp:
+            return
+        try:
+            n = profiler.export_chrome_trace(fp)
+            self.statusBar().showMessage(t("status.trace_exported").format(n=n, path=fp))
+        except Exception as ex:
+            _log.error("Trace export failed: %s", ex)
+            QMessageBox.critical(self, APP_NAME, str(ex))
+
     def _import_effect(self):
         """Import chooser: Effect plugin, Preset, or Help."""
         d = ImportChooserDialog(self)
@@ -2884,11 +2965,14 @@ class MainWindow(QMainWindow):
     # ══════ Misc ══════
 
     def _record(self):
-        d = RecordDialog(input_device=self.playback.input_device, parent=self)
+        # With a project open the take is converted to its rate while recording
+        project_sr = self.sample_rate if self.audio_data is not None else None
+        d = RecordDialog(input_device=self.playback.input_device,
+                         project_sr=project_sr, parent=self)
         d.recording_done.connect(self._on_rec)
         d.exec()
 
-    def _on_rec(self, data, sr):
+    def _on_rec(self, data, sr, original=None, original_sr=0):
         st = ensure_stereo(data)
         name = f"Recording {datetime.now().strftime('%H:%M:%S')}"
         if self.audio_data is None:
@@ -2901,27 +2985,55 @@ class MainWindow(QMainWindow):
             self._base_audio = st.copy()
             self._store_initial_state()
         else:
-            self._push_undo("Record")
+            if original is not None and sr == self.sample_rate:
+                # Already converted by the recorder
+                self._append_clip(st, name, "record", f"🎙 {name}",
+                                  ensure_stereo(original), original_sr, undo="Record")
+                return
             # Resample recording to match project sample rate if needed
-            if sr != self.sample_rate and self.sample_rate > 0:
-                from scipy.signal import resample as scipy_resample
-                new_len = int(len(st) * self.sample_rate / sr)
-                if new_len > 0:
-                    channels = []
-                    for ch in range(st.shape[1] if st.ndim > 1 else 1):
-                        ch_data = st[:, ch] if st.ndim > 1 else st
-                        channels.append(scipy_resample(ch_data, new_len))
-                    st = np.column_stack(channels).astype(np.float32)
-                sr = self.sample_rate
-            color = CLIP_COLORS[self._clip_color_idx % len(CLIP_COLORS)]
-            self._clip_color_idx += 1
-            self.timeline.add_clip(st, sr, name=name, color=color)
-            self._rebuild_audio()
-            self._base_audio = self.audio_data.copy() if self.audio_data is not None else None
-            self._add_structural_op("record", f"🎙 {name}",
-                                    replay_data={"audio": st.copy(), "name": name, "color": color})
+            self._resample_then(st, sr, lambda data, orig, orig_sr: self._append_clip(
+                data, name, "record", f"🎙 {name}", orig, orig_sr, undo="Record"))
+            return
+        self._refresh_all()
+        self._unsaved = True
+
+    def _resample_then(self, st, sr, then):
+        """Convert *st* to the project rate in a worker thread, then call
+        then(converted, original, original_sr) on the GUI thread.
+        original is None when no conversion was needed."""
+        if sr == self.sample_rate or self.sample_rate <= 0:
+            then(st, None, 0)
+            return
+        from core.resample import resample_audio
+        # The busy overlay keeps edits out until the clip is appended
+        self._set_busy(True, t("status.resampling").format(src=sr, dst=self.sample_rate))
+        worker = _EffectWorker(resample_audio, (st, sr, self.sample_rate), {}, self)
+        worker.done.connect(lambda data: then(data, st, sr))
+        worker.error.connect(lambda msg: QMessageBox.critical(self, APP_NAME, msg))
+        worker.finished.connect(lambda: self._resample_workers.remove(worker))
+        worker.finished.connect(lambda: self._set_busy(False))
+        self._resample_workers.append(worker)
+        worker.start()
+
+    def _append_clip(self, st, name, op_type, op_name, original=None, original_sr=0,
+                     status=None, undo=None):
+        """Append a clip already at the project rate + its structural op.
+        undo: undo label, pushed here so that the snapshot is taken right
+        before the clip lands (after any background resampling)."""
+        if undo:
+            self._push_undo(undo)
+        color = CLIP_COLORS[self._clip_color_idx % len(CLIP_COLORS)]
+        self._clip_color_idx += 1
+        self.timeline.add_clip(st, self.sample_rate, name=name, color=color,
+                               original=original, original_sr=original_sr)
+        self._rebuild_audio()
+        self._base_audio = self.audio_data.copy() if self.audio_data is not None else None
+        self._add_structural_op(op_type, op_name,
+                                replay_data={"audio": st.copy(), "name": name, "color": color})
         self._refresh_all()
         self._unsaved = True
+        if status:
+            self.statusBar().showMessage(status)
 
     def _select_all(self):
         if self.audio_data is not None:
@@ -21,9 +21,22 @@ class MinimapWidget(QWidget):
         self._offset = 0.0
         self._cache: QImage | None = None
         self._cache_w = 0
+        # (samples per column, mins, maxs) of the last render
+        self._peaks: tuple[int, np.ndarray, np.ndarray] | None = None
         self._dragging = False
 
-    def set_audio(self, data, sr):
+    def set_audio(self, data, sr, dirty=None):
+        """dirty: zone (debut, fin) modifiee ; seules ses colonnes sont recalculees."""
+        peaks = self._peaks
+        if (dirty is not None and peaks is not None and data is not None
+                and self._audio is not None and len(data) == len(self._audio)):
+            step, mins, maxs = peaks
+            c0 = dirty[0] // step
+            c1 = min(len(mins), -(-dirty[1] // step))
+            if c1 > c0:
+                mins[c0:c1], maxs[c0:c1] = self._column_peaks(data, step, c0, c1)
+        else:
+            self._peaks = None
         self._audio = data
         self._sr = sr
         self._cache = None
@@ -95,17 +108,15 @@ class MinimapWidget(QWidget):
         buf[:, :, 2] = bg.red()
         buf[:, :, 3] = 255
 
-        mono = np.mean(self._audio, axis=1) if self._audio.ndim > 1 else self._audio
-        n = len(mono)
+        n = len(self._audio)
         step = max(1, n // w)
         cols = min(w, n // step)
         if cols <= 0:
             return QImage(buf.data, w, h, w * 4, QImage.Format.Format_ARGB32).copy()
 
-        usable = cols * step
-        reshaped = mono[:usable].reshape(cols, step)
-        mins = np.min(reshaped, axis=1)
-        maxs = np.max(reshaped, axis=1)
+        if self._peaks is None or self._peaks[0] != step or len(self._peaks[1]) != cols:
+            self._peaks = (step, *self._column_peaks(self._audio, step, 0, cols))
+        _, mins, maxs = self._peaks
         mid = h // 2
         yt = np.clip((mid - maxs * mid * 0.85).astype(int), 0, h - 1)
         yb = np.clip((mid - mins * mid * 0.85).astype(int), 0, h - 1)
@@ -119,3 +130,11 @@ class MinimapWidget(QWidget):
         buf[:, :cols, 2] = np.where(mask[:, :cols], r, buf[:, :cols, 2])
 
         return QImage(buf.data, w, h, w * 4, QImage.Format.Format_ARGB32).copy()
+
+    @staticmethod
+    def _column_peaks(audio, step, c0, c1):
+        """(mins, maxs) of the mono mix for columns [c0, c1) of *step* samples."""
+        block = audio[c0 * step:c1 * step]
+        mono = np.mean(block, axis=1) if block.ndim > 1 else block
+        reshaped = mono.reshape(c1 - c0, step)
+        return np.min(reshaped, axis=1), np.max(reshaped, axis=1)
@@ -247,5 +247,88 @@ class ThemeSettingsDialog(QDialog):
         self.accept()
 
 
+class ExportSettingsDialog(QDialog):
+    """Export profile: WAV depth + dither, MP3 mode / bitrate / speed, FLAC level.
+
+    fmt: show only that format's options (export flow); None shows all
+    (Options menu).  The chosen profile is in ``self.profile``.
+    """
+
+    def __init__(self, profile=None, fmt=None, parent=None):
+        super().__init__(parent)
+        from core.audio_engine import export_profile, MP3_BITRATES
+        self.setWindowTitle(t("settings.export_title"))
+        self.setMinimumWidth(380)
+        self.setStyleSheet(_dialog_style())
+        self.profile = export_profile(profile)
+        p = self.profile
+
+        lo = QVBoxLayout(self)
+        lo.setSpacing(0)
+        lo.setContentsMargins(24, 20, 24, 20)
+        lo.addWidget(_title_label(t("settings.export_title")))
+
+        def combo(label, items, current):
+            lo.addWidget(_field_label(label))
+            lo.addSpacing(6)
+            cb = QComboBox()
+            cb.setStyleSheet(_combo_style())
+            for text, data in items:
+                cb.addItem(text, data)
+            idx = cb.findData(current)
+            cb.setCurrentIndex(max(idx, 0))
+            lo.addWidget(cb)
+            lo.addSpacing(12)
+            return cb
+
+        self.combo_wav = self.combo_dither = None
+        self.combo_mp3_mode = self.combo_bitrate = self.combo_vbr = self.combo_speed = None
+        self.combo_flac = None
+        if fmt in (None, "wav"):
+            self.combo_wav = combo(t("settings.export.wav_depth"), [
+                ("16-bit PCM", "PCM_16"), ("24-bit PCM", "PCM_24"),
+                ("32-bit float", "FLOAT")], p["wav_subtype"])
+        if fmt in (None, "wav", "flac", "mp3"):
+            self.combo_dither = combo(t("settings.export.dither"), [
+                (t("settings.export.dither_tpdf"), True),
+                (t("settings.export.dither_off"), False)], bool(p["dither"]))
+        if fmt in (None, "mp3"):
+            self.combo_mp3_mode = combo(t("settings.export.mp3_mode"), [
+                ("CBR", "cbr"), ("VBR", "vbr")], p["mp3_mode"])
+            self.combo_bitrate = combo(t("settings.export.mp3_bitrate"), [
+                (f"{b} kbps", b) for b in MP3_BITRATES], p["mp3_bitrate"])
+            self.combo_vbr = combo(t("settings.export.mp3_vbr"), [
+                (f"V{q}", q) for q in range(10)], p["mp3_vbr_quality"])
+            self.combo_speed = combo(t("settings.export.mp3_speed"), [
+                (t("settings.export.speed_best"), 0),
+                (t("settings.export.speed_high"), 2),
+                (t("settings.export.speed_fast"), 5),
+                (t("settings.export.speed_fastest"), 7)], p["mp3_speed"])
+            self.combo_mp3_mode.currentIndexChanged.connect(self._sync_mp3)
+            self._sync_mp3()
+        if fmt in (None, "flac"):
+            self.combo_flac = combo(t("settings.export.flac_level"), [
+                (t("settings.export.flac_fast") if lv == 0 else
+                 t("settings.export.flac_small") if lv == 8 else str(lv), lv)
+                for lv in range(9)], p["flac_level"])
+
+        lo.addStretch()
+        lo.addLayout(_button_row(self, self.reject, self._apply))
+
+    def _sync_mp3(self):
+        vbr = self.combo_mp3_mode.currentData() == "vbr"
+        self.combo_bitrate.setEnabled(not vbr)
+        self.combo_vbr.setEnabled(vbr)
+
+    def _apply(self):
+        for key, cb in (("wav_subtype", self.combo_wav), ("dither", self.combo_dither),
+                        ("mp3_mode", self.combo_mp3_mode), ("mp3_bitrate", self.combo_bitrate),
+                        ("mp3_vbr_quality", self.combo_vbr), ("mp3_speed", self.combo_speed),
+                        ("flac_level", self.combo_flac)):
+            if cb is not None:
+                self.profile[key] = cb.currentData()
+        self.accept()
+
+
 # Backward compatibility alias
 SettingsDialog = AudioSettingsDialog
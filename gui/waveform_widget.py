@@ -7,6 +7,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, QPointF
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QImage, QFont, QPolygonF
 from utils.config import COLORS
 from utils.translator import t
+from utils import profiler
 
 
 def _parse_color(hex_str):
@@ -98,10 +99,21 @@ class WaveformWidget(QWidget):
             self._cache = None
             self.update()
 
-    def set_audio(self, data, sr):
-        """Charge les données audio à afficher et réinitialise le zoom."""
+    def set_audio(self, data, sr, dirty=None):
+        """Charge les données audio à afficher et réinitialise le zoom.
+        dirty: zone (debut, fin) modifiee depuis le dernier appel ; si elle
+        est hors de la vue et la longueur inchangee, le cache est conserve."""
+        keep = (dirty is not None and data is not None and self.audio_data is not None
+                and len(data) == len(self.audio_data))
         self.audio_data = data
         self.sample_rate = sr
+        if keep:
+            vs, ve = self._visible_range()
+            key = getattr(self, '_data_cache_key', None)
+            if key is not None and (dirty[1] <= vs or dirty[0] >= ve):
+                self._data_cache_key = key[:3] + (id(data),)
+                self.update()
+                return
         self._cache = None
         self.update()
 
@@ -397,6 +409,7 @@ class WaveformWidget(QWidget):
 
     # ── Paint ──
 
+    @profiler.profiled("waveform.paint", "ui")
     def paintEvent(self, e):
         """Dessine la waveform, grille, selection, playhead, curseur."""
         p = QPainter(self)
@@ -639,6 +652,7 @@ class WaveformWidget(QWidget):
         
         return 'low', (mins, maxs)
 
+    @profiler.profiled("waveform.render_wave", "ui")
     def _render_wave(self, w, h):
         """Render waveform using cached display data if available."""
         # Standard background
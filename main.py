@@ -18,9 +18,12 @@ from utils.logger import write_crash_log, _LOG_DIR
 settings = load_settings()
 set_language(settings.get("language", "en"))
 
-from PyQt6.QtWidgets import QApplication, QMessageBox
-from PyQt6.QtGui import QFont
-from gui.main_window import MainWindow
+from utils import profiler
+
+with profiler.span("startup.imports", "startup"):
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from PyQt6.QtGui import QFont
+    from gui.main_window import MainWindow
 
 
 def _global_exception_handler(exc_type, exc_value, exc_tb):
@@ -57,9 +60,13 @@ def main():
     app = QApplication(sys.argv)
     app.setFont(QFont("Segoe UI", 10))
     app.setStyle("Fusion")
-    win = MainWindow()
-    win.show()
+    with profiler.span("startup.window", "startup"):
+        win = MainWindow()
+        win.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Stem export runs worker processes (needed by frozen builds)
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -11,7 +11,13 @@ from utils.translator import t
 
 
 class Plugin:
-    __slots__ = ("id", "icon", "color", "section", "dialog_class", "process_fn",
+    """Effect entry for menus and the effect pipeline.
+
+    dialog_class may be given as a zero-argument factory returning the
+    class: it is resolved on first access, so building the plugin list
+    imports no dialog module.
+    """
+    __slots__ = ("id", "icon", "color", "section", "_dialog", "process_fn",
                  "_name_key", "_preview_file")
 
     def __init__(self, eid, icon, color, section, name_key, dialog_class, process_fn,
@@ -21,10 +27,17 @@ class Plugin:
         self.color = color
         self.section = section
         self._name_key = name_key
-        self.dialog_class = dialog_class
+        self._dialog = dialog_class
         self.process_fn = process_fn
         self._preview_file = preview_file
 
+    @property
+    def dialog_class(self):
+        """Classe du dialogue (importee au premier acces)."""
+        if self._dialog is not None and not isinstance(self._dialog, type):
+            self._dialog = self._dialog()
+        return self._dialog
+
     def get_name(self, lang=None):
         # User plugins use special prefix
         """Retourne le nom traduit du plugin."""
@@ -79,36 +92,29 @@ def _w_volume(audio_data, start, end, sr=44100, **kw):
     return volume(audio_data, start, end, gain_pct=kw.get("gain_pct", 100))
 
 def _w_filter(audio_data, start, end, sr=44100, **kw):
-    """Wrapper : applique l effet Filter."""
+    """Wrapper : applique l effet Filter.
+
+    cutoff_hz / resonance may be per-sample arrays (automation curves).
+    With a plugin_state dict the filter state is carried across calls.
+    """
     from core.effects.filter import resonant_filter
 
     state = kw.get("plugin_state")
-    if state is not None:
-        # Stateful mode: pass zi (may be None on first call)
-        zi = state.get("filter_zi")
-        # Pass zi="init" to signal we want stateful returns even on first call
-        # resonant_filter checks `zi is not None` to decide return type
-        # So pass an empty list/zeros if we have no stored state yet
-        result = resonant_filter(audio_data, start, end,
-                                 filter_type=kw.get("filter_type", "lowpass"),
-                                 cutoff=kw.get("cutoff_hz", 1000),
-                                 resonance=kw.get("resonance", 1.0), sr=sr,
-                                 zi=zi)
-        # resonant_filter returns (array, zf) when zi is not None,
-        # or just array when zi is None (first call)
-        if isinstance(result, tuple):
-            res, zf = result
-            if zf is not None:
-                state["filter_zi"] = zf
-            return res
-        else:
-            return result
-    else:
-        # Stateless mode: simple call
+    if state is None:
         return resonant_filter(audio_data, start, end,
                                filter_type=kw.get("filter_type", "lowpass"),
                                cutoff=kw.get("cutoff_hz", 1000),
                                resonance=kw.get("resonance", 1.0), sr=sr)
+    res, zf = resonant_filter(audio_data, start, end,
+                              filter_type=kw.get("filter_type", "lowpass"),
+                              cutoff=kw.get("cutoff_hz", 1000),
+                              resonance=kw.get("resonance", 1.0), sr=sr,
+                              zi=state.get("filter_zi"), return_zf=True)
+    state["filter_zi"] = zf
+    return res
+
+# Params the wrapper accepts as per-sample arrays (one automation call)
+_w_filter.param_curves = ("cutoff_hz", "resonance")
 
 def _w_pan(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Pan."""
@@ -136,7 +142,9 @@ def _w_tape_stop(audio_data, start, end, sr=44100, **kw):
     duration_ms = kw.get("duration_ms", 1500)
     seg_len = end - start
     duration_pct = min(1.0, max(0.05, (duration_ms / 1000.0) * sr / seg_len)) if seg_len > 0 else 0.5
-    return tape_stop(audio_data, start, end, duration_pct=duration_pct, sr=sr)
+    return tape_stop(audio_data, start, end, duration_pct=duration_pct, sr=sr,
+                     curve=kw.get("curve", "linear"), mode=kw.get("mode", "stop"),
+                     points=kw.get("speed_points"), bends=kw.get("speed_bends"))
 
 def _w_saturation(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Saturation."""
@@ -163,13 +171,20 @@ def _w_bitcrusher(audio_data, start, end, sr=44100, **kw):
                     downsample=kw.get("downsample", 1))
 
 def _w_chorus(audio_data, start, end, sr=44100, **kw):
-    """Wrapper : applique l effet Chorus."""
+    """Wrapper : applique l effet Chorus.
+
+    depth_ms / rate_hz / mix may be per-sample arrays; plugin_state keeps
+    the LFO phase and delay-line history across calls.
+    """
     from core.effects.chorus import chorus
     return chorus(audio_data, start, end,
                   depth_ms=kw.get("depth_ms", 3.0),
                   rate_hz=kw.get("rate_hz", 1.5),
                   mix=kw.get("mix", 0.5),
-                  voices=kw.get("voices", 2), sr=sr)
+                  voices=kw.get("voices", 2), sr=sr,
+                  state=kw.get("plugin_state"))
+
+_w_chorus.param_curves = ("depth_ms", "rate_hz", "mix")
 
 def _w_phaser(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Phaser."""
@@ -186,14 +201,20 @@ def _w_tremolo(audio_data, start, end, sr=44100, **kw):
     return tremolo(audio_data, start, end,
                    rate_hz=kw.get("rate_hz", 5.0),
                    depth=kw.get("depth", 0.7),
-                   shape=kw.get("shape", "sine"), sr=sr)
+                   shape=kw.get("shape", "sine"), sr=sr,
+                   state=kw.get("plugin_state"))
+
+_w_tremolo.param_curves = ("rate_hz", "depth")
 
 def _w_ring_mod(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Ring Modulator."""
     from core.effects.ring_mod import ring_mod
     return ring_mod(audio_data, start, end,
                     freq=kw.get("frequency", 440),
-                    mix=kw.get("mix", 0.5), sr=sr)
+                    mix=kw.get("mix", 0.5), sr=sr,
+                    state=kw.get("plugin_state"))
+
+_w_ring_mod.param_curves = ("frequency", "mix")
 
 def _w_delay(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Delay."""
@@ -203,6 +224,9 @@ def _w_delay(audio_data, start, end, sr=44100, **kw):
                  feedback=kw.get("feedback", 0.4),
                  mix=kw.get("mix", 0.5), sr=sr)
 
+# Same length over [start, end); the echo tail may extend the file at its end
+_w_delay.grows_at_end = True
+
 def _w_vinyl(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Vinyl Crackle."""
     from core.effects.vinyl import vinyl
@@ -211,9 +235,16 @@ def _w_vinyl(audio_data, start, end, sr=44100, **kw):
                  crackle=amount, noise=amount * 0.5, wow=amount * 0.3, sr=sr)
 
 def _w_ott(audio_data, start, end, sr=44100, **kw):
-    """Wrapper : applique l effet OTT Compression."""
+    """Wrapper : applique l effet OTT Compression.
+
+    depth may be a per-sample array; plugin_state carries the crossover
+    and envelope state across calls.
+    """
     from core.effects.ott import ott
-    return ott(audio_data, start, end, depth=kw.get("depth", 0.5), sr=sr)
+    return ott(audio_data, start, end, depth=kw.get("depth", 0.5), sr=sr,
+               state=kw.get("plugin_state"))
+
+_w_ott.param_curves = ("depth",)
 
 def _w_stutter(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Stutter."""
@@ -247,7 +278,9 @@ def _w_datamosh(audio_data, start, end, sr=44100, **kw):
     from core.effects.datamosh import datamosh
     return datamosh(audio_data, start, end,
                     intensity=kw.get("chaos", 0.5),
-                    block_size=kw.get("block_size", 512))
+                    block_size=kw.get("block_size", 512),
+                    mode=kw.get("mode", "swap"),
+                    seed=kw.get("seed"))
 
 def _w_wave_ondulee(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l'effet Wave Ondulée."""
@@ -277,6 +310,8 @@ def _w_digital_noise(audio_data, start, end, sr=44100, **kw):
                          noise_amount=kw.get("noise_amount", 0.3),
                          sample_hold=kw.get("sample_hold", 1))
 
+_w_digital_noise.param_curves = ("bit_reduction", "noise_amount")
+
 def _w_tape_glitch(audio_data, start, end, sr=44100, **kw):
     """Wrapper : applique l effet Tape Glitch."""
     from core.effects.tape_glitch import tape_glitch
@@ -297,51 +332,51 @@ SECTION_ORDER = [
 ]
 
 
+def _effect_dialog(name):
+    """Factory resolving a builtin dialog class from gui.effect_dialogs."""
+    def resolve():
+        from gui import effect_dialogs
+        return getattr(effect_dialogs, name)
+    return resolve
+
+
 def _define_plugins():
-    """Definit les 28 plugins builtin avec leurs wrappers et dialogues."""
-    from gui.effect_dialogs import (
-        ReverseDialog, VolumeDialog, FilterDialog, PanDialog,
-        PitchShiftDialog, TimeStretchDialog, TapeStopDialog,
-        SaturationDialog, DistortionDialog, BitcrusherDialog,
-        ChorusDialog, PhaserDialog, TremoloDialog, RingModDialog,
-        DelayDialog, VinylDialog, OTTDialog,
-        StutterDialog, GranularDialog, ShuffleDialog,
-        BufferFreezeDialog, DatamoshDialog,
-        WaveOnduleeDialog, RobotDialog, DigitalNoiseDialog,
-        TapeGlitchDialog,
-    )
+    """Definit les 28 plugins builtin avec leurs wrappers et dialogues.
 
+    Aucun module d'effet ni de dialogue n'est importe ici : les wrappers
+    importent leur effet a l'appel, les dialogues au premier acces.
+    """
     defs = [
-        ("reverse",       "R", "#0f3460", "Basics",          "reverse",       ReverseDialog,      _w_reverse),
-        ("volume",        "V", "#4cc9f0", "Basics",          "volume",        VolumeDialog,       _w_volume),
-        ("filter",        "F", "#264653", "Basics",          "filter",        FilterDialog,       _w_filter),
-        ("pan",           "P", "#2563eb", "Basics",          "pan",           PanDialog,          _w_pan),
-        ("pitch_shift",   "P", "#16c79a", "Pitch & Time",    "pitch_shift",   PitchShiftDialog,   _w_pitch_shift),
-        ("time_stretch",  "T", "#c74b50", "Pitch & Time",    "time_stretch",  TimeStretchDialog,  _w_time_stretch),
-        ("tape_stop",     "T", "#3d5a80", "Pitch & Time",    "tape_stop",     TapeStopDialog,     _w_tape_stop),
-        ("wave_ondulee",  "W", "#0ea5e9", "Pitch & Time",    "wave_ondulee",  WaveOnduleeDialog,  _w_wave_ondulee),
-        ("saturation",    "S", "#ff6b35", "Distortion",      "saturation",    SaturationDialog,   _w_saturation),
-        ("distortion",    "D", "#b5179e", "Distortion",      "distortion",    DistortionDialog,   _w_distortion),
-        ("bitcrusher",    "B", "#533483", "Distortion",      "bitcrusher",    BitcrusherDialog,   _w_bitcrusher),
-        ("chorus",        "C", "#2a6478", "Modulation",      "chorus",        ChorusDialog,       _w_chorus),
-        ("phaser",        "P", "#6d597a", "Modulation",      "phaser",        PhaserDialog,       _w_phaser),
-        ("tremolo",       "T", "#e07c24", "Modulation",      "tremolo",       TremoloDialog,      _w_tremolo),
-        ("ring_mod",      "R", "#6d597a", "Modulation",      "ring_mod",      RingModDialog,      _w_ring_mod),
-        ("delay",         "D", "#2a9d8f", "Space & Texture", "delay",         DelayDialog,        _w_delay),
-        ("vinyl",         "V", "#606c38", "Space & Texture", "vinyl",         VinylDialog,        _w_vinyl),
-        ("ott",           "O", "#e76f51", "Space & Texture", "ott",           OTTDialog,          _w_ott),
-        ("robot",         "R", "#4a00e0", "Space & Texture", "robot",         RobotDialog,        _w_robot),
-        ("digital_noise", "N", "#00c896", "Glitch",          "digital_noise", DigitalNoiseDialog, _w_digital_noise),
-        ("stutter",       "S", "#e94560", "Glitch",          "stutter",       StutterDialog,      _w_stutter),
-        ("granular",      "G", "#7b2d8e", "Glitch",          "granular",      GranularDialog,     _w_granular),
-        ("shuffle",       "S", "#bb3e03", "Glitch",          "shuffle",       ShuffleDialog,      _w_shuffle),
-        ("buffer_freeze", "B", "#457b9d", "Glitch",          "buffer_freeze", BufferFreezeDialog,  _w_buffer_freeze),
-        ("datamosh",      "D", "#9b2226", "Glitch",          "datamosh",      DatamoshDialog,     _w_datamosh),
-        ("tape_glitch",   "T", "#6b705c", "Glitch",          "tape_glitch",   TapeGlitchDialog,   _w_tape_glitch),
+        ("reverse",       "R", "#0f3460", "Basics",          "reverse",       "ReverseDialog",      _w_reverse),
+        ("volume",        "V", "#4cc9f0", "Basics",          "volume",        "VolumeDialog",       _w_volume),
+        ("filter",        "F", "#264653", "Basics",          "filter",        "FilterDialog",       _w_filter),
+        ("pan",           "P", "#2563eb", "Basics",          "pan",           "PanDialog",          _w_pan),
+        ("pitch_shift",   "P", "#16c79a", "Pitch & Time",    "pitch_shift",   "PitchShiftDialog",   _w_pitch_shift),
+        ("time_stretch",  "T", "#c74b50", "Pitch & Time",    "time_stretch",  "TimeStretchDialog",  _w_time_stretch),
+        ("tape_stop",     "T", "#3d5a80", "Pitch & Time",    "tape_stop",     "TapeStopDialog",     _w_tape_stop),
+        ("wave_ondulee",  "W", "#0ea5e9", "Pitch & Time",    "wave_ondulee",  "WaveOnduleeDialog",  _w_wave_ondulee),
+        ("saturation",    "S", "#ff6b35", "Distortion",      "saturation",    "SaturationDialog",   _w_saturation),
+        ("distortion",    "D", "#b5179e", "Distortion",      "distortion",    "DistortionDialog",   _w_distortion),
+        ("bitcrusher",    "B", "#533483", "Distortion",      "bitcrusher",    "BitcrusherDialog",   _w_bitcrusher),
+        ("chorus",        "C", "#2a6478", "Modulation",      "chorus",        "ChorusDialog",       _w_chorus),
+        ("phaser",        "P", "#6d597a", "Modulation",      "phaser",        "PhaserDialog",       _w_phaser),
+        ("tremolo",       "T", "#e07c24", "Modulation",      "tremolo",       "TremoloDialog",      _w_tremolo),
+        ("ring_mod",      "R", "#6d597a", "Modulation",      "ring_mod",      "RingModDialog",      _w_ring_mod),
+        ("delay",         "D", "#2a9d8f", "Space & Texture", "delay",         "DelayDialog",        _w_delay),
+        ("vinyl",         "V", "#606c38", "Space & Texture", "vinyl",         "VinylDialog",        _w_vinyl),
+        ("ott",           "O", "#e76f51", "Space & Texture", "ott",           "OTTDialog",          _w_ott),
+        ("robot",         "R", "#4a00e0", "Space & Texture", "robot",         "RobotDialog",        _w_robot),
+        ("digital_noise", "N", "#00c896", "Glitch",          "digital_noise", "DigitalNoiseDialog", _w_digital_noise),
+        ("stutter",       "S", "#e94560", "Glitch",          "stutter",       "StutterDialog",      _w_stutter),
+        ("granular",      "G", "#7b2d8e", "Glitch",          "granular",      "GranularDialog",     _w_granular),
+        ("shuffle",       "S", "#bb3e03", "Glitch",          "shuffle",       "ShuffleDialog",      _w_shuffle),
+        ("buffer_freeze", "B", "#457b9d", "Glitch",          "buffer_freeze", "BufferFreezeDialog",  _w_buffer_freeze),
+        ("datamosh",      "D", "#9b2226", "Glitch",          "datamosh",      "DatamoshDialog",     _w_datamosh),
+        ("tape_glitch",   "T", "#6b705c", "Glitch",          "tape_glitch",   "TapeGlitchDialog",   _w_tape_glitch),
     ]
     plugins = {}
     for eid, icon, color, section, name_key, dlg, fn in defs:
-        plugins[eid] = Plugin(eid, icon, color, section, name_key, dlg, fn)
+        plugins[eid] = Plugin(eid, icon, color, section, name_key, _effect_dialog(dlg), fn)
     return plugins
 
 
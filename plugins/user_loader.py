@@ -245,8 +245,30 @@ def _make_dialog_class(meta: dict, params: list):
 
 # ═══ Load all user plugins ═══
 
+def _lazy_module(pid: str, py_path: str):
+    """Return a loader executing the plugin module once, on first call."""
+    cache = []
+
+    def module():
+        """Charge le module du plugin (une seule fois)."""
+        if not cache:
+            spec = importlib.util.spec_from_file_location(f"user_plugin_{pid}", py_path)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            if not callable(getattr(mod, "process", None)):
+                raise ValueError(f"User plugin '{pid}' defines no process()")
+            cache.append(mod)
+        return cache[0]
+    return module
+
+
 def load_user_plugins() -> dict:
-    """Load all installed user plugins. Returns {id: Plugin}."""
+    """Load all installed user plugins. Returns {id: Plugin}.
+
+    Menus only need the registry entries (name, icon, color, section) and
+    the translation files; a plugin's module is executed the first time
+    its dialog is opened or its process() runs.
+    """
     from plugins.loader import Plugin
 
     registry = _load_registry()
@@ -263,16 +285,7 @@ def load_user_plugins() -> dict:
             continue
 
         try:
-            # Load module
-            spec = importlib.util.spec_from_file_location(f"user_plugin_{pid}", py_path)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-
-            meta = getattr(mod, "METADATA", {})
-            params = getattr(mod, "PARAMS", [])
-            process_fn = getattr(mod, "process", None)
-            if not process_fn:
-                continue
+            module = _lazy_module(pid, py_path)
 
             # Load translations
             lang_file = entry.get("lang_file")
@@ -286,25 +299,31 @@ def load_user_plugins() -> dict:
                         _log.debug("Non-critical: %s", _ex)
 
             # Create wrapper function
-            def _make_wrapper(fn):
+            def _make_wrapper(module):
                 """Crée une fonction wrapper pour un plugin utilisateur."""
                 def wrapper(audio_data, start, end, sr=44100, **kw):
                     """Fonction wrapper qui appelle process() du plugin utilisateur."""
-                    return fn(audio_data, start, end, sr=sr, **kw)
+                    return module().process(audio_data, start, end, sr=sr, **kw)
                 return wrapper
 
-            # Generate dialog class
-            dialog_cls = _make_dialog_class(meta, params)
+            # Dialog class generated from PARAMS on first use
+            def _make_dialog(module, entry):
+                """Crée la fabrique du dialogue d un plugin utilisateur."""
+                def dialog_cls():
+                    mod = module()
+                    meta = dict(entry, **getattr(mod, "METADATA", {}))
+                    return _make_dialog_class(meta, getattr(mod, "PARAMS", []))
+                return dialog_cls
 
             # Create Plugin
             plugin = Plugin(
                 eid=pid,
-                icon=meta.get("icon", "?"),
-                color=meta.get("color", "#888888"),
-                section=meta.get("section", "Custom"),
+                icon=entry.get("icon", "?"),
+                color=entry.get("color", "#888888"),
+                section=entry.get("section", "Custom"),
                 name_key=f"_user_.{pid}",  # special prefix for user plugins
-                dialog_class=dialog_cls,
-                process_fn=_make_wrapper(process_fn),
+                dialog_class=_make_dialog(module, entry),
+                process_fn=_make_wrapper(module),
             )
             plugins[pid] = plugin
 
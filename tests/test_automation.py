@@ -60,5 +60,104 @@ class TestAutomation(unittest.TestCase):
         
         pass
 
+    def test_interpolate_curve_vectorised(self):
+        """Array evaluation matches the old per-point loop, bends included."""
+        from core.automation import interpolate_curve
+        pts = [(0.0, 0.0), (0.3, 0.8), (0.3, 0.2), (1.0, 1.0)]
+        bends = [0.2, 0.0, -0.15]
+        xs = np.linspace(-0.1, 1.1, 257)
+        ys = interpolate_curve(pts, xs, bends)
+        self.assertEqual(ys.shape, xs.shape)
+        for x, y in zip(xs, ys):
+            self.assertAlmostEqual(_loop_curve(pts, float(x), bends), y)
+
+    def test_interpolate_curve_known_values(self):
+        from core.automation import interpolate_curve
+        # Endpoints, and flat outside [first x, last x]
+        pts = [(0.1, 0.2), (0.5, 1.0), (0.9, 0.6)]
+        ys = interpolate_curve(pts, np.array([0.0, 0.1, 0.9, 1.0]))
+        np.testing.assert_array_equal(ys, [0.2, 0.2, 0.6, 0.6])
+        # Linear midpoints
+        ys = interpolate_curve(pts, np.array([0.3, 0.7]))
+        np.testing.assert_allclose(ys, [0.6, 0.8])
+        # A bend shifts the segment midpoint by bend / 2, below 0.005 it is ignored
+        self.assertAlmostEqual(interpolate_curve(pts, 0.3, [0.2, 0.0]), 0.7)
+        self.assertAlmostEqual(interpolate_curve(pts, 0.3, [0.004, 0.0]), 0.6)
+        # Two points at the same x make a hold step: the left value up to
+        # and at the step, the right one just after it
+        step = [(0.0, 0.5), (0.5, 0.5), (0.5, 0.0), (1.0, 0.0)]
+        ys = interpolate_curve(step, np.array([0.25, 0.5, 0.5 + 1e-9, 0.75]))
+        np.testing.assert_allclose(ys, [0.5, 0.5, 0.0, 0.0], atol=1e-8)
+
+
+class TestCurveFastPath(unittest.TestCase):
+    """Effects flagged param_curves get whole-region arrays in one call."""
+
+    def test_constants_quantised_and_clamped(self):
+        calls = []
+
+        def process(audio, start, end, sr=44100, **kw):
+            calls.append(kw)
+            return audio[start:end]
+        process.param_curves = ("a",)
+        params = [{"key": "a", "mode": "automated", "default_val": 0, "target_val": 10,
+                   "step": 1, "pmin": 0, "pmax": 10},
+                  {"key": "b", "mode": "constant", "value": 3.7,
+                   "step": 1, "pmin": 0, "pmax": 3}]
+        apply_automation_multi(np.zeros((1000, 2), dtype=np.float32), 0, 1000,
+                               process, params, 44100)
+        kw, = calls
+        self.assertEqual(kw["b"], 3)
+        self.assertEqual(kw["a"].shape, (1000,))
+        np.testing.assert_array_equal(kw["a"], np.round(kw["a"]))
+
+    def test_non_curve_param_uses_chunks(self):
+        from plugins.loader import _w_digital_noise
+        audio = np.random.default_rng(0).uniform(-0.5, 0.5, (2000, 2)).astype(np.float32)
+        params = [{"key": "bit_reduction", "mode": "automated",
+                   "default_val": 0.0, "target_val": 1.0},
+                  {"key": "sample_hold", "mode": "automated", "default_val": 1,
+                   "target_val": 8, "step": 1, "pmin": 1, "pmax": 64},
+                  {"key": "noise_amount", "mode": "constant", "value": 0.0}]
+        with self.assertNoLogs("glitch.automation", "WARNING"):
+            out = apply_automation_multi(audio, 0, 2000, _w_digital_noise, params,
+                                         44100, chunk_size=500)
+        # The last chunk (sample_hold 6) repeats the first sample of each
+        # 6-sample block, past its micro fade-in
+        self.assertTrue(np.all(out[1566:1572] == out[1566]))
+        self.assertFalse(np.all(out[1566:1573] == out[1566]))
+
+    def test_noisy_cutoff_bounded_filter_calls(self):
+        from unittest import mock
+        from core.effects import filter as flt
+        n = 44100
+        cutoff = np.random.default_rng(0).uniform(200, 8000, n)
+        audio = np.zeros((n, 2), dtype=np.float32)
+        with mock.patch.object(flt, "sosfilt", wraps=flt.sosfilt) as sosfilt:
+            flt.filter_block(audio, "lowpass", cutoff, 1.0, 44100)
+        self.assertLessEqual(sosfilt.call_count, -(-n // flt._MIN_RUN))
+
+def _loop_curve(points, x, bends):
+    """Per-point evaluation the automation used before eval_curve (reference)."""
+    if x <= points[0][0]:
+        return points[0][1]
+    if x >= points[-1][0]:
+        return points[-1][1]
+    for i in range(len(points) - 1):
+        x0, y0 = points[i]
+        x1, y1 = points[i + 1]
+        if x0 <= x <= x1:
+            if x1 == x0:
+                return y0
+            t = (x - x0) / (x1 - x0)
+            b = bends[i] if bends and i < len(bends) else 0.0
+            if abs(b) < 0.005:
+                return y0 + t * (y1 - y0)
+            cy = (y0 + y1) / 2.0 + b
+            u = 1.0 - t
+            return u * u * y0 + 2.0 * u * t * cy + t * t * y1
+    return points[-1][1]
+
+
 if __name__ == '__main__':
     unittest.main()
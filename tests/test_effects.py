@@ -3,7 +3,7 @@ Unit tests for all Glitch Maker audio effects.
 
 Tests verify for each effect:
   1. Output is valid numpy array (no None)
-  2. Output dtype is float32 or float64
+  2. Output dtype is float32 (float32 in, float32 out)
   3. No NaN values in output
   4. No Inf values in output
   5. Output is clipped to [-1, 1] (or close)
@@ -58,10 +58,9 @@ class _EffectTestBase:
         self.assertIsNotNone(result, f"{name}: returned None")
         # 2. Is numpy array
         self.assertIsInstance(result, np.ndarray, f"{name}: not ndarray")
-        # 3. Valid dtype
-        self.assertTrue(
-            result.dtype in (np.float32, np.float64),
-            f"{name}: unexpected dtype {result.dtype}")
+        # 3. float32 in, float32 out
+        self.assertEqual(result.dtype, np.float32,
+                         f"{name}: unexpected dtype {result.dtype}")
         # 4. No NaN
         self.assertFalse(
             np.any(np.isnan(result)),
@@ -149,11 +148,42 @@ class TestCoreEffects(unittest.TestCase, _EffectTestBase):
         from core.effects.chorus import chorus
         r = chorus(self.signal, 0, self.n, sr=self.sr, depth_ms=5.0, rate_hz=1.0, mix=0.5)
         self.assert_valid_output(r, self.signal, "chorus")
+        # Block processing with state matches one pass
+        state, block = {}, 512
+        blocks = [chorus(self.signal[i:i + block], 0, block, sr=self.sr,
+                         state=state) for i in range(0, 20 * block, block)]
+        whole = chorus(self.signal[:20 * block], 0, 20 * block, sr=self.sr, state={})
+        self.assertTrue(np.allclose(np.concatenate(blocks), whole, atol=1e-6))
+
+    def test_wave_ondulee(self):
+        from core.effects import wave_ondulee as mod
+        r = mod.wave_ondulee(self.signal, 100, self.n - 100, sr=self.sr, pitch_depth=0.6)
+        self.assert_valid_output(r, self.signal, "wave_ondulee", allow_length_change=True)
+        self.assertGreater(len(r), self.n)
+        np.testing.assert_array_equal(r[:100], self.signal[:100])
+        np.testing.assert_array_equal(r[-100:], self.signal[-100:])
+        # Block size does not change the result (LFO phases run on)
+        block = mod._BLOCK
+        try:
+            mod._BLOCK = 1000
+            small = mod.wave_ondulee(self.signal, 100, self.n - 100, sr=self.sr, pitch_depth=0.6)
+        finally:
+            mod._BLOCK = block
+        np.testing.assert_allclose(small, r, atol=1e-5)
 
     def test_tremolo(self):
         from core.effects.tremolo import tremolo
         r = tremolo(self.signal, 0, self.n, sr=self.sr, rate_hz=5.0, depth=0.8)
         self.assert_valid_output(r, self.signal, "tremolo")
+        # Every shape stays within unity gain; LFO phase continues across blocks
+        for shape in ("sine", "square", "triangle", "saw"):
+            r = tremolo(self.signal, 0, self.n, sr=self.sr, rate_hz=3.0, shape=shape)
+            self.assertLessEqual(np.abs(r).max(), np.abs(self.signal).max() + 1e-6)
+        state, half = {}, self.n // 2
+        a = tremolo(self.signal[:half], 0, half, sr=self.sr, state=state)
+        b = tremolo(self.signal[half:], 0, self.n - half, sr=self.sr, state=state)
+        whole = tremolo(self.signal, 0, self.n, sr=self.sr)
+        self.assertTrue(np.allclose(np.concatenate([a, b]), whole, atol=1e-5))
 
     def test_phaser(self):
         from core.effects.phaser import phaser
@@ -170,6 +200,18 @@ class TestCoreEffects(unittest.TestCase, _EffectTestBase):
         r = resonant_filter(self.signal, 0, self.n, sr=self.sr,
                             cutoff=1000.0, resonance=1.0, filter_type="lowpass")
         self.assert_valid_output(r, self.signal, "filter")
+        # Per-sample cutoff trajectory + state carried across blocks
+        sweep = np.geomspace(200.0, 8000.0, self.n)
+        r = resonant_filter(self.signal, 0, self.n, sr=self.sr,
+                            cutoff=sweep, resonance=2.0)
+        self.assert_valid_output(r, self.signal, "filter_automated")
+        half = self.n // 2
+        a, zf = resonant_filter(self.signal[:half], 0, half, sr=self.sr,
+                                cutoff=1000.0, return_zf=True)
+        b, _ = resonant_filter(self.signal[half:], 0, self.n - half,
+                               sr=self.sr, cutoff=1000.0, zi=zf)
+        whole = resonant_filter(self.signal, 0, self.n, sr=self.sr, cutoff=1000.0)
+        self.assertTrue(np.allclose(np.concatenate([a, b]), whole, atol=1e-6))
 
     def test_pan(self):
         from core.effects.pan import pan_stereo
@@ -196,10 +238,36 @@ class TestCoreEffects(unittest.TestCase, _EffectTestBase):
         r = vinyl(self.signal, 0, self.n, sr=self.sr, noise=0.3, crackle=0.5)
         self.assert_valid_output(r, self.signal, "vinyl")
 
+    def test_tape_glitch(self):
+        from core.effects.tape_glitch import tape_glitch
+        r = tape_glitch(self.signal, 0, self.n, sr=self.sr, glitch_rate=1.0)
+        self.assert_valid_output(r, self.signal, "tape_glitch")
+        np.testing.assert_array_equal(
+            r, tape_glitch(self.signal, 0, self.n, sr=self.sr, glitch_rate=1.0))
+        # Dropouts alone: faded dips to silence, untouched elsewhere
+        flat = np.full((self.sr * 2, 2), 0.5, dtype=np.float32)
+        r = tape_glitch(flat, 0, len(flat), sr=self.sr, glitch_rate=0.0,
+                        dropout_chance=1.0, wow=0.0, flutter=0.0, noise=0.0)
+        gain = r[64:-64, 0] / 0.5
+        self.assertTrue(np.any(gain == 0.0))
+        self.assertTrue(np.all((gain >= 0.0) & (gain <= 1.0)))
+        np.testing.assert_array_equal(r[:, 0], r[:, 1])
+
     def test_tape_stop(self):
         from core.effects.tape_stop import tape_stop
         r = tape_stop(self.signal, 0, self.n, sr=self.sr, duration_pct=0.5)
         self.assert_valid_output(r, self.signal, "tape_stop", allow_length_change=True)
+        half = self.n - self.n // 2
+        np.testing.assert_array_equal(r[:half], self.signal[:half])
+        for kw in ({"curve": "exponential"}, {"mode": "start"},
+                   {"curve": "custom", "points": [(0, 1), (0.5, 0.7), (1, 0)],
+                    "bends": [0.2, 0.0]}):
+            r = tape_stop(self.signal, 0, self.n, sr=self.sr, duration_pct=0.5, **kw)
+            self.assert_valid_output(r, self.signal, f"tape_stop {kw}")
+        # Spin-up lands back in sync with the untouched audio
+        r = tape_stop(self.signal, 0, self.n, sr=self.sr, duration_pct=0.5, mode="start")
+        ramp = int(self.n * 0.5)
+        np.testing.assert_array_equal(r[ramp:], self.signal[ramp:])
 
     def test_buffer_freeze(self):
         from core.effects.buffer_freeze import buffer_freeze
@@ -210,6 +278,40 @@ class TestCoreEffects(unittest.TestCase, _EffectTestBase):
         from core.effects.datamosh import datamosh
         r = datamosh(self.signal, 0, self.n, intensity=0.5)
         self.assert_valid_output(r, self.signal, "datamosh")
+        for mode in ("swap", "repeat", "zero", "noise"):
+            r = datamosh(self.signal, 0, self.n, intensity=0.5, block_size=256,
+                         mode=mode, seed=7)
+            self.assert_valid_output(r, self.signal, f"datamosh {mode}")
+            np.testing.assert_array_equal(
+                r, datamosh(self.signal, 0, self.n, intensity=0.5, block_size=256,
+                            mode=mode, seed=7))
+        # Swap only reorders whole blocks
+        n = self.n // 256 * 256
+        r = datamosh(self.signal, 0, n, block_size=256, mode="swap", seed=3)
+        blocks = lambda a: sorted(map(bytes, a[:n].reshape(-1, 256 * 2)))
+        self.assertEqual(blocks(r), blocks(self.signal))
+
+    def test_datamosh_short_last_block(self):
+        from core.effects.datamosh import datamosh
+        # [100, 712) = 2 blocks of 256 + a short block of 100
+        end = 712
+        for mode in ("swap", "repeat", "zero", "noise"):
+            hits = 0
+            for seed in range(8):
+                r = datamosh(self.signal, 100, end, intensity=1.0, block_size=256,
+                             mode=mode, seed=seed)
+                np.testing.assert_array_equal(r[:100], self.signal[:100])
+                np.testing.assert_array_equal(r[end:], self.signal[end:])
+                hits += not np.array_equal(r[612:end], self.signal[612:end])
+            self.assertGreater(hits, 0, f"{mode}: short block never touched")
+        # Swapped with a full block (seed 0: block 1), the short one
+        # trades its length only
+        x = self.signal
+        r = datamosh(x, 0, 612, block_size=256, mode="swap", seed=0)
+        np.testing.assert_array_equal(r[512:612], x[256:356])
+        np.testing.assert_array_equal(r[256:356], x[512:612])
+        np.testing.assert_array_equal(r[:256], x[:256])
+        np.testing.assert_array_equal(r[356:512], x[356:512])
 
     def test_granular(self):
         from core.effects.granular import granular
@@ -230,6 +332,49 @@ class TestCoreEffects(unittest.TestCase, _EffectTestBase):
         from core.effects.ott import ott
         r = ott(self.signal, 0, self.n, sr=self.sr, depth=0.5)
         self.assert_valid_output(r, self.signal, "ott")
+        # Stereo image is kept (no mono downmix)
+        self.assertFalse(np.allclose(r[:, 0], r[:, 1]))
+        # Quiet passages are lifted, loud ones pulled down
+        t = np.arange(self.sr) / self.sr
+        tone = np.sin(2 * np.pi * 1000 * t).astype(np.float32)
+        tone[: self.sr // 2] *= 0.01
+        tone[self.sr // 2:] *= 0.5
+        r = ott(tone, 0, len(tone), sr=self.sr, depth=1.0)
+        quiet, loud = slice(self.sr // 4, self.sr // 2), slice(-self.sr // 4, None)
+        self.assertGreater(np.abs(r[quiet]).max(), np.abs(tone[quiet]).max())
+        self.assertLess(np.abs(r[loud]).max(), np.abs(tone[loud]).max())
+
+    def test_robot(self):
+        from core.effects.robot import robot
+        r = robot(self.noise, 0, self.n, sr=self.sr, grain_ms=3,
+                  monotone=0.5, metallic=0.4)
+        self.assert_valid_output(r, self.noise, "robot")
+
+    def test_digital_noise(self):
+        from core.effects.digital_noise import digital_noise
+        r = digital_noise(self.signal, 0, self.n, sr=self.sr,
+                          bit_reduction=0.5, noise_amount=0.3, sample_hold=8)
+        self.assert_valid_output(r, self.signal, "digital_noise")
+        self.assertEqual(r.dtype, np.float32)
+        # Sample-and-hold: every hold block is flat (noise off, no crush)
+        r = digital_noise(self.signal, 0, self.n, sr=self.sr,
+                          bit_reduction=0.0, noise_amount=0.0, sample_hold=8)
+        blocks = r[64:64 + 8 * 100].reshape(100, 8, 2)
+        self.assertTrue(np.allclose(blocks, blocks[:, :1]))
+        # The final partial block is held as well: the last 3 samples of
+        # [1000, 1203) read sample 1200 (the old loop left them as is)
+        from core.effects.utils import apply_micro_fade
+        x = np.repeat(np.linspace(-0.5, 0.5, 2000, dtype=np.float32)[:, None], 2, axis=1)
+        r = digital_noise(x, 1000, 1203, sr=self.sr, bit_reduction=0.0,
+                          noise_amount=0.0, sample_hold=8)
+        held = x[1000 + np.arange(203) // 8 * 8]
+        self.assertTrue(np.all(held[200:] == x[1200]))
+        np.testing.assert_allclose(r[1000:1203], apply_micro_fade(held, 64), atol=1e-7)
+        # Per-sample automation arrays
+        ramp = np.linspace(0.0, 1.0, self.n, dtype=np.float32)
+        r = digital_noise(self.signal, 0, self.n, sr=self.sr,
+                          bit_reduction=ramp, noise_amount=ramp)
+        self.assert_valid_output(r, self.signal, "digital_noise_automated")
 
 
 @unittest.skipUnless(HAS_QT, "PyQt6 not available — skipping plugin tests")
@@ -387,6 +532,217 @@ class TestEdgeCases(unittest.TestCase, _EffectTestBase):
             self.assert_valid_output(r, loud, name, max_amplitude=1.5)
 
 
+def _delay_loop(audio, start, end, delay_ms, feedback, mix, sr):
+    """Per-echo loop the delay used before the comb filter (reference)."""
+    segment = audio[start:end].copy()
+    seg_len = len(segment)
+    d = max(1, int(delay_ms * sr / 1000.0))
+    feedback = max(0.0, min(0.95, feedback))
+    n_echoes = min(int(np.log(0.01) / np.log(max(feedback, 0.01))) + 1, 30)
+    echo_buf = np.zeros((seg_len + n_echoes * d, 2), dtype=np.float32)
+    echo_buf[:seg_len] = segment
+    for i in range(1, n_echoes + 1):
+        gain = feedback ** i
+        echo_end = min(i * d + seg_len, len(echo_buf))
+        if gain < 0.01 or echo_end <= i * d:
+            break
+        echo_buf[i * d:echo_end] += segment[:echo_end - i * d] * gain
+    dry_buf = np.zeros_like(echo_buf)
+    dry_buf[:seg_len] = segment
+    wet = dry_buf * (1.0 - mix) + echo_buf * mix
+    loud = np.where(np.max(np.abs(wet), axis=1) > 0.001)[0]
+    if len(loud) > 0:
+        wet = wet[:min(loud[-1] + sr // 4, len(wet))]
+    tail = wet[seg_len:]
+    result = np.zeros((max(len(audio), end + len(tail)), 2), dtype=np.float32)
+    result[:len(audio)] = audio
+    result[start:end] = wet[:seg_len]
+    result[end:end + len(tail)] += tail
+    return np.clip(result, -1.0, 1.0)
+
+
+class TestDelayEchoTrain(unittest.TestCase):
+    """The comb-filter delay against the per-echo loop it replaced."""
+
+    def setUp(self):
+        self.sr = 8000
+        self.x = _make_noise(self.sr, 3.0, 2) * 0.5
+
+    def test_matches_per_echo_loop(self):
+        from core.effects.delay import delay
+        x, n = self.x, len(self.x)
+        cases = {
+            # tail mixed over the following audio, trimmed before its end
+            "over": (4000, 8000, 150, 0.5, 0.5),
+            # long feedback tail
+            "long": (1000, 3000, 90, 0.9, 0.7),
+            # selection at the end: the tail extends the file
+            "extend": (n - 3000, n, 200, 0.6, 0.5),
+            # short selection, delay longer than the selection
+            "short": (n - 100, n, 300, 0.4, 1.0),
+        }
+        for name, (s, e, ms, fb, mix) in cases.items():
+            with self.subTest(case=name):
+                r = delay(x, s, e, delay_ms=ms, feedback=fb, mix=mix, sr=self.sr)
+                ref = _delay_loop(x, s, e, ms, fb, mix, self.sr)
+                self.assertEqual(r.shape, ref.shape)
+                np.testing.assert_allclose(r, ref, atol=1e-5)
+        self.assertGreater(len(delay(x, n - 3000, n, delay_ms=200, sr=self.sr)), n)
+
+    def test_silent_selection_adds_no_tail(self):
+        from core.effects.delay import delay
+        x = self.x.copy()
+        n = len(x)
+        x[n - 500:] = 0
+        r = delay(x, n - 500, n, delay_ms=50, feedback=0.5, sr=self.sr)
+        np.testing.assert_array_equal(r, x)
+
+
+def _granular_loop(segment, grain_samples, order):
+    """Grain rendering of the granular effect before vectorisation (reference)."""
+    from core.effects.utils import apply_micro_fade
+    n_grains = max(1, len(segment) // grain_samples)
+    grains = []
+    for i in range(n_grains):
+        g = segment[i * grain_samples:min((i + 1) * grain_samples, len(segment))]
+        grains.append(apply_micro_fade(g, fade_samples=min(32, len(g) // 4)))
+    output = np.concatenate([grains[i] for i in order], axis=0)[:len(segment)]
+    pad = np.zeros((len(segment) - len(output),) + segment.shape[1:], dtype=np.float32)
+    return np.concatenate([output, pad], axis=0)
+
+
+class TestGranular(unittest.TestCase):
+    """Seeded granular: region, length and the grain render of the old loop."""
+
+    def setUp(self):
+        self.sr = 8000
+        self.x = _make_noise(self.sr, 2.0, 2)
+
+    def test_matches_grain_loop(self):
+        from core.effects.granular import granular, _grain_schedule
+        x, start, end = self.x, 1000, 13500
+        grain = 400                                   # 50 ms at 8 kHz
+        n_grains = (end - start) // grain
+        for density, randomize in ((1.0, 0.5), (1.6, 0.9), (2.0, 0.0)):
+            with self.subTest(density=density, randomize=randomize):
+                r = granular(x, start, end, grain_size_ms=50, density=density,
+                             randomize=randomize, sr=self.sr, seed=7)
+                self.assertEqual((r.shape, r.dtype), (x.shape, np.float32))
+                # Only the region is rewritten
+                np.testing.assert_array_equal(r[:start], x[:start])
+                np.testing.assert_array_equal(r[end:], x[end:])
+                order = _grain_schedule(n_grains, density, randomize,
+                                        np.random.default_rng(7))
+                np.testing.assert_allclose(
+                    r[start:end], _granular_loop(x[start:end], grain, order), atol=1e-7)
+                # Same seed, same result
+                np.testing.assert_array_equal(
+                    r, granular(x, start, end, grain_size_ms=50, density=density,
+                                randomize=randomize, sr=self.sr, seed=7))
+
+    def test_region_shorter_than_a_grain(self):
+        from core.effects.granular import granular
+        r = granular(self.x, 100, 300, grain_size_ms=50, sr=self.sr, seed=1)
+        np.testing.assert_allclose(r[100:300], _granular_loop(self.x[100:300], 400, [0]))
+        np.testing.assert_array_equal(r[300:], self.x[300:])
+
+
+class TestDtypePolicy(unittest.TestCase):
+    """float32 in → float32 out, with a peak-memory ceiling per effect.
+
+    Ceilings are peak traced allocations as a multiple of the input size
+    (2 s stereo float32, 16384 frames for the phaser whose recursion runs
+    per sample).  Each sits less than 2x above the measured peak: one
+    float64 copy of the region costs 2x, so it fails the test.
+    """
+
+    CEILINGS = {
+        "reverse": 3, "volume": 4, "filter": 8, "pan": 3, "saturation": 6,
+        "distortion": 6, "bitcrusher": 5, "chorus": 7, "phaser": 5,
+        "tremolo": 4, "ring_mod": 4, "delay": 6, "vinyl": 8, "ott": 9,
+        "robot": 8, "digital_noise": 7, "granular": 4, "tape_glitch": 9,
+        "wave_ondulee": 6, "tape_stop": 6, "stutter": 12, "shuffle": 4,
+        "buffer_freeze": 4,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sr = 44100
+        cls.signal = _make_noise(cls.sr, 2.0, 2)
+        cls.n = len(cls.signal)
+
+    def _effects(self):
+        from core.effects.reverse import reverse
+        from core.effects.volume import volume
+        from core.effects.filter import resonant_filter
+        from core.effects.pan import pan_stereo
+        from core.effects.saturation import saturate
+        from core.effects.distortion import distortion
+        from core.effects.bitcrusher import bitcrush
+        from core.effects.chorus import chorus
+        from core.effects.phaser import phaser
+        from core.effects.tremolo import tremolo
+        from core.effects.ring_mod import ring_mod
+        from core.effects.delay import delay
+        from core.effects.vinyl import vinyl
+        from core.effects.ott import ott
+        from core.effects.robot import robot
+        from core.effects.digital_noise import digital_noise
+        from core.effects.granular import granular
+        from core.effects.tape_glitch import tape_glitch
+        from core.effects.wave_ondulee import wave_ondulee
+        from core.effects.tape_stop import tape_stop
+        from core.effects.stutter import stutter
+        from core.effects.shuffle import shuffle
+        from core.effects.buffer_freeze import buffer_freeze
+        x, n, sr = self.signal, self.n, self.sr
+        short = 16384  # phaser runs a per-sample recursion
+        return {
+            "reverse": lambda: reverse(x, 0, n),
+            "volume": lambda: volume(x, 0, n, gain_pct=80),
+            "filter": lambda: resonant_filter(x, 0, n, sr=sr),
+            "pan": lambda: pan_stereo(x, 0, n, pan=0.3),
+            "saturation": lambda: saturate(x, 0, n, mode="overdrive", tone=0.2),
+            "distortion": lambda: distortion(x, 0, n, drive=5.0, tone=0.5),
+            "bitcrusher": lambda: bitcrush(x, 0, n, bit_depth=8, downsample=4),
+            "chorus": lambda: chorus(x, 0, n, sr=sr),
+            "phaser": lambda: phaser(x[:short], 0, short, sr=sr),
+            "tremolo": lambda: tremolo(x, 0, n, sr=sr),
+            "ring_mod": lambda: ring_mod(x, 0, n, sr=sr),
+            "delay": lambda: delay(x, 0, n, sr=sr),
+            "vinyl": lambda: vinyl(x, 0, n, sr=sr),
+            "ott": lambda: ott(x, 0, n, sr=sr),
+            "robot": lambda: robot(x, 0, n, sr=sr, monotone=0.5),
+            "digital_noise": lambda: digital_noise(x, 0, n, sr=sr),
+            "granular": lambda: granular(x, 0, n, sr=sr),
+            "tape_glitch": lambda: tape_glitch(x, 0, n, sr=sr),
+            "wave_ondulee": lambda: wave_ondulee(x, 0, n, sr=sr),
+            "tape_stop": lambda: tape_stop(x, 0, n, sr=sr),
+            "stutter": lambda: stutter(x, 0, n, repeats=4, decay=0.2),  # 4x output
+            "shuffle": lambda: shuffle(x, 0, n, slices=16),
+            "buffer_freeze": lambda: buffer_freeze(x, 0, n, grain_ms=20, sr=sr),
+        }
+
+    def test_float32_and_peak_memory(self):
+        import tracemalloc
+        for name, run in self._effects().items():
+            with self.subTest(effect=name):
+                size = self.signal.nbytes
+                if name == "phaser":
+                    size = self.signal[:16384].nbytes
+                else:
+                    run()  # warm caches (filter designs, windows)
+                tracemalloc.start()
+                try:
+                    r = run()
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                self.assertEqual(r.dtype, np.float32, f"{name}: dtype {r.dtype}")
+                self.assertLessEqual(peak / size, self.CEILINGS[name],
+                                     f"{name}: peak memory {peak / size:.1f}x input")
+
+
 class TestUtils(unittest.TestCase):
     """Test core/effects/utils.py helper functions."""
 
@@ -411,6 +767,22 @@ class TestUtils(unittest.TestCase):
         self.assertAlmostEqual(np.max(np.abs(r)), 0.95, places=2)
 
 
+    def test_slice_map_matches_micro_fade(self):
+        from core.effects.index_map import render, slice_map
+        from core.effects.utils import apply_micro_fade
+        audio = _make_noise(duration=0.1)
+        parts = [(100, 300, False), (2000, 64, True), (0, 5, False), (50, 1000, True)]
+        index, gain = slice_map([p[0] for p in parts], [p[1] for p in parts],
+                                reverse=[p[2] for p in parts], fade=32)
+        expected = np.concatenate([
+            apply_micro_fade(audio[s:s + n][::-1] if rev else audio[s:s + n],
+                             fade_samples=min(32, n // 4))
+            for s, n, rev in parts])
+        out = np.empty_like(expected)
+        render(audio, index, gain, out=out)
+        np.testing.assert_allclose(out, expected, atol=1e-6)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
 
@@ -0,0 +1,178 @@
+"""Tests for core/audio_engine.py — streaming export and the FFmpeg cache."""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.audio_engine as engine
+
+
+def _tone(n, sr=44100):
+    t = np.arange(n) / sr
+    mono = (0.8 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    return np.column_stack([mono, -mono])
+
+
+_MP3_KBPS = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+
+
+def _frame_bitrates(mp3, sr=44100):
+    """Bitrates (kbps) of the MPEG-1 layer III frames in *mp3*."""
+    rates, i = set(), 0
+    while i < len(mp3) - 4:
+        idx = mp3[i + 2] >> 4
+        if mp3[i] == 0xFF and mp3[i + 1] & 0xE0 == 0xE0 and 0 < idx < 15:
+            rates.add(_MP3_KBPS[idx])
+            i += 144000 * _MP3_KBPS[idx] // sr + ((mp3[i + 2] >> 1) & 1)
+        else:
+            i += 1
+    return rates
+
+
+class TestStreamingExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_blocks_match_whole_buffer_conversion(self):
+        data = _tone(1000) * 1.5        # clipped
+        blocks = [b.copy() for _, b in engine._pcm16_blocks(data, block=300)]
+        expected = np.rint(np.clip(data, -1.0, 1.0) * 32767).astype(np.int16)
+        np.testing.assert_array_equal(np.concatenate(blocks), expected)
+
+    def test_wav_and_flac_written_block_by_block(self):
+        data = _tone(5000)
+        for fmt in ("wav", "flac"):
+            fp = os.path.join(self.tmp.name, f"out.{fmt}")
+            seen = []
+            with mock.patch.object(engine, "_EXPORT_BLOCK", 1024):
+                engine.export_audio(data, 44100, fp, fmt, progress=seen.append)
+            out, sr = sf.read(fp, dtype="float32")
+            self.assertEqual((out.shape, sr), (data.shape, 44100))
+            np.testing.assert_allclose(out, data, atol=1e-4)
+            self.assertEqual(len(seen), 5)
+            self.assertEqual(seen, sorted(seen))
+            self.assertEqual(seen[-1], 1.0)
+
+    def test_tpdf_dither_is_unbiased(self):
+        # A constant between two codes: rounding always gives the nearest,
+        # dither averages out to the true value
+        _, pcm = next(engine._pcm16_blocks(np.full((4, 2), 100.6 / 32767)))
+        self.assertEqual(pcm.tolist(), [[101, 101]] * 4)
+        data = np.full((1 << 15, 2), 100.3 / 32767, dtype=np.float32)
+        rng = np.random.default_rng(0)
+        _, pcm = next(engine._pcm16_blocks(data, dither=True, rng=rng))
+        self.assertLessEqual(np.abs(pcm.astype(np.int32) - 100).max(), 2)
+        self.assertAlmostEqual(pcm.mean(), 100.3, delta=0.05)
+
+    @unittest.skipUnless(importlib.util.find_spec("lameenc"), "lameenc not installed")
+    def test_lameenc_vbr_and_cbr(self):
+        data = _tone(44100 * 2)
+        data[:44100] = 0                # silence, then a tone: VBR varies
+        rates = {}
+        for mode in ("cbr", "vbr"):
+            fp = os.path.join(self.tmp.name, f"{mode}.mp3")
+            engine._export_mp3_lameenc(data, 44100, fp,
+                                       profile={"mp3_mode": mode, "mp3_bitrate": 192})
+            with open(fp, "rb") as f:
+                rates[mode] = _frame_bitrates(f.read())
+        self.assertEqual(rates["cbr"], {192})
+        self.assertGreater(len(rates["vbr"]), 1)
+
+    def test_high_resolution_profiles(self):
+        data = _tone(3000)
+        for subtype, atol in (("PCM_24", 1e-6), ("FLOAT", 0)):
+            fp = os.path.join(self.tmp.name, f"{subtype}.wav")
+            engine.export_audio(data, 44100, fp, "wav", profile={"wav_subtype": subtype})
+            self.assertEqual(sf.info(fp).subtype, subtype)
+            np.testing.assert_allclose(sf.read(fp, dtype="float32")[0], data, atol=atol)
+        fp = os.path.join(self.tmp.name, "fast.flac")
+        engine.export_audio(data, 44100, fp, "flac", profile={"flac_level": 0})
+        self.assertEqual(sf.info(fp).frames, 3000)
+
+    def test_stems_in_parallel(self):
+        jobs = [(_tone(2000 * (i + 1)), 44100, os.path.join(self.tmp.name, f"s{i}.wav"))
+                for i in range(3)]
+        seen = []
+        paths = engine.export_stems(jobs, "wav", workers=2, progress=seen.append)
+        self.assertEqual(paths, [fp for _, _, fp in jobs])
+        for data, _, fp in jobs:
+            self.assertEqual(sf.info(fp).frames, len(data))
+        self.assertEqual(seen[-1], 1.0)
+
+
+_FAKE_FFMPEG = """#!/bin/sh
+echo probed >> "$0.log"
+case "$2" in
+  -version) echo "ffmpeg version 6.1-test Copyright" ;;
+  -encoders) printf 'Encoders:\\n ------\\n A....D libmp3lame  MP3\\n A....D pcm_s16le  PCM\\n' ;;
+esac
+"""
+
+
+@unittest.skipIf(os.name == "nt", "shell script stand-in for ffmpeg")
+class TestFFmpegCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ffmpeg = os.path.join(tmp.name, "ffmpeg")
+        with open(self.ffmpeg, "w") as f:
+            f.write(_FAKE_FFMPEG)
+        os.chmod(self.ffmpeg, 0o755)
+        for patch in (mock.patch.object(engine, "_FFMPEG_CAPS_FILE",
+                                        os.path.join(tmp.name, "caps.json")),
+                      mock.patch.dict(os.environ),
+                      mock.patch.object(engine, "_load_ffmpeg_from_settings",
+                                        return_value=None)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.environ.pop(engine._FFMPEG_ENV, None)
+        self._fresh_process()
+        self.addCleanup(self._fresh_process)
+
+    def _fresh_process(self):
+        engine._ffmpeg_cache, engine._ffmpeg_searched, engine._ffmpeg_caps = None, False, None
+
+    def _probes(self):
+        log = self.ffmpeg + ".log"
+        return len(open(log).readlines()) if os.path.exists(log) else 0
+
+    def test_search_and_probe_happen_once_per_machine(self):
+        with mock.patch.object(engine, "_search_ffmpeg", return_value=self.ffmpeg):
+            info = engine.ffmpeg_info()
+        self.assertEqual((info["version"], info["path"]), ("6.1-test", self.ffmpeg))
+        self.assertTrue(engine.ffmpeg_has_encoder("libmp3lame"))
+        self.assertFalse(engine.ffmpeg_has_encoder("libvorbis"))
+        self.assertEqual(self._probes(), 2)
+        # Another process: no search, no probe
+        self._fresh_process()
+        os.environ.pop(engine._FFMPEG_ENV)
+        with mock.patch.object(engine, "_search_ffmpeg", side_effect=AssertionError):
+            self.assertEqual(engine.ffmpeg_info()["encoders"], ["libmp3lame", "pcm_s16le"])
+        self.assertEqual(self._probes(), 2)
+
+    def test_replaced_binary_invalidates_the_cache(self):
+        with mock.patch.object(engine, "_search_ffmpeg", return_value=self.ffmpeg):
+            engine.ffmpeg_info()
+        with open(self.ffmpeg, "a") as f:
+            f.write("# new build\n")
+        self._fresh_process()
+        os.environ.pop(engine._FFMPEG_ENV)
+        with mock.patch.object(engine, "_search_ffmpeg", return_value=self.ffmpeg) as search:
+            engine.ffmpeg_info()
+        search.assert_called_once()
+        self.assertEqual(self._probes(), 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
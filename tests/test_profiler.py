@@ -0,0 +1,71 @@
+"""Tests for utils/profiler.py — spans, counters and Chrome trace export."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import profiler
+from core.timeline import Timeline
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        was = profiler._enabled
+        self.addCleanup(profiler.reset)
+        self.addCleanup(profiler.set_enabled, bool(was))
+        profiler.reset()
+
+    def test_disabled_records_nothing(self):
+        profiler.set_enabled(False)
+        with profiler.span("idle") as sp:
+            pass
+        profiler.count("hits")
+        self.assertIsNone(sp)
+        self.assertEqual((profiler.events(), profiler.counters()), ([], {}))
+
+    def test_span_measures_time_and_memory(self):
+        profiler.set_enabled(True)
+        with profiler.span("alloc", "op", uid="a1") as sp:
+            buf = np.ones(1 << 20, dtype=np.float32)      # 4 MiB kept alive
+        self.assertGreater(sp.ms, 0)
+        self.assertGreaterEqual(sp.mem, buf.nbytes)
+        ev, = profiler.events()
+        self.assertEqual((ev["name"], ev["cat"], ev["ph"]), ("alloc", "op", "X"))
+        self.assertEqual(ev["args"]["uid"], "a1")
+
+    def test_chrome_trace_of_a_render(self):
+        profiler.set_enabled(True)
+        tl = Timeline()
+        tl.add_clip(np.zeros((1000, 2), dtype=np.float32), 44100)
+        tl.render()
+
+        @profiler.profiled("failing")
+        def failing():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            failing()
+        with tempfile.TemporaryDirectory() as tmp:
+            fp = os.path.join(tmp, "trace.json")
+            n = profiler.export_chrome_trace(fp)
+            with open(fp, encoding="utf-8") as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(n, len([e for e in events if e["ph"] != "M"]))
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        self.assertEqual(spans["timeline.render"]["args"]["clips"], 1)
+        self.assertEqual(spans["failing"]["args"]["error"], "ValueError")
+        self.assertEqual(trace["otherData"]["counters"]["timeline.rendered_samples"], 1000)
+        for e in events:
+            self.assertIn("pid", e)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
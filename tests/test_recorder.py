@@ -0,0 +1,90 @@
+"""Tests for core/recorder.py — ring buffer and streamed takes."""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.recorder import RingBuffer, TakeRecorder
+from core.resample import StreamingResampler, resample_audio
+
+
+def _noise(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (0.1 * rng.standard_normal((n, 2))).astype(np.float32)
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_wraps_and_counts_overruns(self):
+        ring = RingBuffer(100)
+        x = _noise(250)
+        out = np.zeros((100, 2), dtype=np.float32)
+        self.assertEqual(ring.write(x[:70]), 70)
+        self.assertEqual(ring.read_into(out[:50]), 50)
+        self.assertEqual(ring.write(x[70:170]), 80)     # 20 dropped
+        self.assertEqual(ring.overruns, 20)
+        n = ring.read_into(out)
+        np.testing.assert_array_equal(out[:n], x[50:150])
+        self.assertAlmostEqual(ring.peak(30), float(np.abs(x[120:150]).max()))
+
+
+class TestStreamingResampler(unittest.TestCase):
+
+    def test_blocks_match_one_shot(self):
+        x = _noise(20000)
+        rng = np.random.default_rng(1)
+        for src, dst in ((48000, 44100), (44100, 48000), (44100, 22050)):
+            rs = StreamingResampler(src, dst)
+            cuts = np.sort(rng.integers(0, len(x), 12))
+            out = [rs.process(b) for b in np.split(x, cuts)] + [rs.flush()]
+            np.testing.assert_allclose(np.concatenate(out), resample_audio(x, src, dst),
+                                       atol=1e-6)
+
+
+class TestTakeRecorder(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = tmp.name
+
+    def _record(self, rec, x, block=512):
+        """Feed *x* from another thread, like the audio callback."""
+        rec.start()
+
+        def callback():
+            for i in range(0, len(x), block):
+                rec.write(x[i:i + block])
+        th = threading.Thread(target=callback)
+        th.start()
+        th.join()
+        return rec.stop()
+
+    def test_take_converted_while_recording(self):
+        x = _noise(48000)
+        rec = TakeRecorder(48000, target_sr=44100, folder=self.folder, poll=0.001)
+        data, sr, original, original_sr = self._record(rec, x)
+        self.assertEqual((sr, original_sr, rec.ring.overruns), (44100, 48000, 0))
+        np.testing.assert_array_equal(original, x)
+        np.testing.assert_allclose(data, resample_audio(x, 48000, 44100), atol=1e-6)
+        self.assertEqual(len(os.listdir(self.folder)), 2)
+        rec.discard()
+        self.assertEqual(os.listdir(self.folder), [])
+
+    def test_same_rate_flac_take(self):
+        x = _noise(10000)
+        rec = TakeRecorder(44100, target_sr=44100, folder=self.folder, fmt="FLAC")
+        data, sr, original, _ = self._record(rec, x)
+        self.assertIsNone(original)
+        self.assertEqual(sr, 44100)
+        np.testing.assert_allclose(data, x, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,129 @@
+"""Tests for cold start — import-time budget and lazy plugin loading."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# What main_window pulls in at launch, minus the modules that need a
+# PortAudio library (core.playback, gui.dialogs, gui.settings_dialog)
+_STARTUP = """
+import sys, json
+import PyQt6.QtWidgets
+import core.audio_engine, core.timeline, core.project, core.preset_manager
+import core.automation, core.effects.utils
+import gui.waveform_widget, gui.timeline_widget, gui.effects_panel
+import gui.transport_bar, gui.catalog_dialog, gui.preset_dialog
+import gui.spectrum_widget, gui.minimap_widget, gui.effect_history
+import gui.progress_overlay, gui.automation_window
+from plugins.loader import load_plugins
+load_plugins()
+print(json.dumps(sorted(sys.modules)))
+"""
+
+# Only imported when an effect runs, a dialog opens or a file is loaded
+_DEFERRED = ("scipy", "librosa", "pydub", "soundfile", "gui.effect_dialogs")
+_EFFECT_MODULES_ALLOWED = {"core.effects", "core.effects.utils"}
+
+# Cumulative import time of the startup modules, in seconds. scipy.signal
+# alone used to take longer than this.
+_BUDGET = 0.75
+
+
+def _cold_start():
+    """Run the startup imports in a fresh interpreter.
+    Returns (imported module names, total import time in seconds)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _STARTUP],
+                          cwd=ROOT, capture_output=True, text=True, timeout=120,
+                          env=dict(os.environ, QT_QPA_PLATFORM="offscreen"))
+    if proc.returncode:
+        raise AssertionError(proc.stderr[-2000:])
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level entries only: nested ones are part of their parent
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            total += int(cumulative)
+    return json.loads(proc.stdout.splitlines()[-1]), total / 1e6
+
+
+class TestColdStart(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.modules, cls.seconds = _cold_start()
+
+    def test_heavy_modules_are_deferred(self):
+        loaded = [m for m in self.modules
+                  if m.split(".")[0] in _DEFERRED or m in _DEFERRED
+                  or (m.startswith("core.effects") and m not in _EFFECT_MODULES_ALLOWED)
+                  or m.startswith("user_plugin_")]
+        self.assertEqual(loaded, [])
+
+    def test_import_time_budget(self):
+        self.assertLess(self.seconds, _BUDGET,
+                        f"cold start imports took {self.seconds:.3f} s")
+
+
+_USER_PLUGIN = """
+import os
+open(os.environ["PLUGIN_LOG"], "a").write("exec\\n")
+METADATA = {"id": "halver", "name": "Halver", "icon": "H",
+            "color": "#123456", "section": "Custom"}
+PARAMS = [{"key": "amount", "type": "float", "default": 0.5}]
+def process(audio_data, start, end, sr=44100, **kw):
+    out = audio_data.copy()
+    out[start:end] *= kw.get("amount", 0.5)
+    return out
+"""
+
+
+class TestLazyUserPlugins(unittest.TestCase):
+
+    def setUp(self):
+        import plugins.user_loader as user_loader
+        self.ul = user_loader
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log = os.path.join(tmp.name, "exec.log")
+        src = os.path.join(tmp.name, "halver.py")
+        with open(src, "w") as f:
+            f.write(_USER_PLUGIN)
+        plugin_dir = os.path.join(tmp.name, "user_plugins")
+        for patch in (mock.patch.object(user_loader, "_BASE_DIR", plugin_dir),
+                      mock.patch.object(user_loader, "_REGISTRY_PATH",
+                                        os.path.join(plugin_dir, "_registry.json")),
+                      mock.patch.dict(os.environ, PLUGIN_LOG=self.log)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        user_loader.install_plugin(src)
+        os.remove(self.log)         # install validates by executing it
+
+    def _execs(self):
+        return len(open(self.log).readlines()) if os.path.exists(self.log) else 0
+
+    def test_module_runs_on_first_use_only(self):
+        plugin = self.ul.load_user_plugins()["halver"]
+        self.assertEqual((plugin.icon, plugin.section, plugin.get_name("en")),
+                         ("H", "Custom", "Halver"))
+        self.assertEqual(self._execs(), 0)
+        audio = np.ones((10, 2), dtype=np.float32)
+        out = plugin.process_fn(audio, 2, 6, sr=44100, amount=0.25)
+        np.testing.assert_array_equal(out[:, 0], [1, 1, .25, .25, .25, .25, 1, 1, 1, 1])
+        self.assertEqual(plugin.dialog_class.__name__, "UserPluginDialog")
+        plugin.process_fn(audio, 0, 10)
+        self.assertEqual(self._execs(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,236 @@
+"""Tests for core/timeline.py — clip views and lazy rendering."""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.timeline import AudioClip, ClipBounds, Timeline
+from core.effects.utils import fade_out
+
+
+def _ramp(n, channels=2):
+    mono = np.linspace(-0.5, 0.5, n, dtype=np.float32)
+    return np.column_stack([mono] * channels) if channels > 1 else mono
+
+
+def _stereo(a):
+    return a if a.ndim > 1 else np.column_stack([a, a])
+
+
+class TestClipViews(unittest.TestCase):
+
+    def test_split_and_duplicate_share_source(self):
+        audio = _ramp(1000)
+        clip = AudioClip("A", audio_data=audio)
+        left = clip.view(0, 400, name="A_L")
+        right = clip.view(400, None, name="A_R", position=400)
+        dup = clip.view(name="A (dup)", position=1000)
+        for c in (left, right, dup):
+            self.assertIs(c.source, audio)
+        self.assertEqual((left.duration_samples, right.duration_samples), (400, 600))
+        np.testing.assert_array_equal(right.audio_data, audio[400:])
+        self.assertEqual(dup.sample_rate, clip.sample_rate)
+
+    def test_gain_envelope_is_non_destructive(self):
+        audio = _ramp(1000)
+        clip = AudioClip("A", audio_data=audio)
+        clip.gain = fade_out(clip.gain_envelope(), 200)
+        np.testing.assert_allclose(clip.audio_data, fade_out(audio, 200))
+        np.testing.assert_array_equal(clip.source, audio)
+        # A split keeps the matching slice of the envelope
+        tail = clip.view(900, None)
+        np.testing.assert_allclose(tail.audio_data, fade_out(audio, 200)[900:])
+
+    def test_assigning_audio_data_replaces_source(self):
+        clip = AudioClip("A", audio_data=_ramp(100))
+        clip.gain = np.zeros(100, dtype=np.float32)
+        clip.audio_data = _ramp(50)
+        self.assertIsNone(clip.gain)
+        self.assertEqual(clip.duration_samples, 50)
+
+
+class TestTimelineRender(unittest.TestCase):
+
+    def test_render_matches_concatenation(self):
+        tl = Timeline()
+        a = tl.add_clip(_ramp(300), 44100, name="A")
+        tl.add_clip(_ramp(200, channels=1), 44100, name="B")
+        a.gain = np.full(300, 0.5, dtype=np.float32)
+        out, sr = tl.render()
+        expected = np.concatenate([_ramp(300) * 0.5, _ramp(200)])
+        self.assertEqual(sr, 44100)
+        np.testing.assert_allclose(out, expected)
+
+    def test_read_materialises_range_only(self):
+        tl = Timeline()
+        tl.add_clip(_ramp(300), 44100, name="A")
+        tl.add_clip(_ramp(200), 44100, name="B")
+        full, _ = tl.render()
+        np.testing.assert_array_equal(tl.read(250, 350), full[250:350])
+        self.assertEqual(tl.read(480, 600).shape, (120, 2))
+
+
+class TestIncrementalRender(unittest.TestCase):
+
+    def _timeline(self):
+        tl = Timeline()
+        for i, n in enumerate((300, 200, 400)):
+            tl.add_clip(_ramp(n) * (i + 1), 44100, name=str(i))
+        tl.render()
+        return tl
+
+    def _expected(self, tl):
+        return np.concatenate([_stereo(c.audio_data) for c in tl.clips])
+
+    def test_fade_rereads_its_clip_only(self):
+        tl = self._timeline()
+        before, _ = tl.render()
+        self.assertEqual(tl.dirty, (900, 900))
+        kept = before.copy()
+        clip = tl.clips[1]
+        clip.gain = fade_out(clip.gain_envelope(), 50)
+        out, _ = tl.render()
+        self.assertEqual(tl.dirty, (300, 500))
+        np.testing.assert_allclose(out, self._expected(tl))
+        # A returned mix is never written by a later render
+        self.assertFalse(np.shares_memory(out, before))
+        np.testing.assert_array_equal(before, kept)
+
+    def test_length_change_shifts_tail(self):
+        tl = self._timeline()
+        clip = tl.clips[0]
+        idx = tl.clips.index(clip)
+        tl.clips[idx:idx + 1] = [clip.view(0, 100), clip.view(100, None, position=100)]
+        tl.clips[2].audio_data = _ramp(250)       # 200 → 250 samples
+        out, _ = tl.render()
+        self.assertEqual(len(out), 950)
+        self.assertEqual(tl.dirty, (0, 950))
+        np.testing.assert_allclose(out, self._expected(tl))
+        tl.remove_clip(tl.clips[2])               # tail moves back
+        out, _ = tl.render()
+        self.assertEqual(tl.dirty, (300, 700))
+        np.testing.assert_allclose(out, self._expected(tl))
+        kept = out.copy()
+        tl.clips[1].audio_data = _ramp(500)       # and forward
+        grown, _ = tl.render()
+        np.testing.assert_array_equal(out, kept)
+        self.assertEqual(tl.dirty, (100, 1000))
+        np.testing.assert_allclose(grown, self._expected(tl))
+
+    def test_clips_cut_from_the_mix_stay_incremental(self):
+        tl = self._timeline()
+        mix, _ = tl.render()
+        for c in tl.clips:
+            c.audio_data = mix[c.position:c.end_position]
+        tl.render()                               # every clip re-pointed
+        kept = mix.copy()
+        tl.clips[0].gain = np.zeros(300, dtype=np.float32)
+        expected = self._expected(tl)
+        out, _ = tl.render()
+        self.assertEqual(tl.dirty, (0, 300))
+        np.testing.assert_allclose(out, expected)
+        np.testing.assert_array_equal(mix, kept)
+
+
+class TestClipBounds(unittest.TestCase):
+
+    def test_length_change_stays_in_its_clip(self):
+        tl = Timeline()
+        for n in (300, 200, 400):
+            tl.add_clip(_ramp(n), 44100)
+        mix, _ = tl.render()
+        mix = mix.copy()
+        bounds = ClipBounds(tl.clips)
+        # An effect inside the middle clip doubles [350, 450)
+        audio = np.concatenate([mix[:350], mix[350:450], mix[350:450], mix[450:]])
+        bounds.edit(350, 450, 200)
+        # and one spanning the first boundary halves [200, 400)
+        audio = np.concatenate([audio[:200], audio[200:400:2], audio[400:]])
+        bounds.edit(200, 400, 100)
+        bounds.assign(tl.clips, audio)
+        self.assertEqual([c.duration_samples for c in tl.clips], [250, 250, 400])
+        self.assertEqual([c.position for c in tl.clips], [0, 250, 500])
+        self.assertEqual(bounds.changed.tolist(), [True, True, False])
+        for c in tl.clips[:2]:
+            self.assertTrue(np.shares_memory(c.source, audio))
+        # The last clip only moved: same source, same samples
+        self.assertFalse(np.shares_memory(tl.clips[2].source, audio))
+        np.testing.assert_array_equal(tl.clips[2].audio_data, mix[500:])
+
+    def test_effect_in_place_keeps_the_render_incremental(self):
+        tl = Timeline()
+        for n in (300, 200, 400):
+            tl.add_clip(_ramp(n), 44100)
+        tl.clips[2].original, tl.clips[2].original_sr = _ramp(435), 48000
+        mix, _ = tl.render()
+        versions = [c.version for c in tl.clips]
+        # Same-length effect written into the returned mix, as the editor does
+        bounds = ClipBounds(tl.clips)
+        mix[350:450] *= 0.5
+        bounds.edit(350, 450, 100)
+        bounds.assign(tl.clips, mix)
+        self.assertEqual([c.version != v for c, v in zip(tl.clips, versions)],
+                         [False, True, False])
+        self.assertEqual(tl.clips[2].original_sr, 48000)
+        out, _ = tl.render()
+        self.assertEqual(tl.dirty, (300, 500))
+        np.testing.assert_array_equal(out, mix)
+
+    def test_delay_tail_extends_only_the_last_clip(self):
+        from plugins.loader import _w_delay
+        tl = Timeline()
+        for _ in range(3):
+            tl.add_clip(np.full((1000, 2), 0.5, dtype=np.float32), 44100)
+        mix, _ = tl.render()
+        mix = mix.copy()
+        bounds = ClipBounds(tl.clips)
+        # Delay on [1500, 2000) of clip 2: the range keeps its length, the
+        # tail is mixed over clip 3 and runs past the end of the file
+        out = _w_delay(mix, 1500, 2000, sr=1000, delay_ms=400, feedback=0.5)
+        self.assertGreater(len(out), 3000)
+        np.testing.assert_array_equal(out[:1500], mix[:1500])
+        bounds.effect(1500, 2000, 3000, len(out), _w_delay.grows_at_end)
+        self.assertEqual(bounds.ends.tolist(), [1000, 2000, len(out)])
+        self.assertEqual(bounds.changed.tolist(), [False, True, True])
+        bounds.assign(tl.clips, out)
+        np.testing.assert_array_equal(tl.clips[1].audio_data, out[1000:2000])
+        np.testing.assert_array_equal(tl.clips[2].audio_data, out[2000:])
+
+
+class TestResample(unittest.TestCase):
+
+    def test_polyphase_length_and_tone(self):
+        from core.resample import resample_audio
+        sr_in, sr_out = 48000, 44100
+        t = np.arange(sr_in) / sr_in
+        tone = np.sin(2 * np.pi * 1000 * t).astype(np.float32)
+        out = resample_audio(np.column_stack([tone, tone]), sr_in, sr_out)
+        self.assertEqual(out.shape, (sr_out, 2))
+        self.assertEqual(out.dtype, np.float32)
+        t_out = np.arange(sr_out) / sr_out
+        ref = np.sin(2 * np.pi * 1000 * t_out)
+        # Away from the edges the tone is reproduced closely
+        np.testing.assert_allclose(out[1000:-1000, 0], ref[1000:-1000], atol=1e-3)
+
+    def test_rate_changes_start_from_original(self):
+        tl = Timeline()
+        tl.add_clip(_ramp(100), 44100, name="project")
+        audio = _ramp(48000)
+        clip = tl.add_clip(audio, 48000, name="rec")
+        tl.render()
+        self.assertEqual(clip.duration_samples, 44100)
+        np.testing.assert_array_equal(clip.original, audio)
+        # Back to the original rate: converted from the original, not
+        # from the 44.1 kHz copy
+        tl.sample_rate = 48000
+        clip.sample_rate = 44100
+        tl.render()
+        np.testing.assert_array_equal(clip.audio_data, audio)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,172 @@
+"""Lightweight profiling for Glitch Maker.
+
+Off by default. Turn it on with the "profiling" setting (Options menu) or
+the GLITCH_PROFILE environment variable (1 / 0, overrides the setting).
+When off, span() returns a shared no-op context and records nothing.
+Usage:
+    from utils import profiler
+    with profiler.span("timeline.render", "render", clips=3) as sp:
+        ...
+    sp.ms, sp.mem                   # sp is None when profiling is off
+    profiler.count("waveform.cache_miss")
+    profiler.export_chrome_trace("session.json")   # chrome://tracing, Perfetto
+
+Memory deltas come from tracemalloc (numpy buffers included), started
+while profiling is on.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+_ENV = "GLITCH_PROFILE"
+_MAX_EVENTS = 200_000            # oldest events are dropped past this
+
+_enabled = None                  # resolved on first use
+_own_tracing = False
+_lock = threading.Lock()
+_events = deque(maxlen=_MAX_EVENTS)
+_counters: dict[str, float] = {}
+_T0 = time.perf_counter_ns()
+
+
+def enabled() -> bool:
+    """True when profiling is on (env var, then the saved setting)."""
+    if _enabled is None:
+        env = os.environ.get(_ENV)
+        if env is not None:
+            on = env.strip().lower() not in ("", "0", "false", "no", "off")
+        else:
+            from utils.config import load_settings
+            on = bool(load_settings().get("profiling", False))
+        set_enabled(on)
+    return _enabled
+
+
+def set_enabled(on: bool):
+    """Turn profiling on/off for this session (does not save the setting)."""
+    global _enabled, _own_tracing
+    _enabled = bool(on)
+    if _enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _own_tracing = True
+    elif not _enabled and _own_tracing:
+        tracemalloc.stop()
+        _own_tracing = False
+
+
+def _now_us() -> float:
+    return (time.perf_counter_ns() - _T0) / 1000
+
+
+class Span:
+    """Timed region. After exit: ms (wall time) and mem (bytes, net
+    allocation delta; None without tracemalloc)."""
+    __slots__ = ("name", "cat", "args", "ms", "mem", "_t", "_m")
+
+    def __init__(self, name, cat, args):
+        self.name, self.cat, self.args = name, cat, args
+        self.ms = self.mem = None
+
+    def __enter__(self):
+        self._m = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self._t = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        t1 = time.perf_counter_ns()
+        self.ms = (t1 - self._t) / 1e6
+        if self._m is not None and tracemalloc.is_tracing():
+            self.mem = tracemalloc.get_traced_memory()[0] - self._m
+        args = dict(self.args)
+        if self.mem is not None:
+            args["mem_delta"] = self.mem
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        _events.append({
+            "name": self.name, "cat": self.cat, "ph": "X",
+            "ts": (self._t - _T0) / 1000, "dur": (t1 - self._t) / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+        })
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def span(name: str, cat: str = "app", **args):
+    """Context manager timing a region; yields a Span, or None when off."""
+    if not (_enabled if _enabled is not None else enabled()):
+        return _NULL
+    return Span(name, cat, args)
+
+
+def profiled(name: str | None = None, cat: str = "app"):
+    """Decorator: run the function inside span(name or qualname, cat)."""
+    def deco(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            with span(label, cat):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+
+def count(name: str, n: float = 1):
+    """Add *n* to a session counter (a counter track in the trace)."""
+    if not (_enabled if _enabled is not None else enabled()):
+        return
+    with _lock:
+        total = _counters[name] = _counters.get(name, 0) + n
+    _events.append({"name": name, "ph": "C", "ts": _now_us(),
+                    "pid": os.getpid(), "tid": threading.get_ident(),
+                    "args": {name: total}})
+
+
+def counters() -> dict:
+    """Current counter totals."""
+    with _lock:
+        return dict(_counters)
+
+
+def events() -> list:
+    """Recorded trace events, oldest first."""
+    return list(_events)
+
+
+def reset():
+    """Drop the recorded events and counters."""
+    _events.clear()
+    with _lock:
+        _counters.clear()
+
+
+def export_chrome_trace(path: str) -> int:
+    """Write the session in Chrome trace-event JSON. Returns the event count."""
+    evs = events()
+    pid = os.getpid()
+    meta = [{"name": "process_name", "ph": "M", "pid": pid,
+             "args": {"name": "Glitch Maker"}}]
+    for tid in sorted({e["tid"] for e in evs}):
+        name = "main" if tid == threading.main_thread().ident else f"worker {tid}"
+        meta.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                     "args": {"name": name}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": meta + evs, "displayTimeUnit": "ms",
+                   "otherData": {"counters": counters()}}, f)
+    return len(evs)